@@ -1,9 +1,92 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from app.config import DATABASE_URL
+from functools import lru_cache
+from typing import AsyncIterator, Iterator, Optional, Tuple
 
-engine = create_engine(DATABASE_URL, echo=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+from fastapi import Depends
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from app.config import (
+    DATABASE_REPLICA_URL,
+    DATABASE_URL,
+    DB_ECHO,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_STATEMENT_TIMEOUT_MS,
+)
+
+
+def make_engine(
+    url: str,
+    *,
+    statement_timeout_ms: int = DB_STATEMENT_TIMEOUT_MS,
+    read_only: bool = False,
+    **overrides,
+) -> Engine:
+    """
+    Engine with the configured pool (size, overflow, recycle, pre-ping) and echo
+    setting. On PostgreSQL every connection gets statement_timeout (0 = none) and,
+    for read_only engines, default_transaction_read_only, so a write routed to a
+    replica fails loudly instead of diverging from the primary.
+    """
+    backend = make_url(url).get_backend_name()
+    kwargs = _pool_kwargs(backend)
+    if backend == 'postgresql':
+        options = []
+        if statement_timeout_ms > 0:
+            options.append(f"-c statement_timeout={statement_timeout_ms}")
+        if read_only:
+            options.append("-c default_transaction_read_only=on")
+        if options:
+            kwargs['connect_args'] = {'options': ' '.join(options)}
+    kwargs.update(overrides)
+    return create_engine(url, **kwargs)
+
+
+def _pool_kwargs(backend: str) -> dict:
+    kwargs = dict(echo=DB_ECHO, pool_pre_ping=DB_POOL_PRE_PING)
+    if backend != 'sqlite':
+        kwargs.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+    return kwargs
+
+
+engine = make_engine(DATABASE_URL)
+replica_engine: Optional[Engine] = make_engine(DATABASE_REPLICA_URL, read_only=True) if DATABASE_REPLICA_URL else None
+
+
+class ReadOnlySessionError(RuntimeError):
+    """A read-only (replica) session tried to write."""
+
+
+class RoutingSession(Session):
+    """
+    Session that sends everything to the primary, except sessions created with
+    info={'read_only': True}, which read from the replica when one is configured.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.info.get('read_only') and replica_engine is not None:
+            return replica_engine
+        return engine
+
+
+# On Session itself so it also covers the sync sessions behind AsyncSession
+@event.listens_for(Session, 'before_flush')
+def _reject_read_only_flush(session, flush_context, instances):
+    if session.info.get('read_only'):
+        raise ReadOnlySessionError("Read-only session cannot write — use get_db / get_async_db")
+
+
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False)
+ReadSessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, info={'read_only': True})
 Base = declarative_base()
 
 def get_db():
@@ -12,3 +95,103 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db(db: Session = Depends(get_db)) -> Iterator[Session]:
+    """
+    Session for read-only routes (listings, dashboards): served by the replica
+    when DATABASE_REPLICA_URL is set, which may lag the primary slightly.
+    Without a replica this is the request's primary session, so no extra
+    connection is checked out.
+    """
+    if replica_engine is None:
+        yield db
+        return
+    read_db = ReadSessionLocal()
+    try:
+        yield read_db
+    finally:
+        read_db.close()
+
+
+# ── Async sessions (asyncpg) ──────────────────────────────────────────────────
+# Used by the async routers. A request only holds a pooled connection while it
+# is actually talking to the database; release_connection() hands it back
+# before long waits (LLM calls, parsing, rendering).
+
+_ASYNC_DRIVERS = {'postgresql': 'postgresql+asyncpg'}
+
+
+def make_async_engine(
+    url: str,
+    *,
+    statement_timeout_ms: int = DB_STATEMENT_TIMEOUT_MS,
+    read_only: bool = False,
+    **overrides,
+) -> AsyncEngine:
+    """Async counterpart of make_engine (same pool settings); the URL's driver is swapped for asyncpg."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    async_url = make_url(url)
+    backend = async_url.get_backend_name()
+    async_url = async_url.set(drivername=_ASYNC_DRIVERS.get(backend, async_url.drivername))
+    kwargs = _pool_kwargs(backend)
+    if backend == 'postgresql':
+        settings = {}
+        if statement_timeout_ms > 0:
+            settings['statement_timeout'] = str(statement_timeout_ms)
+        if read_only:
+            settings['default_transaction_read_only'] = 'on'
+        if settings:
+            kwargs['connect_args'] = {'server_settings': settings}
+    kwargs.update(overrides)
+    return create_async_engine(async_url, **kwargs)
+
+
+@lru_cache(maxsize=None)
+def async_engines() -> Tuple[AsyncEngine, Optional[AsyncEngine]]:
+    """(primary, replica or None), created on first use so sync-only scripts don't need asyncpg."""
+    replica = make_async_engine(DATABASE_REPLICA_URL, read_only=True) if DATABASE_REPLICA_URL else None
+    return make_async_engine(DATABASE_URL), replica
+
+
+@lru_cache(maxsize=None)
+def _async_sessionmaker(read_only: bool = False):
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    primary, replica = async_engines()
+    if read_only:
+        return async_sessionmaker(bind=replica, expire_on_commit=False, autoflush=False, info={'read_only': True})
+    # expire_on_commit=False: objects stay readable after commit without a reload (lazy IO is not possible)
+    return async_sessionmaker(bind=primary, expire_on_commit=False, autoflush=False)
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with _async_sessionmaker()() as db:
+        yield db
+
+
+async def get_async_read_db(db: AsyncSession = Depends(get_async_db)) -> AsyncIterator[AsyncSession]:
+    """Async get_read_db: the replica when configured, else the request's primary session."""
+    if async_engines()[1] is None:
+        yield db
+        return
+    async with _async_sessionmaker(read_only=True)() as read_db:
+        yield read_db
+
+
+async def release_connection(db: AsyncSession) -> None:
+    """
+    End the session's transaction so its connection goes back to the pool.
+    Loaded objects stay usable; the next query checks a connection out again.
+    Only call with no pending changes you mean to keep uncommitted.
+    """
+    await db.commit()
+
+
+async def dispose_async_engines() -> None:
+    """Close the async pools (application shutdown)."""
+    if async_engines.cache_info().currsize:
+        for async_engine in async_engines():
+            if async_engine is not None:
+                await async_engine.dispose()
@@ -1,170 +1,305 @@
 """
-Database migration utilities. Runs on startup to add missing columns.
+Database migrations, tracked in a ledger (schema_migrations).
+
+Migrations are registered in order with @migration("NNNN_name") and each one
+is recorded in the ledger when it commits. On startup run_migrations() reads
+the ledger in one query and returns when nothing is pending. Otherwise one
+process takes a PostgreSQL advisory lock and applies what is pending, each
+migration in its own transaction. Processes that waited on the lock then find
+the ledger current and return.
+
+Rules for adding one: append it at the end with the next number, never edit
+or reorder an applied one, and keep it idempotent (IF NOT EXISTS / existence
+checks), since databases created before the ledger run every migration once.
+New models need a migration too: create_all only runs in 0001.
 """
 import logging
+from typing import Callable, List, NamedTuple, Set
+
 from sqlalchemy import text
-from app.database import engine
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+
+from app.database import Base, engine
+from app.utils.search import SKILL_SEARCH_DDL, TRIGRAM_DDL
 
 logger = logging.getLogger(__name__)
 
+# pg_advisory_lock key held while migrating ("CVMG")
+_LOCK_KEY = 0x43564D47
+
+_LEDGER_DDL = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        id          VARCHAR(100) PRIMARY KEY,
+        description TEXT,
+        applied_at  TIMESTAMP NOT NULL DEFAULT NOW()
+    )
+"""
+
+
+class Migration(NamedTuple):
+    id: str
+    description: str
+    apply: Callable[[Connection], None]
+    required: bool  # False: a failure is logged and retried on the next start instead of aborting it
 
-def _add_column_if_missing(conn, table: str, column: str, col_type: str = "JSONB") -> bool:
-    """Add column if it doesn't exist. Returns True if added, False if already exists."""
+
+MIGRATIONS: List[Migration] = []
+
+
+def migration(migration_id: str, required: bool = True):
+    """Register the decorated function as the next migration (its docstring is the ledger description)."""
+    def register(fn: Callable[[Connection], None]) -> Callable[[Connection], None]:
+        MIGRATIONS.append(Migration(migration_id, (fn.__doc__ or '').strip(), fn, required))
+        return fn
+    return register
+
+
+# ── Helpers ──────────────────────────────────────────────────────────────────
+
+def _column_exists(conn: Connection, table: str, column: str) -> bool:
     check_sql = text("""
         SELECT 1 FROM information_schema.columns
         WHERE table_name = :table AND column_name = :column
     """)
-    result = conn.execute(check_sql, {"table": table, "column": column}).fetchone()
-    if result:
-        return False
-    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {col_type} NULL"))
-    return True
+    return conn.execute(check_sql, {"table": table, "column": column}).fetchone() is not None
+
+
+def _add_columns(conn: Connection, table: str, columns: List[tuple]) -> None:
+    """ADD COLUMN IF NOT EXISTS for each (name, type) pair."""
+    for column, col_type in columns:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column} {col_type}"))
 
 
-def _rename_column_if_exists(conn, table: str, old_name: str, new_name: str, col_type: str = "JSONB") -> bool:
+def _rename_column_if_exists(conn: Connection, table: str, old_name: str, new_name: str) -> bool:
     """Rename column if old exists and new doesn't. Returns True if renamed."""
-    check_old = text("""
-        SELECT 1 FROM information_schema.columns
-        WHERE table_name = :table AND column_name = :column
-    """)
-    old_exists = conn.execute(check_old, {"table": table, "column": old_name}).fetchone()
-    new_exists = conn.execute(check_old, {"table": table, "column": new_name}).fetchone()
-    
-    if old_exists and not new_exists:
+    if _column_exists(conn, table, old_name) and not _column_exists(conn, table, new_name):
         conn.execute(text(f"ALTER TABLE {table} RENAME COLUMN {old_name} TO {new_name}"))
         return True
     return False
 
 
-def run_migrations() -> None:
-    """Add missing columns and rename old columns. Safe to run multiple times."""
-    try:
-        with engine.begin() as conn:  # begin() handles commit/rollback automatically
-            # CV table migrations
-            for col_name in ["personal_info", "interests", "embedding", "custom_sections", "theme"]:
-                try:
-                    added = _add_column_if_missing(conn, "cvs", col_name)
-                    if added:
-                        logger.info(f"Migration: added column cvs.{col_name}")
-                except Exception as e:
-                    logger.warning(f"Migration for cvs.{col_name} failed: {e}")
+# ── Migrations ───────────────────────────────────────────────────────────────
 
-            # Users table: superuser + AI access control
-            for col_name, col_type, default in [
-                ("is_superuser", "BOOLEAN", "FALSE"),
-                ("ai_access",    "BOOLEAN", "TRUE"),
-            ]:
-                try:
-                    check_sql = text("""
-                        SELECT 1 FROM information_schema.columns
-                        WHERE table_name = 'users' AND column_name = :col
-                    """)
-                    if not conn.execute(check_sql, {"col": col_name}).fetchone():
-                        conn.execute(text(
-                            f"ALTER TABLE users ADD COLUMN {col_name} BOOLEAN NOT NULL DEFAULT {default}"
-                        ))
-                        logger.info(f"Migration: added users.{col_name}")
-                except Exception as e:
-                    logger.warning(f"Migration for users.{col_name} failed: {e}")
+@migration("0001_create_tables")
+def _create_tables(conn: Connection) -> None:
+    """Create every model table that does not exist yet (a fresh database gets the current schema)."""
+    import app.models  # noqa: F401  (registers the tables on Base.metadata)
+    Base.metadata.create_all(bind=conn)
 
+
+@migration("0002_cvs_basic_info_columns")
+def _cvs_basic_info(conn: Connection) -> None:
+    """cvs: flat identity columns and current_version (formerly migrate_cvs.py)."""
+    _add_columns(conn, "cvs", [
+        ("full_name", "VARCHAR(150)"),
+        ("email", "VARCHAR(150)"),
+        ("phone", "VARCHAR(50)"),
+        ("location", "VARCHAR(150)"),
+        ("linkedin_url", "TEXT"),
+        ("profile_summary", "TEXT"),
+        ("current_version", "INTEGER DEFAULT 1"),
+    ])
+
+
+@migration("0003_cvs_json_sections")
+def _cvs_json_sections(conn: Connection) -> None:
+    """cvs: editor JSONB sections (personal_info, interests, custom_sections, theme, ...)."""
+    _add_columns(conn, "cvs", [
+        (col_name, "JSONB NULL")
+        for col_name in ["personal_info", "interests", "embedding", "custom_sections", "theme", "photo_derivatives"]
+    ])
+
+
+@migration("0004_users_access_flags")
+def _users_access_flags(conn: Connection) -> None:
+    """users: superuser + AI access control."""
+    _add_columns(conn, "users", [
+        ("is_superuser", "BOOLEAN NOT NULL DEFAULT FALSE"),
+        ("ai_access", "BOOLEAN NOT NULL DEFAULT TRUE"),
+    ])
+
+
+@migration("0005_cv_customizations_scores")
+def _cv_customizations_scores(conn: Connection) -> None:
+    """cv_customizations: score → ats_score, customized_data → customized_snapshot, keyword / similarity columns."""
+    if _rename_column_if_exists(conn, "cv_customizations", "score", "ats_score"):
+        logger.info("Migration: renamed cv_customizations.score → ats_score")
+    if _rename_column_if_exists(conn, "cv_customizations", "customized_data", "customized_snapshot"):
+        logger.info("Migration: renamed cv_customizations.customized_data → customized_snapshot")
+    _add_columns(conn, "cv_customizations", [
+        ("missing_keywords", "JSONB"),
+        ("ats_score", "INTEGER"),
+        ("similarity_score", "INTEGER"),
+        ("customized_snapshot", "JSONB"),
+    ])
+
+
+@migration("0006_suggestions_text")
+def _suggestions_text(conn: Connection) -> None:
+    """suggestions: suggestion → suggestion_text (copied over if both exist)."""
+    if _rename_column_if_exists(conn, "suggestions", "suggestion", "suggestion_text"):
+        logger.info("Migration: renamed suggestions.suggestion → suggestion_text")
+        return
+    _add_columns(conn, "suggestions", [("suggestion_text", "TEXT")])
+    if _column_exists(conn, "suggestions", "suggestion"):
+        conn.execute(text("UPDATE suggestions SET suggestion_text = suggestion WHERE suggestion_text IS NULL"))
+        logger.info("Migration: copied data from suggestions.suggestion to suggestion_text")
+
+
+@migration("0007_users_login_tracking")
+def _users_login_tracking(conn: Connection) -> None:
+    """users: lockout + last-login tracking."""
+    _add_columns(conn, "users", [
+        ("last_login", "TIMESTAMP"),
+        ("locked_until", "TIMESTAMP"),
+        ("failed_login_attempts", "INTEGER NOT NULL DEFAULT 0"),
+    ])
+
+
+@migration("0008_audit_logs")
+def _audit_logs(conn: Connection) -> None:
+    """audit_logs table and its admin / entity indexes."""
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS audit_logs (
+            id           SERIAL PRIMARY KEY,
+            admin_id     INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            action       VARCHAR(100) NOT NULL,
+            entity_type  VARCHAR(50)  NOT NULL,
+            entity_id    VARCHAR(50),
+            old_values   JSONB,
+            new_values   JSONB,
+            ip_address   VARCHAR(50),
+            status       VARCHAR(20) DEFAULT 'success',
+            notes        TEXT,
+            created_at   TIMESTAMP DEFAULT NOW()
+        );
+        CREATE INDEX IF NOT EXISTS idx_audit_admin_time ON audit_logs (admin_id, created_at);
+        CREATE INDEX IF NOT EXISTS idx_audit_entity     ON audit_logs (entity_type, entity_id);
+    """))
+
+
+@migration("0009_suggestions_data")
+def _suggestions_data(conn: Connection) -> None:
+    """suggestions: structured suggestion_data."""
+    _add_columns(conn, "suggestions", [("suggestion_data", "JSONB")])
+
+
+@migration("0010_cv_list_keyset_index")
+def _cv_list_keyset_index(conn: Connection) -> None:
+    """CV list keyset pagination on (updated_at, id): no NULL sort keys, plus its index."""
+    conn.execute(text("UPDATE cvs SET updated_at = COALESCE(created_at, NOW()) WHERE updated_at IS NULL"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS idx_cv_user_updated ON cvs (user_id, updated_at, id)"))
+
+
+@migration("0011_admin_keyset_indexes")
+def _admin_keyset_indexes(conn: Connection) -> None:
+    """Admin user / audit log keyset pagination on (created_at, id)."""
+    conn.execute(text("UPDATE users SET created_at = COALESCE(updated_at, NOW()) WHERE created_at IS NULL"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS idx_user_created ON users (created_at, id)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS idx_audit_time ON audit_logs (created_at, id)"))
+
+
+@migration("0012_cv_version_deltas")
+def _cv_version_deltas(conn: Connection) -> None:
+    """CV version history: keyframes (snapshot) + JSON Patch deltas."""
+    _add_columns(conn, "cv_versions", [
+        ("kind", "VARCHAR(10) NOT NULL DEFAULT 'keyframe'"),
+        ("patch", "JSONB"),
+        ("source", "VARCHAR(30)"),
+    ])
+    conn.execute(text("ALTER TABLE cv_versions ALTER COLUMN snapshot DROP NOT NULL"))
+
+
+# Formerly also created the pg_trgm indexes (now 0015); where it was applied, both parts exist
+@migration("0013_search_indexes")
+def _search_indexes(conn: Connection) -> None:
+    """Admin CV search: cv_skill_names() and the GIN index on flattened CV skill names."""
+    for statement in SKILL_SEARCH_DDL:
+        conn.execute(text(statement))
+
+
+@migration("0014_cv_version_number_unique")
+def _cv_version_number_unique(conn: Connection) -> None:
+    """cv_versions: unique (cv_id, version_number), replacing idx_cv_version_lookup; duplicates keep their first row."""
+    conn.execute(text("""
+        DELETE FROM cv_versions a USING cv_versions b
+        WHERE a.cv_id = b.cv_id AND a.version_number = b.version_number AND a.id > b.id
+    """))
+    exists = conn.execute(text("SELECT 1 FROM pg_constraint WHERE conname = 'uq_cv_version_number'")).fetchone()
+    if not exists:
+        conn.execute(text(
+            "ALTER TABLE cv_versions ADD CONSTRAINT uq_cv_version_number UNIQUE (cv_id, version_number)"
+        ))
+    conn.execute(text("DROP INDEX IF EXISTS idx_cv_version_lookup"))
+
+
+# CREATE EXTENSION needs privileges the app role may lack; admin user search then just runs unindexed
+@migration("0015_user_trigram_indexes", required=False)
+def _user_trigram_indexes(conn: Connection) -> None:
+    """Admin user search: pg_trgm indexes for name/email substrings."""
+    for statement in TRIGRAM_DDL:
+        conn.execute(text(statement))
+
+
+# ── Runner ───────────────────────────────────────────────────────────────────
+
+def _applied(conn: Connection) -> Set[str]:
+    return {row[0] for row in conn.execute(text("SELECT id FROM schema_migrations"))}
+
+
+def pending_migrations() -> List[Migration]:
+    """Migrations not in the ledger yet (all of them before the ledger exists). One query."""
+    with engine.connect() as conn:
+        try:
+            applied = _applied(conn)
+        except DBAPIError:  # no ledger table yet
+            applied = set()
+    return [m for m in MIGRATIONS if m.id not in applied]
+
+
+def run_migrations() -> List[str]:
+    """
+    Apply pending migrations in order; returns the ids applied by this call.
+    A failing required migration raises (its transaction rolls back, earlier
+    ones stay applied); a failing optional one is logged and retried next time.
+    """
+    if not pending_migrations():
+        return []
+
+    applied_now: List[str] = []
+    with engine.connect() as conn:
+        # No DB_STATEMENT_TIMEOUT_MS on this connection: waiting for the lock while another process
+        # migrates, and index builds on big tables, may both take longer. RESET in finally.
+        conn.execute(text("SET statement_timeout = 0"))
+        # Session-level lock: held across the per-migration transactions below
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": _LOCK_KEY})
+        conn.commit()
+        try:
+            with conn.begin():
+                conn.execute(text(_LEDGER_DDL))
+                applied = _applied(conn)
+            for m in MIGRATIONS:
+                if m.id in applied:
+                    continue  # applied by another process while this one waited for the lock
                 try:
-                    added = _add_column_if_missing(conn, "cvs", col_name)
-                    if added:
-                        logger.info(f"Migration: added column cvs.{col_name}")
-                except Exception as e:
-                    logger.warning(f"Migration for cvs.{col_name} failed: {e}")
-            
-            # CVCustomization table migrations
-            try:
-                added = _add_column_if_missing(conn, "cv_customizations", "missing_keywords")
-                if added:
-                    logger.info("Migration: added column cv_customizations.missing_keywords")
-            except Exception as e:
-                logger.warning(f"Migration for cv_customizations.missing_keywords failed: {e}")
-            
-            # Rename old columns in cv_customizations
-            try:
-                if _rename_column_if_exists(conn, "cv_customizations", "score", "ats_score"):
-                    logger.info("Migration: renamed cv_customizations.score → ats_score")
-                if _rename_column_if_exists(conn, "cv_customizations", "customized_data", "customized_snapshot"):
-                    logger.info("Migration: renamed cv_customizations.customized_data → customized_snapshot")
-            except Exception as e:
-                logger.warning(f"Column rename failed: {e}")
-            
-            # Add missing columns in cv_customizations
-            for col_name, col_type in [("ats_score", "INTEGER"), ("similarity_score", "INTEGER"), ("customized_snapshot", "JSONB")]:
-                try:
-                    added = _add_column_if_missing(conn, "cv_customizations", col_name, col_type)
-                    if added:
-                        logger.info(f"Migration: added column cv_customizations.{col_name}")
-                except Exception as e:
-                    logger.warning(f"Migration for cv_customizations.{col_name} failed: {e}")
-            
-            # Suggestions table migrations
-            try:
-                if _rename_column_if_exists(conn, "suggestions", "suggestion", "suggestion_text"):
-                    logger.info("Migration: renamed suggestions.suggestion → suggestion_text")
-                else:
-                    # If rename didn't happen, add the new column
-                    added = _add_column_if_missing(conn, "suggestions", "suggestion_text", "TEXT")
-                    if added:
-                        logger.info("Migration: added column suggestions.suggestion_text")
-                        # Copy data from old column if it exists
-                        check_old = text("SELECT 1 FROM information_schema.columns WHERE table_name = 'suggestions' AND column_name = 'suggestion'")
-                        if conn.execute(check_old).fetchone():
-                            conn.execute(text("UPDATE suggestions SET suggestion_text = suggestion WHERE suggestion_text IS NULL"))
-                            logger.info("Migration: copied data from suggestions.suggestion to suggestion_text")
-            except Exception as e:
-                logger.warning(f"Migration for suggestions.suggestion_text failed: {e}")
-
-            # Users table: lockout + last-login tracking
-            for col_name, col_type in [
-                ("last_login",            "TIMESTAMP"),
-                ("locked_until",          "TIMESTAMP"),
-                ("failed_login_attempts", "INTEGER NOT NULL DEFAULT 0"),
-            ]:
-                try:
-                    check_sql = text("""
-                        SELECT 1 FROM information_schema.columns
-                        WHERE table_name = 'users' AND column_name = :col
-                    """)
-                    if not conn.execute(check_sql, {"col": col_name}).fetchone():
-                        conn.execute(text(f"ALTER TABLE users ADD COLUMN {col_name} {col_type}"))
-                        logger.info(f"Migration: added users.{col_name}")
+                    with conn.begin():
+                        m.apply(conn)
+                        conn.execute(
+                            text("INSERT INTO schema_migrations (id, description) VALUES (:id, :description)"),
+                            {"id": m.id, "description": m.description},
+                        )
                 except Exception as e:
-                    logger.warning(f"Migration for users.{col_name} failed: {e}")
-
-            # Audit log table (create if missing)
-            try:
-                conn.execute(text("""
-                    CREATE TABLE IF NOT EXISTS audit_logs (
-                        id           SERIAL PRIMARY KEY,
-                        admin_id     INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
-                        action       VARCHAR(100) NOT NULL,
-                        entity_type  VARCHAR(50)  NOT NULL,
-                        entity_id    VARCHAR(50),
-                        old_values   JSONB,
-                        new_values   JSONB,
-                        ip_address   VARCHAR(50),
-                        status       VARCHAR(20) DEFAULT 'success',
-                        notes        TEXT,
-                        created_at   TIMESTAMP DEFAULT NOW()
-                    );
-                    CREATE INDEX IF NOT EXISTS idx_audit_admin_time ON audit_logs (admin_id, created_at);
-                    CREATE INDEX IF NOT EXISTS idx_audit_entity     ON audit_logs (entity_type, entity_id);
-                """))
-                logger.info("Migration: audit_logs table ensured")
-            except Exception as e:
-                logger.warning(f"Migration for audit_logs table failed: {e}")
-
-            # Suggestions table: suggestion_data column
-            try:
-                added = _add_column_if_missing(conn, "suggestions", "suggestion_data", "JSONB")
-                if added:
-                    logger.info("Migration: added suggestions.suggestion_data")
-            except Exception as e:
-                logger.warning(f"Migration for suggestions.suggestion_data failed: {e}")
-                
-    except Exception as e:
-        logger.error(f"Database migration failed: {e}")
-        raise
+                    if m.required:
+                        logger.error(f"Migration {m.id} failed: {e}")
+                        raise
+                    logger.warning(f"Migration {m.id} failed, will retry on next start: {e}")
+                    continue
+                applied_now.append(m.id)
+                logger.info(f"Migration: applied {m.id}")
+        finally:
+            conn.rollback()
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _LOCK_KEY})
+            conn.execute(text("RESET statement_timeout"))  # back to the pool with the usual timeout
+            conn.commit()
+    return applied_now
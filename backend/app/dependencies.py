@@ -1,28 +1,21 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Any, Dict, Optional
 import logging
 
-from app.database import get_db
+from app.database import get_async_db, get_db
 from app.models import User, AuditLog
 from app.security import decode_token
+from app.utils.ttl_cache import auth_user_cache
 
 logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """
-    Dependency to get the current authenticated user.
-    Validates JWT token from Authorization header.
-    Also checks that the account is active (H4 fix from production report).
-    """
-    token = credentials.credentials
-
+def _user_id_from_token(token: str) -> int:
     payload = decode_token(token)
     if not payload:
         raise HTTPException(
@@ -36,8 +29,32 @@ def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token"
         )
+    return int(user_id)
+
+
+# What routes read from the authenticated user; cached per user id in auth_user_cache
+_AUTH_FIELDS = ('id', 'name', 'email', 'is_active', 'ai_access', 'is_superuser')
+_AUTH_QUERY = select(*(getattr(User, field) for field in _AUTH_FIELDS))
+
+
+def _auth_user(fields: Optional[Dict[str, Any]]) -> Optional[User]:
+    """
+    Detached User carrying only the auth fields (the same object shape on cache
+    hits and misses). Routes read it; anything they write goes through a User
+    they load themselves.
+    """
+    return User(**fields) if fields is not None else None
+
+
+def _remember(row) -> Optional[Dict[str, Any]]:
+    if row is None:
+        return None
+    fields = dict(row._mapping)
+    auth_user_cache.set(fields['id'], fields)
+    return fields
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
+
+def _ensure_active(user: Optional[User]) -> User:
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -54,6 +71,35 @@ def get_current_user(
     return user
 
 
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Dependency to get the current authenticated user.
+    Validates JWT token from Authorization header.
+    Also checks that the account is active (H4 fix from production report).
+    The user's flags come from auth_user_cache for up to AUTH_USER_CACHE_TTL_SECONDS.
+    """
+    user_id = _user_id_from_token(credentials.credentials)
+    fields = auth_user_cache.get(user_id)
+    if fields is None:
+        fields = _remember(db.execute(_AUTH_QUERY.where(User.id == user_id)).first())
+    return _ensure_active(_auth_user(fields))
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """get_current_user for async routes (same checks, loaded through the request's AsyncSession)."""
+    user_id = _user_id_from_token(credentials.credentials)
+    fields = auth_user_cache.get(user_id)
+    if fields is None:
+        fields = _remember((await db.execute(_AUTH_QUERY.where(User.id == user_id))).first())
+    return _ensure_active(_auth_user(fields))
+
+
 def require_ai_access(current_user: User = Depends(get_current_user)) -> User:
     """Dependency: blocks users whose ai_access flag is False from AI endpoints (M2 fix)."""
     if not current_user.ai_access:
@@ -64,6 +110,11 @@ def require_ai_access(current_user: User = Depends(get_current_user)) -> User:
     return current_user
 
 
+async def require_ai_access_async(current_user: User = Depends(get_current_user_async)) -> User:
+    """require_ai_access for async routes."""
+    return require_ai_access(current_user)
+
+
 def write_audit_log(
     db: Session,
     *,
@@ -9,7 +9,6 @@ from fastapi.responses import JSONResponse
 from sqlalchemy.exc import SQLAlchemyError, ProgrammingError
 
 from app.config import CORS_ORIGINS, API_TITLE, API_VERSION, API_DESCRIPTION
-from app.database import Base, engine
 from app.routes import auth, cvs, cover_letters, job_applications, admin
 
 #app.include_router(auth.router)
@@ -21,19 +20,34 @@ logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Startup: run migrations, create tables. Shutdown: cleanup."""
+    """Startup: apply pending migrations (one ledger query when there are none). Shutdown: cleanup."""
     try:
         from app.db_migrate import run_migrations
-        run_migrations()
-        logger.info("Database migrations completed")
+        applied = run_migrations()
+        if applied:
+            logger.info(f"Database migrations completed: {', '.join(applied)}")
     except Exception as e:
         logger.error(f"Startup migration failed: {e}")
         raise
-    Base.metadata.create_all(bind=engine)
     os.makedirs("uploads", exist_ok=True)
     os.makedirs("uploads/photos", exist_ok=True)
+    from app.utils.fonts import register_fonts
+    register_fonts()
+    from app.utils.cache_listener import start_cache_listener
+    start_cache_listener()
     yield
-    # Shutdown cleanup if needed
+    from app.utils.cache_listener import stop_cache_listener
+    from app.utils.cv_versions import shutdown_compaction
+    from app.utils.parse_worker import shutdown_parse_pool
+    from app.utils.prerender import cancel_prerenders
+    from app.utils.render_pool import shutdown_render_pool
+    from app.database import dispose_async_engines
+    stop_cache_listener()
+    cancel_prerenders()
+    shutdown_compaction()
+    shutdown_parse_pool()
+    shutdown_render_pool()
+    await dispose_async_engines()
 
 app = FastAPI(
     title=API_TITLE,
@@ -7,9 +7,10 @@ from sqlalchemy import (
     Boolean,
     ForeignKey,
     Enum,
-    Index
+    Index,
+    UniqueConstraint
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.dialects.postgresql import JSONB
 from datetime import datetime
 import enum
@@ -56,11 +57,18 @@ class User(Base):
     cover_letters = relationship("CoverLetter", back_populates="user", cascade="all, delete-orphan")
     job_applications = relationship("JobApplication", back_populates="user", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("idx_user_created", "created_at", "id"),
+    )
+
 
 # ───────────────────────────────────────────────────────────────
 # CV MAIN TABLE
 # ───────────────────────────────────────────────────────────────
 
+CV_CONTENT = "content"  # deferred column group: CV sections and raw text
+
+
 class CV(Base):
     __tablename__ = "cvs"
 
@@ -77,24 +85,27 @@ class CV(Base):
     profile_summary = Column(Text)
 
     # Flexible JSON Sections
-    personal_info = Column(JSONB, nullable=True)  # Editor format: {name, title, email, phone, location, linkedin, website, summary, photo}
-    educations = Column(JSONB)
-    experiences = Column(JSONB)
-    projects = Column(JSONB)
-    skills = Column(JSONB)
-    languages = Column(JSONB)
-    certifications = Column(JSONB)
-    interests = Column(JSONB)
-    custom_sections = Column(JSONB)   # [{title, content}]
+    # Deferred as one group (CV_CONTENT): loaded together on first access, or up front
+    # with undefer_group(CV_CONTENT); list queries never pull them.
+    personal_info = deferred(Column(JSONB, nullable=True), group=CV_CONTENT)  # Editor format: {name, title, email, phone, location, linkedin, website, summary, photo}
+    educations = deferred(Column(JSONB), group=CV_CONTENT)
+    experiences = deferred(Column(JSONB), group=CV_CONTENT)
+    projects = deferred(Column(JSONB), group=CV_CONTENT)
+    skills = deferred(Column(JSONB), group=CV_CONTENT)
+    languages = deferred(Column(JSONB), group=CV_CONTENT)
+    certifications = deferred(Column(JSONB), group=CV_CONTENT)
+    interests = deferred(Column(JSONB), group=CV_CONTENT)
+    custom_sections = deferred(Column(JSONB), group=CV_CONTENT)   # [{title, content}]
     theme = Column(JSONB)             # {primaryColor, fontFamily, layout, accentStyle}
 
     # AI-ready metadata
-    embedding = Column(JSONB, nullable=True)  # can replace with pgvector later
+    embedding = deferred(Column(JSONB, nullable=True))  # can replace with pgvector later
 
     # File Storage
     file_path = Column(String(500))
     photo_path = Column(String(500))
-    original_text = Column(Text)
+    photo_derivatives = Column(JSONB, nullable=True)  # {pdf, thumb, web}: URL paths of normalized JPEGs
+    original_text = deferred(Column(Text), group=CV_CONTENT)
 
     # Versioning
     current_version = Column(Integer, default=1)
@@ -112,6 +123,8 @@ class CV(Base):
 
     __table_args__ = (
         Index("idx_cv_user_id", "user_id"),
+        # Keyset pagination of a user's CVs by (updated_at, id), scanned backwards for newest first
+        Index("idx_cv_user_updated", "user_id", "updated_at", "id"),
     )
 
 
@@ -126,14 +139,19 @@ class CVVersion(Base):
     cv_id = Column(Integer, ForeignKey("cvs.id"), nullable=False)
     version_number = Column(Integer, nullable=False)
 
-    snapshot = Column(JSONB, nullable=False)  # full CV snapshot
+    # Keyframes hold a full snapshot; deltas a JSON Patch from the previous stored version
+    kind = Column(String(10), nullable=False, default="keyframe")  # "keyframe" | "delta"
+    snapshot = Column(JSONB, nullable=True)   # full CV snapshot (keyframes)
+    patch = Column(JSONB, nullable=True)      # RFC 6902 operations (deltas)
+    source = Column(String(30), nullable=True)  # what wrote it: edit, upload, ai_changes, suggestion, revert, ...
 
     created_at = Column(DateTime, default=datetime.utcnow)
 
     cv = relationship("CV", back_populates="versions")
 
+    # Also the (cv_id, version_number) lookup index; two writers can never store the same number
     __table_args__ = (
-        Index("idx_cv_version_lookup", "cv_id", "version_number"),
+        UniqueConstraint("cv_id", "version_number", name="uq_cv_version_number"),
     )
 
 
@@ -272,5 +290,6 @@ class AuditLog(Base):
 
     __table_args__ = (
         Index("idx_audit_admin_time", "admin_id", "created_at"),
+        Index("idx_audit_time", "created_at", "id"),
         Index("idx_audit_entity", "entity_type", "entity_id"),
     )
\ No newline at end of file
@@ -2,7 +2,7 @@
 Admin routes — only accessible to users with is_superuser=True.
 
 Endpoints:
-  GET    /api/admin/users                         — paginated + searchable user list
+  GET    /api/admin/users                         — keyset-paginated + searchable user list
   POST   /api/admin/users                         — create user (admin-created)
   GET    /api/admin/users/{user_id}               — detailed user view
   PATCH  /api/admin/users/{user_id}               — toggle flags (is_active, ai_access, is_superuser)
@@ -10,28 +10,45 @@ Endpoints:
   POST   /api/admin/users/{user_id}/unlock        — clear account lockout
   POST   /api/admin/users/{user_id}/reset-password — generate temp password
   GET    /api/admin/stats                         — enhanced dashboard statistics
-  GET    /api/admin/audit-logs                    — paginated audit log viewer
+  GET    /api/admin/audit-logs                    — keyset-paginated audit log viewer
+  POST   /api/admin/cvs/bulk-import               — import a ZIP of CV files for a user (NDJSON progress)
+  GET    /api/admin/users/{user_id}/cvs/export     — all of a user's CVs as a streamed ZIP of PDFs
+  GET    /api/admin/cvs/search                    — CVs having all / any of some skills (GIN-indexed)
+  GET    /api/admin/metrics/pdf-render            — PDF render pool queue-wait / render-time metrics
 """
+import json
 import logging
+import os
 import secrets
+import shutil
 import string
+import tempfile
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import Query as OrmQuery, Session, undefer_group
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.dependencies import get_current_user, write_audit_log
-from app.models import AuditLog, CV, User
+from app.models import CV_CONTENT, AuditLog, CV, User
 from app.schemas import (
     AdminCreateUserRequest,
     AuditLogResponse,
     UserResponse,
 )
 from app.security import get_password_hash
+from app.utils.bulk_import import BulkImportError, extract_zip, run_bulk_import
+from app.utils.pagination import InvalidCursor, decode_cursor, estimated_row_count, split_page
+from app.routes.cvs import pdf_zip_jobs
+from app.utils.pdf_export import stream_pdf_zip
+from app.utils.render_pool import render_metrics
+from app.utils.search import SKILL_MATCH_PATTERN, cv_skill_filter, cv_skill_names, normalize_skills, user_search_filter
+from app.utils.cache_listener import notify_user_changed
+from app.utils.ttl_cache import admin_stats_cache, auth_user_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -77,17 +94,37 @@ class UserUpdateRequest(BaseModel):
 
 class PaginatedUsersResponse(BaseModel):
     users: List[UserAdminResponse]
-    total: int
+    total: Optional[int] = None          # None when count=none
+    total_estimated: bool = False        # True when total comes from planner statistics
     page: int
     limit: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None    # pass as ?cursor= for the next page; None on the last page
+
+
+class AdminCVSearchResult(BaseModel):
+    id: int
+    title: Optional[str] = None
+    user_id: int
+    user_name: str
+    user_email: str
+    skills: List[str]                    # normalized (lower-cased) skill names of the CV
+    updated_at: Optional[datetime] = None
+
+
+class AdminCVSearchResponse(BaseModel):
+    cvs: List[AdminCVSearchResult]
+    limit: int
+    next_cursor: Optional[str] = None
 
 
 class PaginatedAuditLogsResponse(BaseModel):
     logs: List[AuditLogResponse]
-    total: int
+    total: Optional[int] = None
+    total_estimated: bool = False
     page: int
     limit: int
+    next_cursor: Optional[str] = None
 
 
 # ── Helper ───────────────────────────────────────────────────────────────────
@@ -108,6 +145,41 @@ def _build_user_admin_response(user: User, cv_count: int) -> UserAdminResponse:
     )
 
 
+# Newest first on (created_at, id), served by idx_user_created / idx_audit_time
+_CURSOR_HELP = "next_cursor of the previous page (preferred over page: constant cost at any depth)"
+_COUNT_HELP = "exact | estimate (planner statistics when unfiltered, else exact) | none"
+_COUNT_PATTERN = "^(exact|estimate|none)$"
+
+
+def _keyset_page(q: OrmQuery, model, cursor: Optional[str], page: int, limit: int) -> Tuple[list, Optional[str]]:
+    """
+    One page of q, newest first. With a cursor the page starts right after the
+    cursor's row, an index range scan whatever the depth; without one, page is
+    still honoured with OFFSET for older clients.
+    """
+    q = q.order_by(model.created_at.desc(), model.id.desc())
+    if cursor:
+        try:
+            created_at, last_id = decode_cursor(cursor, datetime, int)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        q = q.filter(tuple_(model.created_at, model.id) < tuple_(created_at, last_id))
+    elif page > 1:
+        q = q.offset((page - 1) * limit)
+    return split_page(q.limit(limit + 1).all(), limit, lambda row: (row.created_at, row.id))
+
+
+def _page_total(db: Session, q: OrmQuery, table: str, filtered: bool, count: str) -> Tuple[Optional[int], bool]:
+    """(total, estimated) for the count mode; only unfiltered estimates skip the COUNT(*)."""
+    if count == "none":
+        return None, False
+    if count == "estimate" and not filtered:
+        estimate = estimated_row_count(db, table)
+        if estimate is not None:
+            return estimate, True
+    return q.count(), False
+
+
 # ── Routes ───────────────────────────────────────────────────────────────────
 
 @router.get("/users", response_model=PaginatedUsersResponse)
@@ -115,20 +187,20 @@ def list_all_users(
     request: Request,
     search: Optional[str] = Query(None, description="Filter by name or email (case-insensitive)"),
     status_filter: Optional[str] = Query(None, alias="status", description="active | inactive | locked"),
+    cursor: Optional[str] = Query(None, description=_CURSOR_HELP),
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=200),
+    count: str = Query("estimate", pattern=_COUNT_PATTERN, description=_COUNT_HELP),
     admin: User = Depends(require_superuser),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Paginated, searchable list of all users. Fixes N+1 by joining CV count in one query."""
     # Build base query
     q = db.query(User)
 
     if search:
-        like = f"%{search.lower()}%"
-        q = q.filter(
-            (func.lower(User.name).like(like)) | (func.lower(User.email).like(like))
-        )
+        # Served by the pg_trgm indexes idx_user_name_trgm / idx_user_email_trgm
+        q = q.filter(user_search_filter(search))
 
     now = datetime.utcnow()
     if status_filter == "active":
@@ -138,8 +210,8 @@ def list_all_users(
     elif status_filter == "locked":
         q = q.filter(User.locked_until > now)
 
-    total = q.count()
-    users = q.order_by(User.created_at.desc()).offset((page - 1) * limit).limit(limit).all()
+    total, estimated = _page_total(db, q, User.__tablename__, bool(search or status_filter), count)
+    users, next_cursor = _keyset_page(q, User, cursor, page, limit)
 
     # Single aggregated query for CV counts — fixes N+1
     user_ids = [u.id for u in users]
@@ -154,8 +226,11 @@ def list_all_users(
         cv_counts = {row[0]: row[1] for row in rows}
 
     result = [_build_user_admin_response(u, cv_counts.get(u.id, 0)) for u in users]
-    pages = max(1, (total + limit - 1) // limit)
-    return PaginatedUsersResponse(users=result, total=total, page=page, limit=limit, pages=pages)
+    pages = max(1, (total + limit - 1) // limit) if total is not None else None
+    return PaginatedUsersResponse(
+        users=result, total=total, total_estimated=estimated, page=page, limit=limit, pages=pages,
+        next_cursor=next_cursor,
+    )
 
 
 @router.post("/users", response_model=UserAdminResponse, status_code=201)
@@ -191,6 +266,7 @@ def create_user(
         ip_address=_get_client_ip(request),
     )
     db.commit()
+    admin_stats_cache.invalidate()
     db.refresh(new_user)
     return _build_user_admin_response(new_user, 0)
 
@@ -255,8 +331,11 @@ def update_user(
             new_values=new_vals,
             ip_address=_get_client_ip(request),
         )
+        notify_user_changed(db, user_id)
 
     db.commit()
+    admin_stats_cache.invalidate()
+    auth_user_cache.invalidate(user_id)
     db.refresh(user)
     cv_count = db.query(func.count(CV.id)).filter(CV.user_id == user.id).scalar() or 0
     return _build_user_admin_response(user, cv_count)
@@ -286,7 +365,10 @@ def delete_user(
         ip_address=_get_client_ip(request),
     )
     db.delete(user)
+    notify_user_changed(db, user_id)
     db.commit()
+    admin_stats_cache.invalidate()
+    auth_user_cache.invalidate(user_id)
     return {"message": f"User {user_id} deleted"}
 
 
@@ -312,7 +394,10 @@ def unlock_user(
         entity_id=str(user_id),
         ip_address=_get_client_ip(request),
     )
+    notify_user_changed(db, user_id)
     db.commit()
+    admin_stats_cache.invalidate()
+    auth_user_cache.invalidate(user_id)
     return {"message": "Account unlocked successfully"}
 
 
@@ -349,6 +434,7 @@ def reset_password(
         notes="Admin-initiated password reset",
     )
     db.commit()
+    admin_stats_cache.invalidate()
     return {
         "message": "Password reset successfully. Share the temporary password securely.",
         "temporary_password": temp_password,
@@ -359,18 +445,25 @@ def reset_password(
 @router.get("/stats")
 def get_stats(
     admin: User = Depends(require_superuser),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    """Enhanced dashboard statistics."""
+    """Enhanced dashboard statistics: one aggregate query, cached for STATS_CACHE_TTL_SECONDS."""
+    return admin_stats_cache.get_or_set(None, lambda: _compute_stats(db))
+
+
+def _compute_stats(db: Session) -> dict:
     now = datetime.utcnow()
     month_ago = now - timedelta(days=30)
 
-    total_users = db.query(func.count(User.id)).scalar() or 0
-    active_users = db.query(func.count(User.id)).filter(User.is_active == True).scalar() or 0
-    ai_restricted = db.query(func.count(User.id)).filter(User.ai_access == False).scalar() or 0
-    locked_out = db.query(func.count(User.id)).filter(User.locked_until > now).scalar() or 0
-    new_this_month = db.query(func.count(User.id)).filter(User.created_at >= month_ago).scalar() or 0
-    total_cvs = db.query(func.count(CV.id)).scalar() or 0
+    # One pass over users (COUNT ... FILTER) plus the CV count as a scalar subquery
+    total_users, active_users, ai_restricted, locked_out, new_this_month, total_cvs = db.query(
+        func.count(User.id),
+        func.count(User.id).filter(User.is_active == True),
+        func.count(User.id).filter(User.ai_access == False),
+        func.count(User.id).filter(User.locked_until > now),
+        func.count(User.id).filter(User.created_at >= month_ago),
+        db.query(func.count(CV.id)).scalar_subquery(),
+    ).one()
 
     return {
         "total_users": total_users,
@@ -383,15 +476,96 @@ def get_stats(
     }
 
 
+@router.get("/users/{user_id}/cvs/export")
+def export_user_cvs(
+    user_id: int,
+    request: Request,
+    admin: User = Depends(require_superuser),
+    db: Session = Depends(get_db),
+):
+    """Every CV of a user as PDFs in one streamed ZIP archive."""
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    cvs = db.query(CV).filter(CV.user_id == user_id).options(undefer_group(CV_CONTENT)).order_by(CV.id).all()
+    if not cvs:
+        raise HTTPException(status_code=404, detail="User has no CVs")
+    jobs = pdf_zip_jobs(cvs)
+
+    write_audit_log(
+        db,
+        admin=admin,
+        action="cvs_exported",
+        entity_type="User",
+        entity_id=str(user_id),
+        new_values={"cv_count": len(jobs)},
+        ip_address=_get_client_ip(request),
+    )
+    db.commit()
+
+    return StreamingResponse(
+        stream_pdf_zip(jobs),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="user_{user_id}_cvs.zip"'},
+    )
+
+
+@router.get("/cvs/search", response_model=AdminCVSearchResponse)
+def search_cvs_by_skill(
+    skills: List[str] = Query(..., description="Skill names (repeat or comma-separate); case-insensitive"),
+    match: str = Query("all", pattern=SKILL_MATCH_PATTERN, description="all | any of the skills"),
+    cursor: Optional[str] = Query(None, description=_CURSOR_HELP),
+    limit: int = Query(50, ge=1, le=200),
+    admin: User = Depends(require_superuser),
+    db: Session = Depends(get_read_db),
+):
+    """CVs of any user by skill, most recently updated first; matched on idx_cv_skill_names."""
+    names = normalize_skills(skills)
+    if not names:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="At least one skill is required")
+
+    q = (
+        db.query(CV.id, CV.title, CV.user_id, User.name.label("user_name"), User.email.label("user_email"),
+                 cv_skill_names().label("skill_names"), CV.updated_at)
+        .join(User, User.id == CV.user_id)
+        .filter(cv_skill_filter(names, match))
+    )
+    if cursor:
+        try:
+            updated_at, last_id = decode_cursor(cursor, datetime, int)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        q = q.filter(tuple_(CV.updated_at, CV.id) < tuple_(updated_at, last_id))
+    rows = q.order_by(CV.updated_at.desc(), CV.id.desc()).limit(limit + 1).all()
+    page, next_cursor = split_page(rows, limit, lambda row: (row.updated_at, row.id))
+
+    return AdminCVSearchResponse(
+        cvs=[AdminCVSearchResult(
+            id=row.id, title=row.title, user_id=row.user_id, user_name=row.user_name,
+            user_email=row.user_email, skills=list(row.skill_names or []), updated_at=row.updated_at,
+        ) for row in page],
+        limit=limit,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/metrics/pdf-render")
+def get_pdf_render_metrics(admin: User = Depends(require_superuser)):
+    """PDF render pool: in-flight count, outcome counters, queue-wait and render-time percentiles."""
+    return render_metrics()
+
+
 @router.get("/audit-logs", response_model=PaginatedAuditLogsResponse)
 def get_audit_logs(
+    cursor: Optional[str] = Query(None, description=_CURSOR_HELP),
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=200),
+    count: str = Query("estimate", pattern=_COUNT_PATTERN, description=_COUNT_HELP),
     action_filter: Optional[str] = Query(None, alias="action"),
     entity_type_filter: Optional[str] = Query(None, alias="entity_type"),
     admin_id_filter: Optional[int] = Query(None, alias="admin_id"),
     admin: User = Depends(require_superuser),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Paginated audit log. Filterable by action, entity_type, and admin_id."""
     q = db.query(AuditLog)
@@ -403,8 +577,9 @@ def get_audit_logs(
     if admin_id_filter:
         q = q.filter(AuditLog.admin_id == admin_id_filter)
 
-    total = q.count()
-    logs = q.order_by(AuditLog.created_at.desc()).offset((page - 1) * limit).limit(limit).all()
+    filtered = bool(action_filter or entity_type_filter or admin_id_filter)
+    total, estimated = _page_total(db, q, AuditLog.__tablename__, filtered, count)
+    logs, next_cursor = _keyset_page(q, AuditLog, cursor, page, limit)
 
     # Build responses with admin name
     admin_ids = list({log.admin_id for log in logs})
@@ -431,4 +606,56 @@ def get_audit_logs(
         for log in logs
     ]
 
-    return PaginatedAuditLogsResponse(logs=log_responses, total=total, page=page, limit=limit)
+    return PaginatedAuditLogsResponse(
+        logs=log_responses, total=total, total_estimated=estimated, page=page, limit=limit,
+        next_cursor=next_cursor,
+    )
+
+
+@router.post("/cvs/bulk-import")
+def bulk_import_cvs(
+    request: Request,
+    user_id: int = Query(..., description="Owner of the imported CVs"),
+    file: UploadFile = File(..., description="ZIP archive of PDF/DOCX/TXT CV files"),
+    admin: User = Depends(require_superuser),
+    db: Session = Depends(get_db),
+):
+    """
+    Import a ZIP archive of CVs for one user. Files are parsed in parallel on a
+    process pool and saved in batches. Progress is streamed as NDJSON, one event
+    per line; per-file failures are reported without aborting the import.
+    """
+    owner = db.query(User).filter(User.id == user_id).first()
+    if not owner:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    work_dir = tempfile.mkdtemp(prefix="bulk_import_")
+    try:
+        archive_path = os.path.join(work_dir, "upload.zip")
+        with open(archive_path, "wb") as f:
+            shutil.copyfileobj(file.file, f)
+        file_paths = extract_zip(archive_path, os.path.join(work_dir, "files"))
+    except BulkImportError as e:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        raise HTTPException(status_code=400, detail=str(e))
+
+    write_audit_log(
+        db,
+        admin=admin,
+        action="cvs_bulk_imported",
+        entity_type="User",
+        entity_id=str(user_id),
+        new_values={"archive": file.filename, "files": len(file_paths)},
+        ip_address=_get_client_ip(request),
+    )
+    db.commit()
+
+    def _stream():
+        try:
+            for event in run_bulk_import(file_paths, user_id):
+                yield json.dumps(event, default=str) + "\n"
+        finally:
+            admin_stats_cache.invalidate()
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    return StreamingResponse(_stream(), media_type="application/x-ndjson")
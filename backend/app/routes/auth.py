@@ -11,6 +11,7 @@ from app.database import get_db
 from app.models import User
 from app.schemas import LoginRequest, LoginResponse, SignupRequest, SignupResponse, UserResponse
 from app.security import get_password_hash, verify_password, create_access_token
+from app.utils.ttl_cache import admin_stats_cache
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +53,8 @@ def login(request: Request, credentials: LoginRequest, db: Session = Depends(get
             user.locked_until = datetime.utcnow() + timedelta(minutes=LOCKOUT_MINUTES)
             logger.warning("Account locked: user_id=%s ip=%s", user.id, _get_client_ip(request))
         db.commit()
+        if user.locked_until:
+            admin_stats_cache.invalidate()
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
 
     # Deactivated account
@@ -86,6 +89,7 @@ def signup(data: SignupRequest, db: Session = Depends(get_db)):
     )
     db.add(new_user)
     db.commit()
+    admin_stats_cache.invalidate()
     db.refresh(new_user)
 
     access_token = create_access_token(
@@ -1,13 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+import logging
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, Response
+from starlette.background import BackgroundTask
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, undefer_group
+from typing import List, Optional
 from datetime import datetime
 from pydantic import BaseModel, HttpUrl
-from app.database import get_db
-from app.models import User, CoverLetter, CV
+from app.database import get_async_db, release_connection
+from app.models import CV_CONTENT, User, CoverLetter, CV
 from app.schemas import CoverLetterCreate, CoverLetterUpdate, CoverLetterResponse
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user_async
 from app.utils.ai_integration import generate_cover_letter, extract_job_description
+from app.utils.cover_letter_export import EXPORT_FORMATS, cover_letter_text, get_pinned_cover_letter
+from app.utils.pdf_cache import cover_letter_cache_key, discard_render_file, etag_matches, invalidate_cover_letter
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/cover-letters", tags=["cover-letters"])
 
@@ -21,57 +31,63 @@ class ExtractJobDescriptionRequest(BaseModel):
     url: str
 
 
+async def _get_owned_cover_letter(db: AsyncSession, cl_id: int, user: User, *options) -> CoverLetter:
+    cl = (await db.execute(
+        select(CoverLetter).where(CoverLetter.id == cl_id, CoverLetter.user_id == user.id).options(*options)
+    )).scalars().first()
+    if not cl:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cover letter not found")
+    return cl
+
+
 @router.get("", response_model=List[CoverLetterResponse])
-def get_cover_letters(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_cover_letters(
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """List all cover letters for the current user."""
-    return db.query(CoverLetter).filter(CoverLetter.user_id == current_user.id).order_by(CoverLetter.updated_at.desc()).all()
+    return (await db.execute(
+        select(CoverLetter).where(CoverLetter.user_id == current_user.id).order_by(CoverLetter.updated_at.desc())
+    )).scalars().all()
 
 @router.get("/{cl_id}", response_model=CoverLetterResponse)
-def get_cover_letter(
+async def get_cover_letter(
     cl_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a single cover letter by ID."""
-    cl = db.query(CoverLetter).filter(CoverLetter.id == cl_id, CoverLetter.user_id == current_user.id).first()
-    if not cl:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cover letter not found")
-    return cl
+    return await _get_owned_cover_letter(db, cl_id, current_user)
 
 
 @router.post("", response_model=CoverLetterResponse)
-def create_cover_letter(
+async def create_cover_letter(
     data: CoverLetterCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new cover letter."""
     cl = CoverLetter(
         user_id=current_user.id,
         cv_id=data.cv_id,
         title=data.title or "My Cover Letter",
-        content=data.content or {}
+        content=data.content.model_dump() if data.content else {}
     )
     db.add(cl)
-    db.commit()
-    db.refresh(cl)
+    await db.commit()
+    await db.refresh(cl)
     return cl
 
 
 @router.put("/{cl_id}", response_model=CoverLetterResponse)
-def update_cover_letter(
+async def update_cover_letter(
     cl_id: int,
     data: CoverLetterUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a cover letter."""
-    cl = db.query(CoverLetter).filter(CoverLetter.id == cl_id, CoverLetter.user_id == current_user.id).first()
-    if not cl:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cover letter not found")
+    cl = await _get_owned_cover_letter(db, cl_id, current_user)
     if data.title is not None:
         cl.title = data.title
     if data.cv_id is not None:
@@ -79,31 +95,89 @@ def update_cover_letter(
     if data.content is not None:
         cl.content = data.content
     cl.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(cl)
+    await db.commit()
+    await db.refresh(cl)
     return cl
 
 
 @router.delete("/{cl_id}")
-def delete_cover_letter(
+async def delete_cover_letter(
     cl_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a cover letter."""
-    cl = db.query(CoverLetter).filter(CoverLetter.id == cl_id, CoverLetter.user_id == current_user.id).first()
-    if not cl:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cover letter not found")
-    db.delete(cl)
-    db.commit()
+    cl = await _get_owned_cover_letter(db, cl_id, current_user)
+    await db.delete(cl)
+    await db.commit()
+    invalidate_cover_letter(cl_id)
     return {"message": "Cover letter deleted successfully"}
 
 
+SENDER_FIELDS = ('name', 'title', 'email', 'phone', 'location', 'linkedin', 'website')
+
+
+@router.get("/{cl_id}/export")
+async def export_cover_letter(
+    cl_id: int,
+    format: str = Query("pdf"),
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Download a cover letter as PDF or DOCX (?format=pdf|docx), laid out with the
+    linked CV's theme and letterhead (name, title, contact details). Exports are
+    cached per (letter, format, updated_at, theme); the cache key is the ETag and a
+    matching If-None-Match gets 304.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported format '{format}'. Use one of: {', '.join(EXPORT_FORMATS)}"
+        )
+    cl = await _get_owned_cover_letter(db, cl_id, current_user, selectinload(CoverLetter.cv).undefer_group(CV_CONTENT))
+    await release_connection(db)
+
+    if cl.cv is not None:
+        from app.routes.cvs import build_pdf_input
+        cv_data, _, theme = build_pdf_input(cl.cv)
+        pi = cv_data['personalInfo']
+        sender = {k: pi.get(k) for k in SENDER_FIELDS if pi.get(k)}
+    else:
+        sender, theme = {'name': current_user.name, 'email': current_user.email}, {}
+    sender.setdefault('name', current_user.name)
+
+    cache_key = cover_letter_cache_key(cl.id, format, cl.updated_at, sender, theme)
+    headers = {'ETag': f'"{cache_key}"', 'Cache-Control': 'private, no-cache'}
+    if etag_matches(if_none_match, cache_key):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    title = cl.title or "Cover Letter"
+    try:
+        path = await run_in_threadpool(
+            get_pinned_cover_letter,
+            cl.id, cl.updated_at, format, cover_letter_text(cl.content), sender, title, theme
+        )
+    except Exception as e:
+        logger.exception("Cover letter %s export (%s) failed", cl.id, format)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Cover letter export failed: {str(e)}"
+        )
+
+    ext, media_type = EXPORT_FORMATS[format]
+    return FileResponse(
+        path, media_type=media_type, filename=title.replace(' ', '_') + ext, headers=headers,
+        background=BackgroundTask(discard_render_file, path),
+    )
+
+
 @router.post("/generate-with-ai")
-def generate_with_ai(
+async def generate_with_ai(
     request: GenerateCoverLetterRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     ✅ FIXED: Generate a cover letter using AI and SAVE it to database
@@ -117,7 +191,9 @@ def generate_with_ai(
         print(f"   Title: {request.title}")
         
         # ✅ Get CV
-        cv = db.query(CV).filter(CV.id == request.cv_id, CV.user_id == current_user.id).first()
+        cv = (await db.execute(
+            select(CV).where(CV.id == request.cv_id, CV.user_id == current_user.id).options(undefer_group(CV_CONTENT))
+        )).scalars().first()
         if not cv:
             print(f"❌ CV not found for ID {request.cv_id}")
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="CV not found")
@@ -139,9 +215,10 @@ def generate_with_ai(
         
         print(f"✅ CV data built: {len(cv_data)} fields")
         
-        # ✅ Generate cover letter with AI
+        # ✅ Generate cover letter with AI (no DB connection held while waiting for the LLM)
         print(f"🤖 Calling generate_cover_letter()...")
-        content = generate_cover_letter(cv_data, request.job_description, current_user.name)
+        await release_connection(db)
+        content = await run_in_threadpool(generate_cover_letter, cv_data, request.job_description, current_user.name)
         
         if not content:
             print(f"❌ AI generation returned empty content")
@@ -177,16 +254,16 @@ def generate_with_ai(
         print(f"✅ Added to session")
         
         # ✅ Commit to database
-        db.commit()
+        await db.commit()
         print(f"✅ COMMITTED to database")
         
         # ✅ Refresh to get the ID
-        db.refresh(cl)
+        await db.refresh(cl)
         print(f"✅ Refreshed from database")
         print(f"   Saved with ID: {cl.id}")
         
         # ✅ Verify it was saved
-        verify = db.query(CoverLetter).filter(CoverLetter.id == cl.id).first()
+        verify = await db.get(CoverLetter, cl.id)
         if verify:
             print(f"✅ VERIFIED: Record exists in database!")
             print(f"   ID: {verify.id}")
@@ -204,7 +281,7 @@ def generate_with_ai(
         
     except HTTPException:
         # Re-raise HTTP exceptions
-        db.rollback()
+        await db.rollback()
         raise
     except Exception as e:
         print(f"\n❌ ERROR in generate_with_ai:")
@@ -214,7 +291,7 @@ def generate_with_ai(
         traceback.print_exc()
         
         # ✅ IMPORTANT: Rollback on error
-        db.rollback()
+        await db.rollback()
         print(f"   Database rolled back")
         
         raise HTTPException(
@@ -224,14 +301,14 @@ def generate_with_ai(
 
 
 @router.post("/extract-job-from-url")
-def extract_job_from_url(
+async def extract_job_from_url(
     request: ExtractJobDescriptionRequest,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user_async)
 ):
     """Extract job description from a URL"""
     try:
         print(f"\n🔗 Extracting from URL: {request.url}")
-        job_desc = extract_job_description(request.url)
+        job_desc = await run_in_threadpool(extract_job_description, request.url)
         
         if not job_desc:
             raise HTTPException(
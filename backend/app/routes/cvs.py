@@ -1,23 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
-from app.models import User, CV, Suggestion, CVCustomization
-from app.schemas import CVResponse, CVCreate, CVUpdate, CVCustomizationRequest, SuggestionResponse, ApplyAIChangesRequest
-from app.dependencies import get_current_user, require_ai_access
-from app.utils.cv_parser import parse_cv_file
+from fastapi import APIRouter, Body, Depends, HTTPException, status, UploadFile, File, Header, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy import select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer_group
+from sqlalchemy.orm.attributes import flag_modified
+from typing import Any, Dict, List, Optional, Tuple
+from app.database import get_async_db, get_async_read_db, release_connection
+from app.models import CV_CONTENT, User, CV, Suggestion, CVCustomization
+from app.schemas import (
+    CVResponse, CVCreate, CVUpdate, CVCustomizationRequest, CVSummaryPage, CVVersionDiff, CVVersionResponse,
+    CVVersionSummary, SuggestionResponse, ApplyAIChangesRequest,
+)
+from app.dependencies import get_current_user_async, require_ai_access_async
+from app.utils.cv_parser import ExtractionLimitError, parsed_to_cv_columns
+from app.utils.parse_worker import parse_cv_file_isolated
+from app.config import MAX_UPLOAD_SIZE
 from app.utils.ai_integration import analyze_cv, enhance_cv_for_job, groq_enhance_sections
 from app.utils.ai_enhance import extract_keywords, compute_match_score, rule_based_suggestions, groq_suggestions
-from app.utils.pdf_generator import generate_cv_pdf
+from app.utils.cv_versions import (
+    VERSIONED_FIELDS, cv_snapshot, list_versions, load_version, record_version, restore_snapshot,
+)
+from app.utils.json_patch import JsonPatchError, apply_patch, json_equal, make_patch
+from app.utils.pagination import InvalidCursor, decode_cursor, split_page
+from app.utils.pdf_cache import discard_render_file, etag_matches, invalidate_cv, pdf_cache_key
+from app.utils.ttl_cache import admin_stats_cache
+from app.utils.pdf_export import get_pinned_pdf, stream_pdf_zip
+from app.utils.render_pool import RenderQueueFull, RenderTimeout
+from app.utils.prerender import cancel_prerender, schedule_prerender
+from app.utils.thumbnails import get_pinned_thumbnail
+from app.utils.photos import PHOTO_DERIVATIVE_DIR, make_photo_derivatives, remove_photo_derivatives
 import os
-import io
 from datetime import datetime
 
 router = APIRouter(prefix="/cvs", tags=["cvs"])
 
 UPLOAD_DIR = "uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
 def _build_personal_info_from_flat(cv: CV) -> dict:
@@ -217,6 +239,7 @@ def _cv_to_response(cv: CV) -> dict:
         'theme': getattr(cv, 'theme', None) or {},
         'file_path': cv.file_path,
         'photo_path': cv.photo_path,
+        'photo_derivatives': getattr(cv, 'photo_derivatives', None) or {},
         'original_text': cv.original_text,
         'current_version': cv.current_version or 1,
         'is_active': cv.is_active if cv.is_active is not None else True,
@@ -245,36 +268,121 @@ def _build_cv_data_dict(cv: CV) -> dict:
     }
 
 
+async def _get_owned_cv(db: AsyncSession, cv_id: int, user: User, for_update: bool = False) -> CV:
+    """The user's CV with its content loaded; for_update locks the row until commit (writes that record a version)."""
+    query = select(CV).where(CV.id == cv_id, CV.user_id == user.id).options(undefer_group(CV_CONTENT))
+    if for_update:
+        query = query.with_for_update().execution_options(populate_existing=True)
+    cv = (await db.execute(query)).scalars().first()
+    if not cv:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="CV not found")
+    return cv
+
+
+async def _commit_version(db: AsyncSession) -> None:
+    """Commit a write that recorded a version; 409 if a concurrent writer stored the same version number."""
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="CV was changed by another request at the same time, reload it and retry"
+        )
+
+
+# Everything but the embedding: refresh() on its own leaves the deferred content group unloaded
+_CV_REFRESH_ATTRS = [attr.key for attr in CV.__mapper__.column_attrs if attr.key != 'embedding']
+
+
+async def _refresh_cv(db: AsyncSession, cv: CV) -> None:
+    await db.refresh(cv, attribute_names=_CV_REFRESH_ATTRS)
+
+
+async def _read_upload(file: UploadFile) -> bytes:
+    """The uploaded bytes; 413 if the file exceeds MAX_UPLOAD_SIZE."""
+    content = await file.read(MAX_UPLOAD_SIZE + 1)
+    if len(content) > MAX_UPLOAD_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File is larger than {MAX_UPLOAD_SIZE // (1024 * 1024)}MB"
+        )
+    return content
+
+
+def _write_file(path: str, content: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(content)
+
+
 # ── CRUD ──────────────────────────────────────────────────────────────────────
 
 @router.get("", response_model=List[CVResponse])
-def get_all_cvs(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_all_cvs(
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get all CVs for the current user with all fields properly serialized."""
-    cvs = db.query(CV).filter(CV.user_id == current_user.id).order_by(CV.updated_at.desc()).all()
+    cvs = (await db.execute(
+        select(CV).where(CV.user_id == current_user.id)
+        .options(undefer_group(CV_CONTENT))
+        .order_by(CV.updated_at.desc())
+    )).scalars().all()
     return [_cv_to_response(cv) for cv in cvs]
 
 
+@router.get("/summary", response_model=CVSummaryPage)
+async def list_cv_summaries(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Newest-first CV list for the dashboard: only the columns the list shows,
+    keyset-paginated on (updated_at, id) via idx_cv_user_updated.
+    """
+    query = select(
+        CV.id, CV.title, CV.updated_at, CV.current_version, CV.theme, CV.photo_derivatives
+    ).where(CV.user_id == current_user.id)
+    if cursor:
+        try:
+            updated_at, last_id = decode_cursor(cursor, datetime, int)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        query = query.where(tuple_(CV.updated_at, CV.id) < tuple_(updated_at, last_id))
+    rows = (await db.execute(query.order_by(CV.updated_at.desc(), CV.id.desc()).limit(limit + 1))).all()
+
+    page, next_cursor = split_page(rows, limit, lambda row: (row.updated_at, row.id))
+    return {
+        'items': [{
+            'id': row.id,
+            'title': row.title,
+            'updated_at': row.updated_at,
+            'current_version': row.current_version or 1,
+            'theme': row.theme or {},
+            'photo_thumbnail': (row.photo_derivatives or {}).get('thumb'),
+        } for row in page],
+        'next_cursor': next_cursor,
+    }
+
+
 @router.get("/{cv_id}", response_model=CVResponse)
-def get_cv(
+async def get_cv(
     cv_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific CV by ID with all fields for editor/preview."""
-    cv = db.query(CV).filter(CV.id == cv_id, CV.user_id == current_user.id).first()
-    if not cv:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="CV not found")
+    cv = await _get_owned_cv(db, cv_id, current_user)
     return _cv_to_response(cv)
 
 
 @router.post("", response_model=CVResponse)
-def create_cv(
+async def create_cv(
     cv_data: CVCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new (blank) CV."""
     pi = cv_data.personal_info or {}
@@ -298,47 +406,34 @@ def create_cv(
         current_version=1,
     )
     db.add(new_cv)
-    db.commit()
-    db.refresh(new_cv)
+    await db.flush()
+    await _refresh_cv(db, new_cv)  # unset columns are unloaded after the INSERT
+    await record_version(db, new_cv, 'created')
+    await db.commit()
+    admin_stats_cache.invalidate()
     return _cv_to_response(new_cv)
 
 
 @router.put("/{cv_id}", response_model=CVResponse)
-def update_cv(
+async def update_cv(
     cv_id: int,
     cv_data: CVUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update a CV. Accepts frontend format (personal_info, experiences with position/company, etc).
     JSON columns are stored as-is. Flat columns are synced from personal_info when provided.
+    The PDF and list thumbnail are pre-rendered once the edits settle.
     """
-    cv = db.query(CV).filter(CV.id == cv_id, CV.user_id == current_user.id).first()
-    if not cv:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="CV not found")
+    cv = await _get_owned_cv(db, cv_id, current_user, for_update=True)
+    previous = cv_snapshot(cv)
 
     # personal_info from editor — store and sync to flat cols
     if cv_data.personal_info is not None:
         # Store personal_info as-is (preserve all fields)
         cv.personal_info = cv_data.personal_info
-        pi = cv_data.personal_info
-        # Sync flat columns from personal_info (only if provided, don't overwrite with None)
-        if 'name' in pi:
-            cv.full_name = pi.get('name') or cv.full_name
-        if 'email' in pi:
-            cv.email = pi.get('email') or cv.email
-        if 'phone' in pi:
-            cv.phone = pi.get('phone') or cv.phone
-        if 'location' in pi:
-            cv.location = pi.get('location') or cv.location
-        if 'linkedin' in pi:
-            cv.linkedin_url = pi.get('linkedin') or cv.linkedin_url
-        if 'summary' in pi:
-            cv.profile_summary = pi.get('summary') or cv.profile_summary
-        # Handle title/jobTitle
-        if 'title' in pi or 'jobTitle' in pi:
-            cv.title = pi.get('title') or pi.get('jobTitle') or cv.title
+        _sync_from_personal_info(cv, cv_data.personal_info)
 
     # Flat field overrides
     if cv_data.title is not None:
@@ -378,94 +473,254 @@ def update_cv(
     if cv_data.theme is not None:
         cv.theme = cv_data.theme
 
-
+    await record_version(db, cv, 'edit', previous)
     cv.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(cv)
+    await _commit_version(db)
+    await _refresh_cv(db, cv)
+    schedule_prerender(cv.id, *build_pdf_input(cv))
+    return _cv_to_response(cv)
+
+
+def _sync_from_personal_info(cv: CV, pi: dict) -> None:
+    """Sync flat columns from personal_info (only keys that are present; never blanks a column)."""
+    if 'name' in pi:
+        cv.full_name = pi.get('name') or cv.full_name
+    if 'email' in pi:
+        cv.email = pi.get('email') or cv.email
+    if 'phone' in pi:
+        cv.phone = pi.get('phone') or cv.phone
+    if 'location' in pi:
+        cv.location = pi.get('location') or cv.location
+    if 'linkedin' in pi:
+        cv.linkedin_url = pi.get('linkedin') or cv.linkedin_url
+    if 'summary' in pi:
+        cv.profile_summary = pi.get('summary') or cv.profile_summary
+    # Handle title/jobTitle
+    if 'title' in pi or 'jobTitle' in pi:
+        cv.title = pi.get('title') or pi.get('jobTitle') or cv.title
+
+
+def _if_match_version(if_match: Optional[str]) -> int:
+    """The current_version an If-Match header pins ("7", W/"7" or 7)."""
+    if if_match is None:
+        raise HTTPException(
+            status_code=status.HTTP_428_PRECONDITION_REQUIRED,
+            detail='If-Match: "<current_version>" is required',
+        )
+    value = if_match.strip()
+    if value.startswith('W/'):
+        value = value[2:]
+    try:
+        return int(value.strip('"'))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="If-Match must be a CV version number")
+
+
+@router.patch("/{cv_id}", response_model=CVResponse)
+async def patch_cv(
+    cv_id: int,
+    response: Response,
+    operations: List[Dict[str, Any]] = Body(..., description="RFC 6902 operations, e.g. /experiences/0/description"),
+    if_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Partial update with a JSON Patch (application/json-patch+json) over the
+    fields PUT accepts, so autosave sends the edit instead of whole sections.
+    Only columns whose value actually changes are written. Optimistic
+    concurrency: If-Match carries the current_version the patch was made
+    against; 412 if the CV has moved on, 422 if the patch does not apply.
+    """
+    expected = _if_match_version(if_match)
+    # The row lock holds off other writers until commit, so the version checked here is the one patched
+    cv = await _get_owned_cv(db, cv_id, current_user, for_update=True)
+    actual = cv.current_version or 1
+    if actual != expected:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=f"CV is at version {actual}, not {expected}: reload it and retry",
+        )
+
+    previous = cv_snapshot(cv)
+    document = {field: getattr(cv, field) for field in VERSIONED_FIELDS}
+    try:
+        patched = apply_patch(document, operations)
+    except JsonPatchError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    if not isinstance(patched, dict) or patched.keys() != document.keys():
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"A patch can change these fields but not add or remove them: {', '.join(VERSIONED_FIELDS)}",
+        )
+
+    changed = [field for field in VERSIONED_FIELDS if not json_equal(document[field], patched[field])]
+    if 'personal_info' in changed:
+        cv.personal_info = patched['personal_info']
+        if isinstance(cv.personal_info, dict):
+            _sync_from_personal_info(cv, cv.personal_info)
+    for field in changed:
+        if field != 'personal_info':
+            setattr(cv, field, patched[field])
+
+    if changed:
+        await record_version(db, cv, 'patch', previous)
+        cv.updated_at = datetime.utcnow()
+    await _commit_version(db)
+    await _refresh_cv(db, cv)
+    if changed:
+        schedule_prerender(cv.id, *build_pdf_input(cv))
+    response.headers['ETag'] = f'"{cv.current_version or 1}"'
     return _cv_to_response(cv)
 
 
 @router.delete("/{cv_id}")
-def delete_cv(
+async def delete_cv(
     cv_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a CV and all linked records."""
-    cv = db.query(CV).filter(CV.id == cv_id, CV.user_id == current_user.id).first()
-    if not cv:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="CV not found")
-    db.delete(cv)
-    db.commit()
+    cv = await _get_owned_cv(db, cv_id, current_user)
+    await db.delete(cv)
+    await db.commit()
+    admin_stats_cache.invalidate()
+    cancel_prerender(cv_id)
+    invalidate_cv(cv_id)
     return {"message": "CV deleted successfully"}
 
 
+# ── Version history ───────────────────────────────────────────────────────────
+
+async def _load_owned_version(db: AsyncSession, cv_id: int, version_number: int):
+    found = await load_version(db, cv_id, version_number)
+    if found is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Version {version_number} not found")
+    return found
+
+
+@router.get("/{cv_id}/versions", response_model=List[CVVersionSummary])
+async def get_cv_versions(
+    cv_id: int,
+    before: Optional[int] = Query(None, description="Only versions older than this version number"),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Version history, newest first (metadata only)."""
+    cv = await _get_owned_cv(db, cv_id, current_user)
+    return await list_versions(db, cv.id, before=before, limit=limit)
+
+
+@router.get("/{cv_id}/versions/diff", response_model=CVVersionDiff)
+async def diff_cv_versions(
+    cv_id: int,
+    from_version: int = Query(..., alias="from"),
+    to_version: Optional[int] = Query(None, alias="to", description="Defaults to the current version"),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """JSON Patch between two versions of a CV."""
+    cv = await _get_owned_cv(db, cv_id, current_user)
+    to_version = to_version or cv.current_version or 1
+    _, old = await _load_owned_version(db, cv.id, from_version)
+    _, new = await _load_owned_version(db, cv.id, to_version)
+    return {'from_version': from_version, 'to_version': to_version, 'patch': make_patch(old, new)}
+
+
+@router.get("/{cv_id}/versions/{version_number}", response_model=CVVersionResponse)
+async def get_cv_version(
+    cv_id: int,
+    version_number: int,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """One version's full content, rebuilt from its keyframe and deltas."""
+    cv = await _get_owned_cv(db, cv_id, current_user)
+    row, snapshot = await _load_owned_version(db, cv.id, version_number)
+    return {
+        'id': row.id, 'cv_id': cv.id, 'version_number': row.version_number,
+        'snapshot': snapshot, 'source': row.source, 'created_at': row.created_at,
+    }
+
+
+@router.post("/{cv_id}/versions/{version_number}/revert", response_model=CVResponse)
+async def revert_cv_version(
+    cv_id: int,
+    version_number: int,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Restore a version's content. The revert is itself recorded as a new
+    version, so it can be undone; the current photo is kept.
+    """
+    cv = await _get_owned_cv(db, cv_id, current_user, for_update=True)
+    _, snapshot = await _load_owned_version(db, cv.id, version_number)
+    previous = cv_snapshot(cv)
+    restore_snapshot(cv, snapshot)
+    await record_version(db, cv, 'revert', previous)
+    cv.updated_at = datetime.utcnow()
+    await _commit_version(db)
+    await _refresh_cv(db, cv)
+    schedule_prerender(cv.id, *build_pdf_input(cv))
+    return _cv_to_response(cv)
+
+
 # ── File upload ────────────────────────────────────────────────────────────────
 
 @router.post("/{cv_id}/upload", response_model=CVResponse)
-def upload_cv_file(
+async def upload_cv_file(
     cv_id: int,
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Upload a PDF/DOCX file, parse it, and populate all CV columns.
     Also builds personal_info so the editor loads the data correctly.
     """
-    cv = db.query(CV).filter(CV.id == cv_id, CV.user_id == current_user.id).first()
-    if not cv:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="CV not found")
+    cv = await _get_owned_cv(db, cv_id, current_user)
+
+    content = await _read_upload(file)
 
     try:
         file_path = os.path.join(UPLOAD_DIR, f"{cv_id}_{file.filename}")
-        with open(file_path, "wb") as f:
-            f.write(file.file.read())
+        await run_in_threadpool(_write_file, file_path, content)
+
+        # Parsing can take seconds: give the connection back while it runs
+        await release_connection(db)
+        parsed_data = await run_in_threadpool(parse_cv_file_isolated, file_path)
 
-        parsed_data = parse_cv_file(file_path)
+        # Lock (and reload) the row only now: it may have been edited while parsing
+        cv = await _get_owned_cv(db, cv_id, current_user, for_update=True)
+        previous = cv_snapshot(cv)
 
-        # --- Flat fields ---
-        cv.title = os.path.splitext(file.filename)[0]
+        # Flat fields, JSON sections and personal_info (shared with bulk import)
+        columns = parsed_to_cv_columns(parsed_data, title=os.path.splitext(file.filename)[0])
+        columns['personal_info']['photo'] = cv.photo_path or ''
+        for column, value in columns.items():
+            setattr(cv, column, value)
         cv.file_path = file_path
-        cv.original_text = parsed_data.get('original_text', '')
-
-        cv.full_name = parsed_data.get('full_name') or parsed_data.get('personalInfo', {}).get('name', '')
-        cv.email = parsed_data.get('email') or parsed_data.get('personalInfo', {}).get('email', '')
-        cv.phone = parsed_data.get('phone') or parsed_data.get('personalInfo', {}).get('phone', '')
-        cv.location = parsed_data.get('location') or parsed_data.get('personalInfo', {}).get('location', '')
-        cv.linkedin_url = parsed_data.get('linkedin_url') or parsed_data.get('personalInfo', {}).get('linkedin', '')
-        cv.profile_summary = parsed_data.get('profile_summary') or parsed_data.get('personalInfo', {}).get('summary', '')
-
-        # --- JSON sections ---
-        cv.educations = parsed_data.get('education') or parsed_data.get('educations', [])
-        cv.experiences = parsed_data.get('experience') or parsed_data.get('experiences', [])
-        cv.skills = parsed_data.get('skills', [])
-        cv.certifications = parsed_data.get('certifications', [])
-        cv.languages = parsed_data.get('languages', [])
-        cv.projects = parsed_data.get('projects', [])
-
-        # FIX: build personal_info so the editor gets a fully-populated object
-        cv.personal_info = {
-            'name': cv.full_name or '',
-            'title': cv.title or '',
-            'email': cv.email or '',
-            'phone': cv.phone or '',
-            'location': cv.location or '',
-            'linkedin': cv.linkedin_url or '',
-            'website': parsed_data.get('website', ''),
-            'summary': cv.profile_summary or '',
-            'photo': cv.photo_path or '',
-        }
 
-        cv.current_version = (cv.current_version or 0) + 1
+        await record_version(db, cv, 'upload', previous)
         cv.updated_at = datetime.utcnow()
 
-        db.commit()
-        db.refresh(cv)
+        await _commit_version(db)
+        await _refresh_cv(db, cv)
         return _cv_to_response(cv)
 
+    except HTTPException:
+        raise
+    except ExtractionLimitError as e:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"CV file is too large to process: {str(e)}"
+        )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to parse CV file: {str(e)}"
@@ -473,52 +728,63 @@ def upload_cv_file(
 
 
 @router.post("/{cv_id}/photo")
-def upload_photo(
+async def upload_photo(
     cv_id: int,
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Upload a profile photo for a CV."""
-    cv = db.query(CV).filter(CV.id == cv_id, CV.user_id == current_user.id).first()
-    if not cv:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="CV not found")
+    cv = await _get_owned_cv(db, cv_id, current_user)
+    content = await _read_upload(file)
 
     photo_dir = os.path.join(UPLOAD_DIR, "photos")
     os.makedirs(photo_dir, exist_ok=True)
     safe_filename = f"{cv_id}_{file.filename}"
     photo_path_fs = os.path.join(photo_dir, safe_filename)
-    with open(photo_path_fs, "wb") as f:
-        f.write(file.file.read())
+    await run_in_threadpool(_write_file, photo_path_fs, content)
+
+    # Normalize once here so PDF export embeds a ready-made JPEG
+    try:
+        derivative_paths = await run_in_threadpool(make_photo_derivatives, photo_path_fs)
+    except ValueError as e:
+        os.remove(photo_path_fs)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     # Store URL-accessible path so the frontend can display it directly
     photo_url = f"/uploads/photos/{safe_filename}"
+    derivatives = {
+        kind: f"/uploads/photos/{PHOTO_DERIVATIVE_DIR}/{os.path.basename(p)}" for kind, p in derivative_paths.items()
+    }
+    old_derivatives = cv.photo_derivatives or {}
+    remove_photo_derivatives(
+        {k: v for k, v in old_derivatives.items() if v not in derivatives.values()}, BACKEND_DIR
+    )
     cv.photo_path = photo_url
+    cv.photo_derivatives = derivatives or None
     pi = _get_personal_info(cv)
     pi['photo'] = photo_url
     cv.personal_info = pi
     cv.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(cv)
-    return {"photo_path": photo_url}
+    await db.commit()
+    await _refresh_cv(db, cv)
+    return {"photo_path": photo_url, "photo_derivatives": derivatives}
 
 
 @router.delete("/{cv_id}/photo")
-def remove_photo(
+async def remove_photo(
     cv_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Remove the profile photo from a CV — clears DB record and deletes the file."""
-    cv = db.query(CV).filter(CV.id == cv_id, CV.user_id == current_user.id).first()
-    if not cv:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="CV not found")
+    cv = await _get_owned_cv(db, cv_id, current_user)
 
     # Delete the file from disk
     photo_url = cv.photo_path or ""
+    remove_photo_derivatives(cv.photo_derivatives, BACKEND_DIR)
     if photo_url:
-        backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        file_path = os.path.join(backend_dir, photo_url.lstrip("/"))
+        file_path = os.path.join(BACKEND_DIR, photo_url.lstrip("/"))
         if os.path.isfile(file_path):
             try:
                 os.remove(file_path)
@@ -527,53 +793,126 @@ def remove_photo(
 
     # Clear from DB
     cv.photo_path = None
+    cv.photo_derivatives = None
     pi = _get_personal_info(cv)
     pi.pop("photo", None)
     cv.personal_info = pi
     cv.updated_at = datetime.utcnow()
-    db.commit()
+    await db.commit()
     return {"message": "Photo removed successfully"}
 
 
 
+def build_pdf_input(cv: CV) -> Tuple[dict, str, dict]:
+    """(cv_data, title, theme) for generate_cv_pdf from the stored CV."""
+    pi = _get_personal_info(cv)
+    theme = (cv.theme if isinstance(getattr(cv, 'theme', None), dict) else None) or {}
+
+    cv_data_for_pdf = {
+        'personalInfo': pi,
+        'summary': pi.get('summary') or cv.profile_summary or '',
+        'experience': cv.experiences or [],
+        'education': cv.educations or [],
+        'skills': cv.skills or [],
+        'certifications': cv.certifications or [],
+        'languages': cv.languages or [],
+        'projects': cv.projects or [],
+        'interests': cv.interests or [],
+        'custom_sections': (
+            getattr(cv, 'custom_sections', None) or []
+        ),
+    }
+    # Ready-made JPEG from upload time — only valid while the editor still shows that photo
+    derivatives = cv.photo_derivatives or {}
+    if derivatives.get('pdf') and pi.get('photo') == cv.photo_path:
+        cv_data_for_pdf['photo_pdf'] = derivatives['pdf']
+    return cv_data_for_pdf, cv.title or 'CV', theme
+
+
+def _pdf_filename(cv: CV) -> str:
+    return (cv.title or 'CV').replace(' ', '_') + '.pdf'
+
+
+def pdf_zip_jobs(cvs: List[CV]) -> List[dict]:
+    """Batch-export jobs (plain data, safe to use after the session closes) for stream_pdf_zip."""
+    jobs = []
+    for cv in cvs:
+        cv_data, title, theme = build_pdf_input(cv)
+        jobs.append({
+            'cv_id': cv.id,
+            'cv_data': cv_data,
+            'title': title,
+            'theme': theme,
+            # Prefix with the id so CVs with the same title don't collide
+            'filename': f"{cv.id}_{_pdf_filename(cv).replace('/', '_')}",
+        })
+    return jobs
+
+
+@router.get("/export/zip")
+async def export_cvs_zip(
+    ids: Optional[List[int]] = Query(None, description="CV ids to export (default: all of your CVs)"),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Download several CVs as PDFs in one ZIP. The archive is streamed while CVs render."""
+    query = select(CV).where(CV.user_id == current_user.id).options(undefer_group(CV_CONTENT))
+    if ids:
+        query = query.where(CV.id.in_(ids))
+    cvs = (await db.execute(query.order_by(CV.id))).scalars().all()
+    if not cvs:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No CVs to export")
+
+    return StreamingResponse(
+        stream_pdf_zip(pdf_zip_jobs(cvs)),
+        media_type='application/zip',
+        headers={'Content-Disposition': 'attachment; filename="cvs.zip"'}
+    )
+
+
 @router.get("/{cv_id}/export/pdf")
-def export_cv_pdf(
+async def export_cv_pdf(
     cv_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Generate and return a PDF version of the CV using stored theme."""
-    cv = db.query(CV).filter(CV.id == cv_id, CV.user_id == current_user.id).first()
-    if not cv:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="CV not found")
+    """
+    Generate and return a PDF version of the CV using stored theme.
+    Renders are cached on disk; the cache key is sent as ETag and a matching
+    If-None-Match is answered with 304. The file is streamed in chunks and
+    Range / If-Range requests get 206 partial content, so interrupted
+    downloads can resume.
+    """
+    cv = await _get_owned_cv(db, cv_id, current_user)
 
     try:
-        pi = _get_personal_info(cv)
-        theme = (cv.theme if isinstance(getattr(cv, 'theme', None), dict) else None) or {}
-
-        cv_data_for_pdf = {
-            'personalInfo': pi,
-            'summary': pi.get('summary') or cv.profile_summary or '',
-            'experience': cv.experiences or [],
-            'education': cv.educations or [],
-            'skills': cv.skills or [],
-            'certifications': cv.certifications or [],
-            'languages': cv.languages or [],
-            'projects': cv.projects or [],
-            'interests': cv.interests or [],
-            'custom_sections': (
-                getattr(cv, 'custom_sections', None) or []
-            ),
-        }
+        cv_data_for_pdf, title, theme = build_pdf_input(cv)
+
+        cache_key = pdf_cache_key(cv.id, cv_data_for_pdf, title, theme)
+        headers = {'ETag': f'"{cache_key}"', 'Cache-Control': 'private, no-cache'}
+        if etag_matches(if_none_match, cache_key):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-        pdf_bytes = generate_cv_pdf(cv_data_for_pdf, title=cv.title or 'CV', theme=theme)
+        await release_connection(db)
+        pdf_path = await run_in_threadpool(get_pinned_pdf, cv.id, cv_data_for_pdf, title, theme)
 
-        filename = (cv.title or 'CV').replace(' ', '_') + '.pdf'
-        return StreamingResponse(
-            io.BytesIO(pdf_bytes),
+        filename = _pdf_filename(cv)
+        return FileResponse(
+            pdf_path,
             media_type='application/pdf',
-            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+            filename=filename,
+            headers=headers,
+            background=BackgroundTask(discard_render_file, pdf_path),
+        )
+    except RenderQueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many PDF exports in progress. Please try again shortly.",
+            headers={'Retry-After': '5'},
         )
+    except RenderTimeout as e:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(e))
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -583,38 +922,71 @@ def export_cv_pdf(
         )
 
 
+@router.get("/{cv_id}/thumbnail")
+async def get_cv_thumbnail(
+    cv_id: int,
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    PNG preview of the first page of the exported PDF, for the CV list.
+    Cached under the same key / ETag as the PDF; after the first request it is
+    a file read (or a 304).
+    """
+    cv = await _get_owned_cv(db, cv_id, current_user)
+
+    cv_data_for_pdf, title, theme = build_pdf_input(cv)
+    cache_key = pdf_cache_key(cv.id, cv_data_for_pdf, title, theme)
+    headers = {'ETag': f'"{cache_key}"', 'Cache-Control': 'private, no-cache'}
+    if etag_matches(if_none_match, cache_key):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    try:
+        await release_connection(db)
+        path = await run_in_threadpool(get_pinned_thumbnail, cv.id, cv_data_for_pdf, title, theme)
+    except RenderQueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many PDF exports in progress. Please try again shortly.",
+            headers={'Retry-After': '5'},
+        )
+    except RenderTimeout as e:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(e))
+    return FileResponse(
+        path, media_type='image/png', headers=headers, background=BackgroundTask(discard_render_file, path)
+    )
+
+
 # ── AI endpoints ───────────────────────────────────────────────────────────────
 
 @router.post("/{cv_id}/analyze")
-def analyze_cv_endpoint(
+async def analyze_cv_endpoint(
     cv_id: int,
-    current_user: User = Depends(require_ai_access),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(require_ai_access_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Analyze CV with Groq and return strengths, improvements, score."""
-    cv = db.query(CV).filter(CV.id == cv_id, CV.user_id == current_user.id).first()
-    if not cv:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="CV not found")
+    cv = await _get_owned_cv(db, cv_id, current_user)
 
     cv_data = _build_cv_data_dict(cv)
-    result = analyze_cv(cv_data)
+    await release_connection(db)  # no connection held during the LLM call
+    result = await run_in_threadpool(analyze_cv, cv_data)
     return result
 
 
 @router.post("/{cv_id}/customize")
-def customize_cv(
+async def customize_cv(
     cv_id: int,
     request: CVCustomizationRequest,
-    current_user: User = Depends(require_ai_access),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(require_ai_access_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Analyze CV against a job description.
     Returns a keyword match score, matched/missing keywords, and AI suggestions.
     """
-    cv = db.query(CV).filter(CV.id == cv_id, CV.user_id == current_user.id).first()
-    if not cv:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="CV not found")
+    cv = await _get_owned_cv(db, cv_id, current_user)
 
     cv_data = _build_cv_data_dict(cv)
     job_desc = request.job_description
@@ -633,7 +1005,8 @@ def customize_cv(
     score, matched, missing = compute_match_score(cv_keywords, jd_keywords)
 
     # ── AI suggestions (Groq) with rule-based fallback ────────────────────────
-    suggestions_data = groq_suggestions(cv_data, job_desc, missing, score)
+    await release_connection(db)  # no connection held during the LLM call
+    suggestions_data = await run_in_threadpool(groq_suggestions, cv_data, job_desc, missing, score)
     if not suggestions_data:
         suggestions_data = rule_based_suggestions(cv_data, job_desc, missing, score)
 
@@ -647,7 +1020,7 @@ def customize_cv(
         similarity_score=score,
     )
     db.add(customization)
-    db.flush()   # get customization.id
+    await db.flush()   # get customization.id
 
     db_suggestions = []
     for s in suggestions_data:
@@ -662,10 +1035,10 @@ def customize_cv(
         db.add(obj)
         db_suggestions.append(obj)
 
-    db.commit()
-    db.refresh(customization)
+    await db.commit()
+    await db.refresh(customization)
     for obj in db_suggestions:
-        db.refresh(obj)
+        await db.refresh(obj)
 
     return {
         "id": customization.id,
@@ -678,11 +1051,11 @@ def customize_cv(
 
 
 @router.post("/{cv_id}/enhance-for-job")
-def enhance_cv_for_job_endpoint(
+async def enhance_cv_for_job_endpoint(
     cv_id: int,
     request: CVCustomizationRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Use Groq AI to regenerate the three ATS-critical sections of the CV
@@ -691,14 +1064,13 @@ def enhance_cv_for_job_endpoint(
 
     Returns the enhanced CV data — call /apply-ai-changes to persist.
     """
-    cv = db.query(CV).filter(CV.id == cv_id, CV.user_id == current_user.id).first()
-    if not cv:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="CV not found")
+    cv = await _get_owned_cv(db, cv_id, current_user)
 
     cv_data = _build_cv_data_dict(cv)
 
     # Use the same Groq client/model pattern as cover letter generation
-    result = groq_enhance_sections(cv_data, request.job_description)
+    await release_connection(db)  # no connection held during the LLM call
+    result = await run_in_threadpool(groq_enhance_sections, cv_data, request.job_description)
 
     success = result.get('status') == 'success'
     return {
@@ -766,11 +1138,11 @@ def enhance_cv_for_job_endpoint(
 
 
 @router.post("/{cv_id}/apply-ai-changes", response_model=CVResponse)
-def apply_ai_changes(
+async def apply_ai_changes(
     cv_id: int,
     request: ApplyAIChangesRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Apply AI-enhanced CV data back to the database.
@@ -779,9 +1151,8 @@ def apply_ai_changes(
     ✅ FIXED: Proper error handling, no data loss, updates personal_info correctly
     """
     try:
-        cv = db.query(CV).filter(CV.id == cv_id, CV.user_id == current_user.id).first()
-        if not cv:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="CV not found")
+        cv = await _get_owned_cv(db, cv_id, current_user, for_update=True)
+        previous = cv_snapshot(cv)
 
         enhanced = request.enhanced_cv
         
@@ -841,12 +1212,13 @@ def apply_ai_changes(
             cv.projects = enhanced['projects'] if enhanced['projects'] else []
 
         # ── Update version & timestamp ──────────────────────────────────────────
-        cv.current_version = (cv.current_version or 1) + 1
+        await record_version(db, cv, 'ai_changes', previous)
         cv.updated_at = datetime.utcnow()
 
         # ── Commit to database ──────────────────────────────────────────────────
-        db.commit()
-        db.refresh(cv)
+        await _commit_version(db)
+        await _refresh_cv(db, cv)
+        schedule_prerender(cv.id, *build_pdf_input(cv))
         
         return _cv_to_response(cv)
     
@@ -855,7 +1227,7 @@ def apply_ai_changes(
         raise
     except Exception as e:
         # Catch unexpected errors and return informative response
-        db.rollback()
+        await db.rollback()
         import traceback
         error_detail = f"Failed to apply changes: {str(e)}"
         print(f"Error in apply_ai_changes: {error_detail}")
@@ -869,15 +1241,22 @@ def apply_ai_changes(
 # ── Suggestions ───────────────────────────────────────────────────────────────
 
 @router.get("/{cv_id}/suggestions", response_model=List[SuggestionResponse])
-def get_suggestions(
+async def get_suggestions(
     cv_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    cv = db.query(CV).filter(CV.id == cv_id, CV.user_id == current_user.id).first()
-    if not cv:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="CV not found")
-    return db.query(Suggestion).filter(Suggestion.cv_id == cv_id).order_by(Suggestion.created_at.desc()).all()
+    cv = await _get_owned_cv(db, cv_id, current_user)
+    return (await db.execute(
+        select(Suggestion).where(Suggestion.cv_id == cv_id).order_by(Suggestion.created_at.desc())
+    )).scalars().all()
+
+
+# Suggestion section → CV column it edits
+_SUGGESTION_COLUMNS = {
+    'experience': 'experiences', 'projects': 'projects', 'education': 'educations',
+    'skills': 'skills', 'languages': 'languages', 'certifications': 'certifications',
+}
 
 
 # ════════════════════════════════════════════════════════════════════════════════════
@@ -887,11 +1266,11 @@ def get_suggestions(
 # This version REPLACES original content instead of appending when suggestion_data exists
 
 @router.post("/{cv_id}/suggestions/{suggestion_id}/apply")
-def apply_suggestion(
+async def apply_suggestion(
     cv_id: int,
     suggestion_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     ✅ FIXED: Apply a suggestion by merging/replacing its data into the CV.
@@ -911,15 +1290,14 @@ def apply_suggestion(
     """
     
     # Step 1: Verify CV ownership
-    cv = db.query(CV).filter(CV.id == cv_id, CV.user_id == current_user.id).first()
-    if not cv:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="CV not found")
+    cv = await _get_owned_cv(db, cv_id, current_user, for_update=True)
+    previous = cv_snapshot(cv)
 
     # Step 2: Get the suggestion with its data
-    suggestion = db.query(Suggestion).filter(
+    suggestion = (await db.execute(select(Suggestion).where(
         Suggestion.id == suggestion_id,
         Suggestion.cv_id == cv_id
-    ).first()
+    ))).scalars().first()
     if not suggestion:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Suggestion not found")
 
@@ -933,7 +1311,7 @@ def apply_suggestion(
             print(f"⚠️ Suggestion {suggestion_id} has no suggestion_data to merge")
             suggestion.is_applied = True
             suggestion.updated_at = datetime.utcnow()
-            db.commit()
+            await db.commit()
             return {
                 "message": "Suggestion marked as applied (no data to merge)",
                 "suggestion": SuggestionResponse.from_orm(suggestion)
@@ -1040,15 +1418,20 @@ def apply_suggestion(
         suggestion.updated_at = datetime.utcnow()
         
         # Step 5: Update CV timestamp and version
+        # The sections above are edited in place, which the ORM does not notice on its own
+        column = _SUGGESTION_COLUMNS.get(section)
+        if column:
+            flag_modified(cv, column)
         cv.updated_at = datetime.utcnow()
-        cv.current_version = (cv.current_version or 1) + 1
+        await record_version(db, cv, 'suggestion', previous)
         
         # Step 6: Commit to database
         db.add(cv)
         db.add(suggestion)
-        db.commit()
-        db.refresh(cv)
-        db.refresh(suggestion)
+        await _commit_version(db)
+        await _refresh_cv(db, cv)
+        await db.refresh(suggestion)
+        schedule_prerender(cv.id, *build_pdf_input(cv))
         
         print(f"✅ Suggestion applied successfully!")
         
@@ -1060,8 +1443,10 @@ def apply_suggestion(
             "updated_cv": cv  # ← CRITICAL: Return the updated CV
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         import traceback
         print(f"❌ Error applying suggestion: {str(e)}")
         print(traceback.format_exc())
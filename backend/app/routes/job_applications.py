@@ -1,62 +1,76 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime
-from app.database import get_db
+from app.database import get_async_db
 from app.models import User, JobApplication, JobStatus
 from app.schemas import JobApplicationCreate, JobApplicationUpdate, JobApplicationResponse
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user_async
+from app.utils.ttl_cache import job_stats_cache
 
 router = APIRouter(prefix="/job-applications", tags=["job-applications"])
 
 
+async def _get_owned_application(db: AsyncSession, app_id: int, user: User) -> JobApplication:
+    app = (await db.execute(
+        select(JobApplication).where(JobApplication.id == app_id, JobApplication.user_id == user.id)
+    )).scalars().first()
+    if not app:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job application not found")
+    return app
+
+
 @router.get("", response_model=List[JobApplicationResponse])
-def get_job_applications(
+async def get_job_applications(
     status_filter: Optional[str] = Query(None, alias="status"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """List all job applications for the user, optionally filtered by status."""
-    query = db.query(JobApplication).filter(JobApplication.user_id == current_user.id)
+    query = select(JobApplication).where(JobApplication.user_id == current_user.id)
     if status_filter:
-        query = query.filter(JobApplication.status == status_filter)
-    return query.order_by(JobApplication.updated_at.desc()).all()
+        query = query.where(JobApplication.status == status_filter)
+    return (await db.execute(query.order_by(JobApplication.updated_at.desc()))).scalars().all()
 
 
 @router.get("/stats")
-def get_stats(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_stats(
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get application counts per status for dashboard stats."""
-    apps = db.query(JobApplication).filter(JobApplication.user_id == current_user.id).all()
+    """Get application counts per status for dashboard stats (one GROUP BY, cached per user)."""
+    cached = job_stats_cache.get(current_user.id)
+    if cached is not None:
+        return cached
+
+    rows = await db.execute(
+        select(JobApplication.status, func.count())
+        .where(JobApplication.user_id == current_user.id)
+        .group_by(JobApplication.status)
+    )
     stats = {s.value: 0 for s in JobStatus}
-    for app in apps:
-        stats[app.status.value] += 1
-    stats["total"] = len(apps)
+    for app_status, count in rows:
+        stats[app_status.value] = count
+    stats["total"] = sum(stats.values())
+    job_stats_cache.set(current_user.id, stats)
     return stats
 
 
 @router.get("/{app_id}", response_model=JobApplicationResponse)
-def get_job_application(
+async def get_job_application(
     app_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    app = db.query(JobApplication).filter(
-        JobApplication.id == app_id,
-        JobApplication.user_id == current_user.id
-    ).first()
-    if not app:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job application not found")
-    return app
+    return await _get_owned_application(db, app_id, current_user)
 
 
 @router.post("", response_model=JobApplicationResponse)
-def create_job_application(
+async def create_job_application(
     data: JobApplicationCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new job application entry."""
     app = JobApplication(
@@ -73,42 +87,39 @@ def create_job_application(
         cover_letter_id=data.cover_letter_id,
     )
     db.add(app)
-    db.commit()
-    db.refresh(app)
+    await db.commit()
+    job_stats_cache.invalidate(current_user.id)
+    await db.refresh(app)
     return app
 
 
 @router.put("/{app_id}", response_model=JobApplicationResponse)
-def update_job_application(
+async def update_job_application(
     app_id: int,
     data: JobApplicationUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a job application (including status change)."""
-    app = db.query(JobApplication).filter(
-        JobApplication.id == app_id,
-        JobApplication.user_id == current_user.id
-    ).first()
-    if not app:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job application not found")
+    app = await _get_owned_application(db, app_id, current_user)
 
     for field, value in data.model_dump(exclude_unset=True).items():
         if value is not None:
             setattr(app, field, value)
 
     app.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(app)
+    await db.commit()
+    job_stats_cache.invalidate(current_user.id)
+    await db.refresh(app)
     return app
 
 
 @router.patch("/{app_id}/status", response_model=JobApplicationResponse)
-def update_status(
+async def update_status(
     app_id: int,
     new_status: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Quick status update endpoint (for Kanban drag-drop)."""
     try:
@@ -116,34 +127,26 @@ def update_status(
     except ValueError:
         raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {[s.value for s in JobStatus]}")
 
-    app = db.query(JobApplication).filter(
-        JobApplication.id == app_id,
-        JobApplication.user_id == current_user.id
-    ).first()
-    if not app:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job application not found")
+    app = await _get_owned_application(db, app_id, current_user)
 
     app.status = status_val
     if status_val == JobStatus.applied and not app.applied_date:
         app.applied_date = datetime.utcnow()
     app.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(app)
+    await db.commit()
+    job_stats_cache.invalidate(current_user.id)
+    await db.refresh(app)
     return app
 
 
 @router.delete("/{app_id}")
-def delete_job_application(
+async def delete_job_application(
     app_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    app = db.query(JobApplication).filter(
-        JobApplication.id == app_id,
-        JobApplication.user_id == current_user.id
-    ).first()
-    if not app:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job application not found")
-    db.delete(app)
-    db.commit()
+    app = await _get_owned_application(db, app_id, current_user)
+    await db.delete(app)
+    await db.commit()
+    job_stats_cache.invalidate(current_user.id)
     return {"message": "Job application deleted successfully"}
@@ -212,6 +212,7 @@ class CVResponse(BaseModel):
 
     file_path: Optional[str] = None
     photo_path: Optional[str] = None
+    photo_derivatives: Optional[Dict[str, str]] = None
     original_text: Optional[str] = None
 
     current_version: int = 1
@@ -223,6 +224,21 @@ class CVResponse(BaseModel):
         from_attributes = True
 
 
+class CVSummary(BaseModel):
+    """One row of the CV list: just what the list view renders."""
+    id: int
+    title: Optional[str] = None
+    updated_at: Optional[datetime] = None
+    current_version: int = 1
+    theme: Dict[str, Any] = {}
+    photo_thumbnail: Optional[str] = None  # URL of the small photo derivative
+
+
+class CVSummaryPage(BaseModel):
+    items: List[CVSummary]
+    next_cursor: Optional[str] = None  # pass back as ?cursor= for the next page; null on the last page
+
+
 # class ApplyAIChangesRequest(BaseModel):
 #     """Payload for applying AI-enhanced CV data back to the database."""
 #     enhanced_cv: Dict[str, Any]
@@ -272,12 +288,27 @@ class CVVersionResponse(BaseModel):
     cv_id: int
     version_number: int
     snapshot: dict
+    source: Optional[str] = None
     created_at: datetime
 
     class Config:
         from_attributes = True
 
 
+class CVVersionSummary(BaseModel):
+    version_number: int
+    kind: str                                   # "keyframe" | "delta" (storage detail)
+    source: Optional[str] = None                # created, edit, upload, ai_changes, suggestion, revert, ...
+    created_at: Optional[datetime] = None
+    changed_fields: Optional[List[str]] = None  # top-level fields a delta touched; None for keyframes
+
+
+class CVVersionDiff(BaseModel):
+    from_version: int
+    to_version: int
+    patch: List[Dict[str, Any]]                 # RFC 6902 operations turning from_version into to_version
+
+
 # ───────────────────────────────────────────────────────────────
 # AI CUSTOMIZATION
 # ───────────────────────────────────────────────────────────────
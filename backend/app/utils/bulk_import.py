@@ -0,0 +1,294 @@
+"""
+Bulk CV import.
+Parses a ZIP archive or a directory of CV files on a process pool and creates
+CV rows in batches. Progress is reported as a stream of event dicts so both the
+admin endpoint (NDJSON response) and the CLI can forward it as they like.
+A file that fails to parse or save is reported and skipped — it never aborts
+the rest of the batch. Workers run under the memory/time limits of
+app.utils.parse_worker.
+"""
+
+import logging
+import os
+import shutil
+import zipfile
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.config import (
+    BULK_IMPORT_BATCH_SIZE,
+    BULK_IMPORT_MAX_ARCHIVE_SIZE,
+    BULK_IMPORT_MAX_FILES,
+    BULK_IMPORT_WORKERS,
+    UPLOAD_DIRECTORY,
+)
+from app.utils.cv_parser import parsed_to_cv_columns
+from app.utils.parse_worker import limit_worker_resources, parse_in_worker
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.doc', '.txt')
+
+
+class BulkImportError(ValueError):
+    """Raised when the import source itself is unusable (bad archive, too many files)."""
+
+
+# ── Collecting input files ────────────────────────────────────────────────────
+
+def _is_cv_file(name: str) -> bool:
+    base = os.path.basename(name)
+    # Skip hidden files and macOS resource forks (e.g. __MACOSX/._cv.pdf)
+    if not base or base.startswith('.') or '__MACOSX' in name:
+        return False
+    return os.path.splitext(base)[1].lower() in SUPPORTED_EXTENSIONS
+
+
+def collect_files(source_dir: str) -> List[str]:
+    """Return all supported CV files below source_dir, sorted for stable ordering."""
+    if not os.path.isdir(source_dir):
+        raise BulkImportError(f"Not a directory: {source_dir}")
+    paths = []
+    for root, _dirs, files in os.walk(source_dir):
+        for name in files:
+            full = os.path.join(root, name)
+            if _is_cv_file(full):
+                paths.append(full)
+    paths.sort()
+    if len(paths) > BULK_IMPORT_MAX_FILES:
+        raise BulkImportError(f"Too many files: {len(paths)} (max {BULK_IMPORT_MAX_FILES})")
+    return paths
+
+
+def extract_zip(zip_path: str, dest_dir: str) -> List[str]:
+    """
+    Extract the supported CV files of a ZIP archive into dest_dir.
+    Entries are flattened to their base name so crafted paths ('../x') cannot
+    escape dest_dir, and the total uncompressed size is capped.
+    """
+    try:
+        archive = zipfile.ZipFile(zip_path)
+    except zipfile.BadZipFile:
+        raise BulkImportError("Uploaded file is not a valid ZIP archive")
+
+    with archive:
+        members = [m for m in archive.infolist() if not m.is_dir() and _is_cv_file(m.filename)]
+        if not members:
+            raise BulkImportError("Archive contains no PDF, DOCX or TXT files")
+        if len(members) > BULK_IMPORT_MAX_FILES:
+            raise BulkImportError(f"Too many files: {len(members)} (max {BULK_IMPORT_MAX_FILES})")
+        if sum(m.file_size for m in members) > BULK_IMPORT_MAX_ARCHIVE_SIZE:
+            raise BulkImportError("Archive is too large when uncompressed")
+
+        os.makedirs(dest_dir, exist_ok=True)
+        paths = []
+        for i, member in enumerate(members):
+            # Prefix with the index so equal names from different folders don't collide
+            target = os.path.join(dest_dir, f"{i:05d}_{os.path.basename(member.filename)}")
+            with archive.open(member) as src, open(target, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            paths.append(target)
+    return paths
+
+
+def _display_name(path: str) -> str:
+    """Original file name without the index prefix added by extract_zip."""
+    base = os.path.basename(path)
+    prefix, sep, rest = base.partition('_')
+    return rest if sep and prefix.isdigit() and len(prefix) == 5 else base
+
+
+# ── Parsing ───────────────────────────────────────────────────────────────────
+
+_WORKER_KILLED = "File exceeds the memory or time limit for extraction"
+
+
+def _outcome(future: Future) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """(parsed, error) of a finished parse."""
+    try:
+        parsed = future.result()
+    except BrokenProcessPool:
+        return None, _WORKER_KILLED
+    except Exception as e:  # over a limit
+        return None, str(e) or type(e).__name__
+    return parsed, parsed.get('parse_error')
+
+
+def _parse_files(file_paths: List[str], workers: int) -> Iterator[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Yield (path, parsed, error) for every file, in completion order.
+    A worker killed by the OS (over RLIMIT_AS / RLIMIT_CPU, or crashed) breaks
+    the whole pool. The files it left unfinished go to a new pool: first the
+    ones that may have been running, one at a time, so only the file that
+    killed its worker is reported failed; then the rest concurrently again.
+    """
+    pending = list(file_paths)
+    serial = 0  # leading files of pending to parse on their own
+    while pending:
+        if serial:
+            path = pending.pop(0)
+            serial -= 1
+            with ProcessPoolExecutor(max_workers=1, initializer=limit_worker_resources) as pool:
+                future = pool.submit(parse_in_worker, path)
+            yield (path, *_outcome(future))
+            continue
+
+        size = min(workers, len(pending))
+        pool = ProcessPoolExecutor(max_workers=size, initializer=limit_worker_resources)
+        futures = {pool.submit(parse_in_worker, path): path for path in pending}
+        reported = set()
+        broken = False
+        try:
+            for future in as_completed(futures):
+                if isinstance(future.exception(), BrokenProcessPool):
+                    broken = True
+                    break
+                reported.add(future)
+                yield (futures[future], *_outcome(future))
+        finally:
+            pool.shutdown(wait=not broken, cancel_futures=True)
+        if not broken:
+            return
+
+        logger.warning("A bulk import parse worker died; resubmitting the unfinished files")
+        pending = []
+        for future, path in futures.items():
+            if future in reported:
+                continue
+            if future.done() and not isinstance(future.exception(), BrokenProcessPool):
+                reported.add(future)
+                yield (path, *_outcome(future))
+            else:
+                pending.append(path)
+        # Tasks are handed out in submission order, at most one beyond the workers ahead of time,
+        # so the file that killed the pool is among the first size + 1 unfinished ones
+        serial = min(len(pending), size + 1)
+
+
+# ── Import ────────────────────────────────────────────────────────────────────
+
+def _insert_batch(db, user_id: int, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Create and commit the CV rows of a batch; on failure nothing is kept (rows or stored files) and it raises."""
+    from app.models import CV
+
+    cvs, stored = [], []
+    try:
+        for item in batch:
+            title = os.path.splitext(item['name'])[0]
+            cv = CV(user_id=user_id, current_version=1, **parsed_to_cv_columns(item['parsed'], title=title))
+            db.add(cv)
+            cvs.append(cv)
+        db.flush()  # assign ids so files can be stored under the usual "<cv_id>_<name>" path
+        for item, cv in zip(batch, cvs):
+            stored_path = os.path.join(UPLOAD_DIRECTORY, f"{cv.id}_{item['name']}")
+            shutil.copyfile(item['path'], stored_path)
+            stored.append(stored_path)
+            cv.file_path = stored_path
+        db.commit()
+    except Exception:
+        db.rollback()
+        for path in stored:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        raise
+
+    return [
+        {'event': 'file', 'file': item['name'], 'status': 'ok', 'cv_id': cv.id}
+        for item, cv in zip(batch, cvs)
+    ]
+
+
+def _save_batch(db, user_id: int, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Create CV rows for one batch of parsed files and return one event per file.
+    If the batch fails (e.g. one parsed value too long for its column), its
+    files are saved one at a time so only the bad ones are reported.
+    """
+    try:
+        return _insert_batch(db, user_id, batch)
+    except Exception as e:
+        if len(batch) == 1:
+            return [{'event': 'file', 'file': batch[0]['name'], 'status': 'error', 'error': f"Saving failed: {e}"}]
+        logger.warning("Bulk import batch of %d files failed, saving them one at a time: %s", len(batch), e)
+    events = []
+    for item in batch:
+        events.extend(_save_batch(db, user_id, [item]))
+    return events
+
+
+def run_bulk_import(
+    file_paths: List[str],
+    user_id: int,
+    *,
+    workers: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    session_factory=None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Parse file_paths concurrently and create one CV per file for user_id.
+
+    Yields progress events:
+      {'event': 'start', 'total': N}
+      {'event': 'file', 'file': name, 'status': 'ok', 'cv_id': id, 'processed': k}
+      {'event': 'file', 'file': name, 'status': 'error', 'error': msg, 'processed': k}
+      {'event': 'done', 'total': N, 'imported': x, 'failed': y, 'failures': [...]}
+    """
+    if session_factory is None:
+        from app.database import SessionLocal
+        session_factory = SessionLocal
+
+    workers = max(1, workers or BULK_IMPORT_WORKERS)
+    batch_size = max(1, batch_size or BULK_IMPORT_BATCH_SIZE)
+    total = len(file_paths)
+    processed = 0
+    imported = 0
+    failures: List[Dict[str, str]] = []
+    started = datetime.utcnow()
+
+    yield {'event': 'start', 'total': total}
+    os.makedirs(UPLOAD_DIRECTORY, exist_ok=True)
+
+    def _emit(events):
+        nonlocal processed, imported
+        for evt in events:
+            processed += 1
+            evt['processed'] = processed
+            if evt['status'] == 'ok':
+                imported += 1
+            else:
+                failures.append({'file': evt['file'], 'error': evt['error']})
+            yield evt
+
+    db = session_factory()
+    try:
+        batch: List[Dict[str, Any]] = []
+        for path, parsed, error in _parse_files(file_paths, workers):
+            name = _display_name(path)
+            if error:
+                yield from _emit([{'event': 'file', 'file': name, 'status': 'error', 'error': error}])
+                continue
+
+            batch.append({'path': path, 'name': name, 'parsed': parsed})
+            if len(batch) >= batch_size:
+                yield from _emit(_save_batch(db, user_id, batch))
+                batch = []
+
+        if batch:
+            yield from _emit(_save_batch(db, user_id, batch))
+    finally:
+        db.close()
+
+    elapsed = (datetime.utcnow() - started).total_seconds()
+    logger.info("Bulk import for user %s: %d imported, %d failed in %.1fs", user_id, imported, len(failures), elapsed)
+    yield {
+        'event': 'done',
+        'total': total,
+        'imported': imported,
+        'failed': len(failures),
+        'failures': failures,
+        'elapsed_seconds': round(elapsed, 2),
+    }
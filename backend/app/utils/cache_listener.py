@@ -0,0 +1,94 @@
+"""
+Cross-worker invalidation of the auth user cache over PostgreSQL LISTEN/NOTIFY.
+
+A write that changes a user's auth fields calls notify_user_changed() before
+committing. PostgreSQL delivers the notification on commit, and only then,
+to every worker's listener thread, which drops that user from its
+auth_user_cache. The writer also invalidates its own cache right after the
+commit. If the listener connection is lost, the whole cache is cleared on
+reconnect. The TTL (AUTH_USER_CACHE_TTL_SECONDS) bounds staleness when no
+listener runs at all.
+"""
+
+import logging
+import select
+import threading
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.utils.ttl_cache import auth_user_cache
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "auth_user_changed"
+_POLL_SECONDS = 5.0
+_RECONNECT_SECONDS = 2.0
+
+_thread: Optional[threading.Thread] = None
+_stop = threading.Event()
+
+
+def notify_user_changed(db: Session, user_id: int) -> None:
+    """Queue an invalidation for user_id in db's transaction (sent on commit; no-op off PostgreSQL)."""
+    if db.get_bind().dialect.name == 'postgresql':
+        db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": str(user_id)})
+
+
+def _invalidate(payload: str) -> None:
+    try:
+        auth_user_cache.invalidate(int(payload))
+    except ValueError:
+        auth_user_cache.invalidate()
+
+
+def _listen(engine) -> None:
+    while not _stop.is_set():
+        conn = None
+        try:
+            cargs, cparams = engine.dialect.create_connect_args(engine.url)
+            conn = engine.dialect.connect(*cargs, **cparams)
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {CHANNEL}")
+            # Changes made while no listener was connected were missed
+            auth_user_cache.invalidate()
+            while not _stop.is_set():
+                if select.select([conn], [], [], _POLL_SECONDS) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    _invalidate(conn.notifies.pop(0).payload)
+        except Exception as e:
+            logger.warning("Auth cache listener disconnected, retrying: %s", e)
+            auth_user_cache.invalidate()
+            _stop.wait(_RECONNECT_SECONDS)
+        finally:
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+
+def start_cache_listener() -> bool:
+    """Start the listener thread (PostgreSQL + psycopg2 with caching enabled only). Returns True if started."""
+    global _thread
+    from app.database import engine
+
+    if auth_user_cache.ttl <= 0 or engine.dialect.name != 'postgresql' or engine.dialect.driver != 'psycopg2':
+        return False
+    if _thread is not None and _thread.is_alive():
+        return True
+    _stop.clear()
+    _thread = threading.Thread(target=_listen, args=(engine,), name="auth-cache-listener", daemon=True)
+    _thread.start()
+    return True
+
+
+def stop_cache_listener() -> None:
+    """Signal the listener thread to stop (application shutdown); it exits within one poll interval."""
+    global _thread
+    _stop.set()
+    _thread = None
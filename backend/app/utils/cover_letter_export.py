@@ -0,0 +1,190 @@
+"""
+Cover letter export (PDF and DOCX).
+Letters are laid out with the linked CV's theme: the PDF reuses the compiled
+CV template (styles, colours, header band) from pdf_templates, the DOCX is a
+plain python-docx document in the same colour and font. Exports are cached in
+the render cache under cover_letter_cache_key, so re-downloading an unchanged
+letter is a file read.
+"""
+
+import os
+import re
+from functools import lru_cache
+from typing import Any, BinaryIO, Dict, List, Optional
+from xml.sax.saxutils import escape
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import HRFlowable, Paragraph, SimpleDocTemplate, Spacer, Table
+
+from app.utils.pdf_cache import (
+    cover_letter_cache_key, discard_render_file, new_render_file, pinned_file,
+)
+from app.utils.pdf_templates import get_template
+
+EXPORT_FORMATS = {
+    'pdf': ('.pdf', 'application/pdf'),
+    'docx': ('.docx', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'),
+}
+
+# Generic CSS families → fonts Word has everywhere
+_DOCX_GENERIC_FONTS = {
+    'sans-serif': 'Arial', 'system-ui': 'Arial', 'serif': 'Times New Roman', 'monospace': 'Courier New',
+}
+
+
+def cover_letter_text(content: Any) -> str:
+    """Letter body from the stored content: {'text': ...} (AI), or the editor's opening / body / closing / signature."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, dict):
+        text = content.get('text') or content.get('content')
+        if text:
+            return text
+        return '\n\n'.join(content[k] for k in ('opening', 'body', 'closing', 'signature') if content.get(k))
+    return ''
+
+
+def _paragraphs(text: str) -> List[str]:
+    """Blank-line separated paragraphs, keeping single line breaks inside them."""
+    return [p.strip() for p in re.split(r'\n\s*\n', text.replace('\r\n', '\n')) if p.strip()]
+
+
+def _contact_line(sender: Dict[str, Any]) -> str:
+    parts = [sender.get(k) for k in ('email', 'phone', 'location', 'linkedin', 'website')]
+    return '    |    '.join(str(p) for p in parts if p)
+
+
+# ── PDF ───────────────────────────────────────────────────────────────────────
+
+@lru_cache(maxsize=128)
+def _letter_style(body: ParagraphStyle) -> ParagraphStyle:
+    """Letter body derived from a compiled template's body style (templates are cached, so is this)."""
+    return ParagraphStyle(f'{body.name}Letter', parent=body, fontSize=10.5, leading=15, spaceAfter=9)
+
+
+def write_cover_letter_pdf(
+    output: BinaryIO,
+    text: str,
+    sender: Dict[str, Any],
+    title: str = "Cover Letter",
+    theme: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Write the letter as an A4 PDF with the CV theme's header to output."""
+    tpl = get_template(theme)
+    doc = SimpleDocTemplate(
+        output,
+        pagesize=A4,
+        leftMargin=tpl.margin,
+        rightMargin=tpl.margin,
+        topMargin=0,
+        bottomMargin=tpl.bottom_margin,
+        title=title,
+    )
+
+    name_block = [Paragraph(escape(sender.get('name') or ''), tpl.name)]
+    if sender.get('title'):
+        name_block.append(Paragraph(escape(sender['title']), tpl.title))
+    contact = _contact_line(sender)
+    if contact:
+        name_block.append(Paragraph(escape(contact), tpl.contact))
+
+    story = []
+    if tpl.banner:
+        header = Table([[p] for p in name_block], colWidths=[doc.width + 2 * tpl.margin])
+        header.setStyle(tpl.banner_table)
+        story += [header, Spacer(1, 24)]
+    else:
+        story.append(Spacer(1, 12))
+        story += name_block
+        story.append(HRFlowable(width='100%', thickness=2, color=tpl.text, spaceAfter=24))
+
+    body = _letter_style(tpl.body)
+    for para in _paragraphs(text):
+        story.append(Paragraph(escape(para).replace('\n', '<br/>'), body))
+    doc.build(story)
+
+
+# ── DOCX ──────────────────────────────────────────────────────────────────────
+
+def _docx_font(css_family: Optional[str]) -> str:
+    """First concrete family of a CSS font stack, or a safe stand-in for a generic one."""
+    for name in (css_family or '').split(','):
+        name = name.strip().strip('"\'')
+        if name:
+            return _DOCX_GENERIC_FONTS.get(name.lower(), name)
+    return 'Arial'
+
+
+def write_cover_letter_docx(
+    output: BinaryIO,
+    text: str,
+    sender: Dict[str, Any],
+    title: str = "Cover Letter",
+    theme: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Write the letter as a DOCX in the theme's colour and font to output."""
+    from docx import Document
+    from docx.shared import Pt, RGBColor
+
+    tpl = get_template(theme)
+    primary = RGBColor.from_string(tpl.primary_hex.lstrip('#').upper()[:6].ljust(6, '0'))
+    gray = RGBColor(0x6B, 0x72, 0x80)
+
+    doc = Document()
+    doc.core_properties.title = title
+    normal = doc.styles['Normal']
+    normal.font.name = _docx_font((theme or {}).get('fontFamily'))
+    normal.font.size = Pt(10.5)
+
+    name = doc.add_paragraph().add_run(sender.get('name') or '')
+    name.bold = True
+    name.font.size = Pt(20)
+    name.font.color.rgb = primary
+    for line, size in ((sender.get('title'), 11), (_contact_line(sender), 8.5)):
+        if line:
+            run = doc.add_paragraph().add_run(line)
+            run.font.size = Pt(size)
+            run.font.color.rgb = gray
+    doc.add_paragraph()
+
+    for para in _paragraphs(text):
+        p = doc.add_paragraph()
+        for i, line in enumerate(para.split('\n')):
+            run = p.add_run()
+            if i:
+                run.add_break()
+            run.add_text(line)
+        p.paragraph_format.space_after = Pt(9)
+    doc.save(output)
+
+
+# ── Cache ─────────────────────────────────────────────────────────────────────
+
+_WRITERS = {'pdf': write_cover_letter_pdf, 'docx': write_cover_letter_docx}
+
+
+def get_pinned_cover_letter(
+    cl_id: int,
+    updated_at: Any,
+    fmt: str,
+    text: str,
+    sender: Dict[str, Any],
+    title: str,
+    theme: Optional[Dict[str, Any]],
+) -> str:
+    """Pinned link (pin_file) to the cached export of this cover letter state in fmt ('pdf' or 'docx'); discard it once served."""
+    ext = EXPORT_FORMATS[fmt][0]
+    key = cover_letter_cache_key(cl_id, fmt, updated_at, sender, theme)
+
+    def export() -> str:
+        fd, tmp_path = new_render_file()
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                _WRITERS[fmt](f, text, sender, title=title, theme=theme)
+        except Exception:
+            discard_render_file(tmp_path)
+            raise
+        return tmp_path
+
+    return pinned_file(key, ext, export)
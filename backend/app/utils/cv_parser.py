@@ -4,9 +4,24 @@ Supports PDF (via pdfplumber) and DOCX (via python-docx).
 Handles multilingual CVs: English, German, French, Spanish, etc.
 """
 
+import logging
 import os
 import re
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+
+from app.config import (
+    CV_MAX_TEXT_CHARS,
+    PDF_FAST_MAX_SHORT_LINE_RATIO,
+    PDF_FAST_MIN_LINES,
+    PDF_FAST_MIN_SECTIONS,
+    PDF_MAX_PAGES,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionLimitError(ValueError):
+    """Raised when a file exceeds the page, character, memory or time limits for extraction."""
 
 
 # ── Section keyword maps (multilingual) ──────────────────────────────────────
@@ -76,31 +91,134 @@ MONTHS = {
 
 def extract_text_from_file(file_path: str) -> str:
     """Extract text from CV file. Supports PDF and DOCX."""
+    return extract_text_with_tier(file_path)[0]
+
+
+def extract_text_with_tier(file_path: str) -> Tuple[str, str]:
+    """
+    Extract text and report which extractor produced it:
+    'text_layer' or 'layout' for PDFs, 'docx' or 'plain' otherwise.
+    """
     ext = os.path.splitext(file_path)[1].lower()
     if ext == '.pdf':
-        return _extract_pdf(file_path)
+        return _extract_pdf_tiered(file_path)
     elif ext in ('.doc', '.docx'):
-        return _extract_docx(file_path)
+        return _extract_docx(file_path), 'docx'
     else:
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                return f.read()
+                text = f.read(CV_MAX_TEXT_CHARS + 1)
         except Exception as e:
             raise ValueError(f"Failed to extract text: {str(e)}")
+        _check_text_size(len(text))
+        return text, 'plain'
+
+
+def _check_page_count(pages: int) -> None:
+    if pages > PDF_MAX_PAGES:
+        raise ExtractionLimitError(f"PDF has {pages} pages (limit is {PDF_MAX_PAGES})")
+
+
+def _check_text_size(chars: int) -> None:
+    if chars > CV_MAX_TEXT_CHARS:
+        raise ExtractionLimitError(f"Extracted text exceeds {CV_MAX_TEXT_CHARS} characters")
+
+
+# ── PDF extraction (tiered) ───────────────────────────────────────────────────
+# Tier 1 reads the raw text layer with pdfium (no layout analysis, ~25x faster).
+# Tier 2 is pdfplumber's full character-level layout pass, used only when the
+# tier-1 text fails the quality check below.
+
+def _extract_pdf_tiered(file_path: str) -> Tuple[str, str]:
+    try:
+        text = _extract_pdf_text_layer(file_path)
+        problem = _text_layer_problem(text)
+    except (ExtractionLimitError, MemoryError):
+        raise  # over the limits: the layout pass would need even more
+    except Exception as e:
+        problem = f"text layer unreadable ({e})"
+
+    if problem is None:
+        logger.info("PDF extraction tier=text_layer file=%s", os.path.basename(file_path))
+        return text, 'text_layer'
+
+    logger.info("PDF extraction tier=layout file=%s reason=%s", os.path.basename(file_path), problem)
+    return _extract_pdf(file_path), 'layout'
+
+
+def _extract_pdf_text_layer(file_path: str) -> str:
+    """Read the embedded text layer page by page without layout analysis."""
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(file_path)
+    try:
+        _check_page_count(len(pdf))
+        text_parts = []
+        total_chars = 0
+        for i in range(len(pdf)):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            try:
+                t = textpage.get_text_range()
+            finally:
+                textpage.close()
+                page.close()
+            if t:
+                total_chars += len(t)
+                _check_text_size(total_chars)
+                text_parts.append(t)
+    finally:
+        pdf.close()
+    # pdfium uses CRLF line ends and marks soft hyphens / line-break hyphens with control chars
+    text = '\n'.join(text_parts).replace('\r\n', '\n').replace('\r', '\n')
+    return re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe]', '', text)
+
+
+def _text_layer_problem(text: str) -> Optional[str]:
+    """
+    Quality check for tier-1 text. Returns None when the text is usable,
+    otherwise a short reason (logged so thresholds can be tuned).
+    """
+    lines = [l.strip() for l in text.split('\n') if l.strip()]
+    if len(lines) < PDF_FAST_MIN_LINES:
+        return f"too few lines ({len(lines)})"
+
+    # Characters emitted one per line (or in tiny fragments) means garbled ordering
+    short = sum(1 for l in lines if len(l) <= 2)
+    if short / len(lines) > PDF_FAST_MAX_SHORT_LINE_RATIO:
+        return f"garbled ordering ({short}/{len(lines)} fragment lines)"
+    if text.count('\ufffd') > len(text) * 0.01:
+        return "undecodable characters"
+
+    headers = {_detect_section_header(l) for l in lines} - {None}
+    if len(headers) < PDF_FAST_MIN_SECTIONS:
+        return f"too few section headers ({len(headers)})"
+    return None
 
 
 def _extract_pdf(file_path: str) -> str:
     try:
         import pdfplumber
         text_parts = []
+        total_chars = 0
         with pdfplumber.open(file_path) as pdf:
+            _check_page_count(len(pdf.pages))
             for page in pdf.pages:
-                t = page.extract_text()
+                try:
+                    t = page.extract_text()
+                finally:
+                    # Drop the page's parsed layout objects now rather than
+                    # holding every page's chars in memory until the end.
+                    page.close()
                 if t:
+                    total_chars += len(t)
+                    _check_text_size(total_chars)
                     text_parts.append(t)
         return '\n'.join(text_parts)
     except ImportError:
         raise ValueError("pdfplumber not installed. Run: pip install pdfplumber")
+    except (ExtractionLimitError, MemoryError):
+        raise
     except Exception as e:
         raise ValueError(f"PDF extraction failed: {str(e)}")
 
@@ -109,9 +227,13 @@ def _extract_docx(file_path: str) -> str:
     try:
         from docx import Document
         doc = Document(file_path)
-        return '\n'.join(p.text for p in doc.paragraphs if p.text.strip())
+        text = '\n'.join(p.text for p in doc.paragraphs if p.text.strip())
+        _check_text_size(len(text))
+        return text
     except ImportError:
         raise ValueError("python-docx not installed. Run: pip install python-docx")
+    except (ExtractionLimitError, MemoryError):
+        raise
     except Exception as e:
         raise ValueError(f"DOCX extraction failed: {str(e)}")
 
@@ -649,21 +771,30 @@ def parse_cv_file(file_path: str) -> Dict[str, Any]:
             'languages': [...],
             'projects': [...],
             'sectionLabels': {...},
-            'raw_text': str  # Original extracted text
+            'raw_text': str,  # Original extracted text
+            'extraction_tier': str  # 'text_layer' | 'layout' | 'docx' | 'plain'
         }
+
+    Raises ExtractionLimitError for files over the page/character/memory limits;
+    any other failure is returned as 'parse_error'.
     """
     try:
         # Extract text from file
-        raw_text = extract_text_from_file(file_path)
+        raw_text, tier = extract_text_with_tier(file_path)
         
         # Parse the text into structured data
         parsed_data = parse_cv_text(raw_text)
         
         # Add raw text for reference
         parsed_data['raw_text'] = raw_text
+        parsed_data['extraction_tier'] = tier
         
         return parsed_data
-        
+
+    except ExtractionLimitError:
+        raise
+    except MemoryError:
+        raise ExtractionLimitError("File needs more memory to extract than allowed")
     except Exception as e:
         # Return empty structure on error so upload doesn't completely fail
         return {
@@ -679,3 +810,50 @@ def parse_cv_file(file_path: str) -> Dict[str, Any]:
             'raw_text': '',
             'parse_error': str(e)
         }
+
+
+# ── Parsed data → CV columns ──────────────────────────────────────────────────
+
+def parsed_to_cv_columns(parsed_data: Dict[str, Any], title: str = '') -> Dict[str, Any]:
+    """
+    Map the output of parse_cv_file onto CV model column values.
+    Shared by the single-file upload endpoint and the bulk importer so both
+    populate flat columns, JSON sections and personal_info the same way.
+    """
+    pi = parsed_data.get('personalInfo', {}) or {}
+
+    full_name = parsed_data.get('full_name') or pi.get('name', '')
+    email = parsed_data.get('email') or pi.get('email', '')
+    phone = parsed_data.get('phone') or pi.get('phone', '')
+    location = parsed_data.get('location') or pi.get('location', '')
+    linkedin_url = parsed_data.get('linkedin_url') or pi.get('linkedin', '')
+    profile_summary = parsed_data.get('profile_summary') or pi.get('summary', '') or parsed_data.get('summary', '')
+
+    return {
+        'title': title,
+        'original_text': parsed_data.get('original_text') or parsed_data.get('raw_text', ''),
+        'full_name': full_name,
+        'email': email,
+        'phone': phone,
+        'location': location,
+        'linkedin_url': linkedin_url,
+        'profile_summary': profile_summary,
+        'educations': parsed_data.get('education') or parsed_data.get('educations', []),
+        'experiences': parsed_data.get('experience') or parsed_data.get('experiences', []),
+        'skills': parsed_data.get('skills', []),
+        'certifications': parsed_data.get('certifications', []),
+        'languages': parsed_data.get('languages', []),
+        'projects': parsed_data.get('projects', []),
+        # Editor reads personal_info, so build a fully-populated object
+        'personal_info': {
+            'name': full_name or '',
+            'title': title or '',
+            'email': email or '',
+            'phone': phone or '',
+            'location': location or '',
+            'linkedin': linkedin_url or '',
+            'website': parsed_data.get('website', '') or pi.get('website', ''),
+            'summary': profile_summary or '',
+            'photo': '',
+        },
+    }
@@ -0,0 +1,301 @@
+"""
+Delta-encoded CV version history (cv_versions).
+Each content write appends one version: a full keyframe snapshot every
+CV_VERSION_KEYFRAME_INTERVAL stored versions, a JSON Patch against the
+previous stored version otherwise. Any version is rebuilt from the nearest
+keyframe at or below it plus fewer than K deltas, in one query.
+
+Compaction (on every keyframe write, in a background thread, or for all CVs
+with compact_cv_versions.py) merges bursts of old autosaves, caps the history
+length and re-encodes the survivors, so storage grows with meaningful
+revisions rather than with keystrokes.
+"""
+
+import copy
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import (
+    CV_VERSION_COALESCE_SECONDS,
+    CV_VERSION_COMPACT_AFTER_HOURS,
+    CV_VERSION_KEYFRAME_INTERVAL,
+    CV_VERSION_MAX_PER_CV,
+)
+from app.models import CV, CVVersion
+from app.utils.json_patch import JsonPatchError, apply_patch, json_equal, make_patch
+
+logger = logging.getLogger(__name__)
+
+KEYFRAME = "keyframe"
+DELTA = "delta"
+
+# CV columns that make up a version (what the editor edits); files, photos and parsed text are not versioned
+VERSIONED_FIELDS = (
+    'title', 'full_name', 'email', 'phone', 'location', 'linkedin_url', 'profile_summary',
+    'personal_info', 'educations', 'experiences', 'projects', 'skills', 'languages',
+    'certifications', 'interests', 'custom_sections', 'theme',
+)
+# Autosaves are the only versions compaction may merge away
+_MERGEABLE_SOURCES = {'edit', 'patch'}
+
+
+class VersionChainError(RuntimeError):
+    """Stored versions do not form a replayable chain (missing keyframe or bad delta)."""
+
+
+def cv_snapshot(cv: CV) -> Dict[str, Any]:
+    """The versioned state of a CV (personal_info without the photo, which follows the photo routes)."""
+    snapshot = {field: copy.deepcopy(getattr(cv, field)) for field in VERSIONED_FIELDS}
+    if isinstance(snapshot['personal_info'], dict):
+        snapshot['personal_info'] = {k: v for k, v in snapshot['personal_info'].items() if k != 'photo'}
+    return snapshot
+
+
+def restore_snapshot(cv: CV, snapshot: Dict[str, Any]) -> None:
+    """Write a version's fields back onto the CV, keeping its current photo."""
+    photo = (cv.personal_info or {}).get('photo') if isinstance(cv.personal_info, dict) else None
+    for field in VERSIONED_FIELDS:
+        if field in snapshot:
+            setattr(cv, field, snapshot[field])
+    if photo and isinstance(cv.personal_info, dict):
+        cv.personal_info = {**cv.personal_info, 'photo': photo}
+
+
+def replay(rows: Sequence[CVVersion]) -> Dict[str, Any]:
+    """State after the last of rows, which must start at a keyframe and be consecutive stored versions."""
+    if not rows or rows[0].kind != KEYFRAME:
+        raise VersionChainError("Version chain does not start at a keyframe")
+    state = rows[0].snapshot
+    for row in rows[1:]:
+        state = row.snapshot if row.kind == KEYFRAME else apply_patch(state, row.patch or [])
+    return state
+
+
+def _chain_query(cv_id: int, upto: Optional[int] = None):
+    """Stored versions from the last keyframe at or below upto (default: latest) through upto."""
+    keyframe = select(func.max(CVVersion.version_number)).where(
+        CVVersion.cv_id == cv_id, CVVersion.kind == KEYFRAME
+    )
+    query = select(CVVersion).where(CVVersion.cv_id == cv_id)
+    if upto is not None:
+        keyframe = keyframe.where(CVVersion.version_number <= upto)
+        query = query.where(CVVersion.version_number <= upto)
+    return query.where(CVVersion.version_number >= keyframe.scalar_subquery()).order_by(CVVersion.version_number)
+
+
+# ── Reading ───────────────────────────────────────────────────────────────────
+
+async def load_version(db: AsyncSession, cv_id: int, version_number: int) -> Optional[Tuple[CVVersion, Dict[str, Any]]]:
+    """(row, snapshot) of a stored version, or None if it does not exist (never written or compacted away)."""
+    rows = (await db.execute(_chain_query(cv_id, version_number))).scalars().all()
+    if not rows or rows[-1].version_number != version_number:
+        return None
+    return rows[-1], replay(rows)
+
+
+async def list_versions(db: AsyncSession, cv_id: int, before: Optional[int] = None, limit: int = 50) -> List[Dict[str, Any]]:
+    """Newest-first version metadata (no snapshots), with the top-level fields each delta touched."""
+    query = select(
+        CVVersion.version_number, CVVersion.kind, CVVersion.source, CVVersion.created_at, CVVersion.patch
+    ).where(CVVersion.cv_id == cv_id)
+    if before is not None:
+        query = query.where(CVVersion.version_number < before)
+    rows = await db.execute(query.order_by(CVVersion.version_number.desc()).limit(limit))
+    return [{
+        'version_number': row.version_number,
+        'kind': row.kind,
+        'source': row.source,
+        'created_at': row.created_at,
+        'changed_fields': _changed_fields(row.patch) if row.kind == DELTA else None,
+    } for row in rows]
+
+
+def _changed_fields(patch: Optional[List[Dict[str, Any]]]) -> List[str]:
+    fields = []
+    for op in patch or []:
+        field = op.get('path', '').split('/')[1] if op.get('path', '').count('/') else ''
+        if field and field not in fields:
+            fields.append(field)
+    return fields
+
+
+# ── Writing ───────────────────────────────────────────────────────────────────
+
+async def record_version(
+    db: AsyncSession,
+    cv: CV,
+    source: str,
+    previous: Optional[Dict[str, Any]] = None,
+) -> bool:
+    """
+    Append the CV's current content as a new version and set cv.current_version;
+    the caller commits. previous is the pre-edit snapshot: for a CV without any
+    history yet it is stored first as a keyframe baseline, so the edit can be
+    reverted. Returns False (and writes nothing) when the content is unchanged.
+    The caller must hold the CV row lock (SELECT ... FOR UPDATE) so concurrent
+    writers take turns; uq_cv_version_number rejects any that do not.
+    """
+    chain = (await db.execute(_chain_query(cv.id))).scalars().all()
+    current = cv_snapshot(cv)
+    number = max(cv.current_version or 1, chain[-1].version_number if chain else 0)
+
+    if not chain and previous is not None and cv.id is not None:
+        baseline = CVVersion(cv_id=cv.id, version_number=number, kind=KEYFRAME, snapshot=previous, source='baseline')
+        db.add(baseline)
+        chain = [baseline]
+
+    broken = False
+    if chain:
+        try:
+            latest = replay(chain)
+        except (VersionChainError, JsonPatchError) as e:
+            # e.g. a chain written before versions were serialized: start over from a keyframe
+            logger.warning("CV %s version chain does not replay, writing a keyframe: %s", cv.id, e)
+            latest, broken = None, True
+        if not broken and json_equal(latest, current):
+            return False
+        number += 1
+    if not chain or broken or len(chain) >= CV_VERSION_KEYFRAME_INTERVAL:
+        row = CVVersion(cv_id=cv.id, version_number=number, kind=KEYFRAME, snapshot=current, source=source)
+    else:
+        row = CVVersion(cv_id=cv.id, version_number=number, kind=DELTA, patch=make_patch(latest, current), source=source)
+    db.add(row)
+    cv.current_version = number
+    if row.kind == KEYFRAME and chain:
+        _after_commit(db, lambda: schedule_compaction(cv.id))
+    return True
+
+
+def _after_commit(db: AsyncSession, callback) -> None:
+    event.listen(db.sync_session, 'after_commit', lambda session: callback(), once=True)
+
+
+# ── Compaction ────────────────────────────────────────────────────────────────
+
+def plan_compaction(rows: Sequence[CVVersion], now: Optional[datetime] = None) -> Set[int]:
+    """Version numbers to keep out of rows (ordered by version_number); the latest always stays."""
+    now = now or datetime.utcnow()
+    settled = now - timedelta(hours=CV_VERSION_COMPACT_AFTER_HOURS)
+    burst = timedelta(seconds=CV_VERSION_COALESCE_SECONDS)
+    keep = []
+    for row, following in zip(rows, list(rows[1:]) + [None]):
+        merge = (
+            following is not None
+            and row.created_at is not None and following.created_at is not None
+            and row.created_at < settled
+            and row.source in _MERGEABLE_SOURCES and following.source in _MERGEABLE_SOURCES
+            and following.created_at - row.created_at < burst
+        )
+        if not merge:
+            keep.append(row.version_number)
+    return set(keep[-CV_VERSION_MAX_PER_CV:]) if CV_VERSION_MAX_PER_CV > 0 else set(keep)
+
+
+def _replayable(rows: Sequence[CVVersion]) -> Tuple[List[CVVersion], List[Dict[str, Any]]]:
+    """rows from their first keyframe on, with each one's snapshot; a delta that does not apply drops everything before the next keyframe."""
+    kept, snapshots, state = [], [], None
+    for row in rows:
+        if row.kind == KEYFRAME:
+            state = row.snapshot
+        elif state is None:
+            continue
+        else:
+            try:
+                state = apply_patch(state, row.patch or [])
+            except JsonPatchError:
+                kept, snapshots, state = [], [], None
+                continue
+        kept.append(row)
+        snapshots.append(state)
+    if not kept:
+        raise VersionChainError("No keyframe after the last delta that does not apply")
+    return kept, snapshots
+
+
+def compact_versions(db: Session, cv_id: int, now: Optional[datetime] = None) -> Tuple[int, int]:
+    """
+    Merge and cap one CV's history, then re-encode what is left (keyframe every
+    K kept versions). Returns (kept, removed); commits.
+    """
+    # Same CV row lock as the write paths: no version is recorded against a chain being re-encoded
+    db.query(CV.id).filter(CV.id == cv_id).with_for_update().first()
+    rows = db.query(CVVersion).filter(CVVersion.cv_id == cv_id).order_by(CVVersion.version_number).all()
+    if not rows:
+        return 0, 0
+    start = next((i for i, row in enumerate(rows) if row.kind == KEYFRAME), None)
+    if start is None:
+        raise VersionChainError(f"CV {cv_id} has versions but no keyframe")
+    rows, snapshots = _replayable(rows[start:])  # versions before the first keyframe cannot be rebuilt anyway
+
+    keep = plan_compaction(rows, now)
+    kept, previous, removed = 0, None, 0
+    for row, snapshot in zip(rows, snapshots):
+        if row.version_number not in keep:
+            db.delete(row)
+            removed += 1
+            continue
+        if kept % CV_VERSION_KEYFRAME_INTERVAL == 0:
+            if row.kind != KEYFRAME:
+                row.kind, row.snapshot, row.patch = KEYFRAME, snapshot, None
+        else:
+            patch = make_patch(previous, snapshot)
+            if row.kind != DELTA or not json_equal(row.patch, patch):
+                row.kind, row.snapshot, row.patch = DELTA, None, patch
+        previous = snapshot
+        kept += 1
+    db.query(CVVersion).filter(
+        CVVersion.cv_id == cv_id, CVVersion.version_number < rows[0].version_number
+    ).delete(synchronize_session=False)
+    db.commit()
+    return kept, removed
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_pending: Set[int] = set()
+_lock = threading.Lock()
+
+
+def schedule_compaction(cv_id: int) -> None:
+    """Compact a CV's history in the background (one worker thread; repeated requests for a CV coalesce)."""
+    global _executor
+    with _lock:
+        if cv_id in _pending:
+            return
+        _pending.add(cv_id)
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cv-compact")
+        _executor.submit(_compact_in_background, cv_id)
+
+
+def _compact_in_background(cv_id: int) -> None:
+    from app.database import SessionLocal
+
+    with _lock:
+        _pending.discard(cv_id)
+    db = SessionLocal()
+    try:
+        kept, removed = compact_versions(db, cv_id)
+        if removed:
+            logger.info("Compacted CV %s history: kept %d, removed %d versions", cv_id, kept, removed)
+    except Exception as e:
+        db.rollback()
+        logger.warning("Compaction of CV %s history failed: %s", cv_id, e)
+    finally:
+        db.close()
+
+
+def shutdown_compaction() -> None:
+    """Stop the compaction thread (application shutdown); queued compactions are dropped."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+        _pending.clear()
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,135 @@
+"""
+Font registry for PDF export.
+TrueType families in PDF_FONT_DIR are parsed and registered with reportlab
+once per process (register_fonts, run at startup and in each render worker),
+so an export never reads a TTF file itself. reportlab embeds only the glyphs
+a document actually uses (subsets), keeping custom-font PDFs small.
+
+A theme's CSS font stack ('"Playfair Display", Georgia, serif') is mapped to
+the first registered family in it, or else to the closest built-in PDF font.
+"""
+
+import logging
+import os
+import re
+import threading
+from typing import Dict, NamedTuple, Optional
+
+from app.config import PDF_FONT_DIR
+
+logger = logging.getLogger(__name__)
+
+
+class FontFaces(NamedTuple):
+    """reportlab font names for one family."""
+    regular: str
+    bold: str
+    italic: str
+    bold_italic: str
+
+
+BUILTIN_SANS = FontFaces('Helvetica', 'Helvetica-Bold', 'Helvetica-Oblique', 'Helvetica-BoldOblique')
+BUILTIN_SERIF = FontFaces('Times-Roman', 'Times-Bold', 'Times-Italic', 'Times-BoldItalic')
+BUILTIN_MONO = FontFaces('Courier', 'Courier-Bold', 'Courier-Oblique', 'Courier-BoldOblique')
+
+# CSS names (normalized) that the built-in fonts stand in for
+_BUILTIN_ALIASES = {
+    'sansserif': BUILTIN_SANS, 'systemui': BUILTIN_SANS, 'helvetica': BUILTIN_SANS, 'arial': BUILTIN_SANS,
+    'serif': BUILTIN_SERIF, 'georgia': BUILTIN_SERIF, 'timesnewroman': BUILTIN_SERIF, 'times': BUILTIN_SERIF,
+    'monospace': BUILTIN_MONO, 'courier': BUILTIN_MONO, 'couriernew': BUILTIN_MONO,
+}
+
+# File name suffix → face; a file without a known suffix is the regular face
+_STYLE_SUFFIXES = {
+    'regular': 'regular', 'book': 'regular', 'roman': 'regular',
+    'bold': 'bold',
+    'italic': 'italic', 'oblique': 'italic',
+    'bolditalic': 'bold_italic', 'boldoblique': 'bold_italic',
+}
+
+_lock = threading.Lock()
+_registered: Optional[Dict[str, FontFaces]] = None  # normalized family name → faces
+
+
+def _normalize(name: str) -> str:
+    return re.sub(r'[^a-z0-9]', '', name.lower())
+
+
+def _scan(font_dir: str) -> Dict[str, Dict[str, str]]:
+    """{family: {face: path}} for the .ttf files in font_dir."""
+    families: Dict[str, Dict[str, str]] = {}
+    if not os.path.isdir(font_dir):
+        return families
+    for filename in sorted(os.listdir(font_dir)):
+        stem, ext = os.path.splitext(filename)
+        if ext.lower() != '.ttf':
+            continue
+        family, _, suffix = stem.rpartition('-')
+        face = _STYLE_SUFFIXES.get(_normalize(suffix)) if family else None
+        if face is None:
+            family, face = stem, 'regular'
+        families.setdefault(family, {})[face] = os.path.join(font_dir, filename)
+    return families
+
+
+def register_fonts(font_dir: str = PDF_FONT_DIR) -> Dict[str, FontFaces]:
+    """
+    Parse and register every family in font_dir with reportlab (only the first
+    call in a process does any work). Families without a regular face are skipped;
+    missing bold / italic faces fall back to the closest face that exists.
+    """
+    global _registered
+    if _registered is not None:
+        return _registered
+    with _lock:
+        if _registered is not None:
+            return _registered
+
+        from reportlab.lib.fonts import addMapping
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFont
+
+        registered: Dict[str, FontFaces] = {}
+        for family, paths in _scan(font_dir).items():
+            if 'regular' not in paths:
+                logger.warning("Font family %s has no regular face — skipped", family)
+                continue
+            names = {}
+            try:
+                for face, path in paths.items():
+                    name = family if face == 'regular' else f"{family}-{face}"
+                    pdfmetrics.registerFont(TTFont(name, path))
+                    names[face] = name
+            except Exception as e:
+                logger.warning("Could not load font family %s: %s", family, e)
+                continue
+            bold = names.get('bold', names['regular'])
+            italic = names.get('italic', names['regular'])
+            faces = FontFaces(names['regular'], bold, italic, names.get('bold_italic', bold))
+            # <b>/<i> markup in Paragraphs resolves through these mappings
+            addMapping(family, 0, 0, faces.regular)
+            addMapping(family, 1, 0, faces.bold)
+            addMapping(family, 0, 1, faces.italic)
+            addMapping(family, 1, 1, faces.bold_italic)
+            registered[_normalize(family)] = faces
+
+        if registered:
+            logger.info("Registered PDF fonts: %s", ', '.join(sorted(f.regular for f in registered.values())))
+        _registered = registered
+        return _registered
+
+
+def resolve_font_family(css_family: Optional[str]) -> FontFaces:
+    """
+    Faces for a theme fontFamily: the first registered family in the CSS stack,
+    else the first name with a built-in equivalent, else Helvetica.
+    """
+    registered = register_fonts()
+    names = [_normalize(n.strip().strip('"\'')) for n in (css_family or '').split(',')]
+    for name in names:
+        if name in registered:
+            return registered[name]
+    for name in names:
+        if name in _BUILTIN_ALIASES:
+            return _BUILTIN_ALIASES[name]
+    return BUILTIN_SANS
@@ -0,0 +1,185 @@
+"""
+JSON Patch (RFC 6902) for plain JSON values (dict / list / str / number / bool / None).
+apply_patch applies all six operations to a copy of a document; make_patch
+computes a compact patch turning one document into another (list edits are
+expressed as element-wise changes plus inserts / removals around the common
+prefix and suffix, so adding one experience is one "add" op).
+Used for CV version deltas and PATCH /api/cvs/{id}.
+"""
+
+import copy
+from typing import Any, Dict, List
+
+Patch = List[Dict[str, Any]]
+
+
+class JsonPatchError(ValueError):
+    """Malformed patch, a path that does not resolve, or a failed "test" operation."""
+
+
+def escape_token(token: str) -> str:
+    return token.replace('~', '~0').replace('/', '~1')
+
+
+def _tokens(path: Any) -> List[str]:
+    if not isinstance(path, str) or (path and not path.startswith('/')):
+        raise JsonPatchError(f"Invalid JSON pointer: {path!r}")
+    if path == '':
+        return []
+    return [t.replace('~1', '/').replace('~0', '~') for t in path[1:].split('/')]
+
+
+def _index(items: list, token: str, for_insert: bool = False) -> int:
+    if for_insert and token == '-':
+        return len(items)
+    if not token.isdigit() or (len(token) > 1 and token.startswith('0')):
+        raise JsonPatchError(f"Invalid array index: {token!r}")
+    i = int(token)
+    if i > len(items) or (i == len(items) and not for_insert):
+        raise JsonPatchError(f"Array index out of range: {i}")
+    return i
+
+
+def _child(node: Any, token: str) -> Any:
+    if isinstance(node, dict):
+        if token not in node:
+            raise JsonPatchError(f"Path not found: member {token!r} does not exist")
+        return node[token]
+    if isinstance(node, list):
+        return node[_index(node, token)]
+    raise JsonPatchError(f"Path not found: cannot descend into a {type(node).__name__}")
+
+
+def _resolve(doc: Any, tokens: List[str]) -> Any:
+    for token in tokens:
+        doc = _child(doc, token)
+    return doc
+
+
+def _add(doc: Any, path: str, value: Any) -> Any:
+    tokens = _tokens(path)
+    if not tokens:
+        return value
+    parent, key = _resolve(doc, tokens[:-1]), tokens[-1]
+    if isinstance(parent, dict):
+        parent[key] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, key, for_insert=True), value)
+    else:
+        raise JsonPatchError(f"Cannot add to a {type(parent).__name__} at {path!r}")
+    return doc
+
+
+def _remove(doc: Any, path: str) -> Any:
+    """Remove the value at path and return it."""
+    tokens = _tokens(path)
+    if not tokens:
+        raise JsonPatchError("Cannot remove the document root")
+    parent, key = _resolve(doc, tokens[:-1]), tokens[-1]
+    if isinstance(parent, dict):
+        if key not in parent:
+            raise JsonPatchError(f"Path not found: {path!r}")
+        return parent.pop(key)
+    if isinstance(parent, list):
+        return parent.pop(_index(parent, key))
+    raise JsonPatchError(f"Cannot remove from a {type(parent).__name__} at {path!r}")
+
+
+def _operand(op: Dict[str, Any], name: str) -> Any:
+    if name not in op:
+        raise JsonPatchError(f"'{op['op']}' operation requires '{name}'")
+    return op[name]
+
+
+def apply_patch(doc: Any, patch: Patch) -> Any:
+    """The result of applying patch to doc; doc itself is left untouched. Raises JsonPatchError."""
+    if not isinstance(patch, list):
+        raise JsonPatchError("A JSON patch must be a list of operations")
+    doc = copy.deepcopy(doc)
+    for op in patch:
+        if not isinstance(op, dict) or 'op' not in op or 'path' not in op:
+            raise JsonPatchError(f"Invalid patch operation: {op!r}")
+        name, path = op['op'], op['path']
+        if name == 'add':
+            doc = _add(doc, path, copy.deepcopy(_operand(op, 'value')))
+        elif name == 'remove':
+            _remove(doc, path)
+        elif name == 'replace':
+            value = copy.deepcopy(_operand(op, 'value'))
+            if not _tokens(path):
+                doc = value
+            else:
+                _remove(doc, path)
+                doc = _add(doc, path, value)
+        elif name == 'move':
+            source = _operand(op, 'from')
+            if path != source and path.startswith(source + '/'):
+                raise JsonPatchError(f"Cannot move {source!r} into its own child {path!r}")
+            doc = _add(doc, path, _remove(doc, source))
+        elif name == 'copy':
+            doc = _add(doc, path, copy.deepcopy(_resolve(doc, _tokens(_operand(op, 'from')))))
+        elif name == 'test':
+            if not json_equal(_resolve(doc, _tokens(path)), _operand(op, 'value')):
+                raise JsonPatchError(f"Test failed at {path!r}")
+        else:
+            raise JsonPatchError(f"Unknown patch operation: {name!r}")
+    return doc
+
+
+def json_equal(a: Any, b: Any) -> bool:
+    """JSON equality: 1 == 1.0, but True != 1 and key order does not matter."""
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(json_equal(a[k], b[k]) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(json_equal(x, y) for x, y in zip(a, b))
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return a == b
+    return type(a) is type(b) and a == b
+
+
+# ── Diff ──────────────────────────────────────────────────────────────────────
+
+def make_patch(src: Any, dst: Any) -> Patch:
+    """A patch p with apply_patch(src, p) == dst (empty when they are equal)."""
+    ops: Patch = []
+    _diff(src, dst, '', ops)
+    return ops
+
+
+def _diff(a: Any, b: Any, path: str, ops: Patch) -> None:
+    if json_equal(a, b):
+        return
+    if isinstance(a, dict) and isinstance(b, dict):
+        for key in a:
+            if key not in b:
+                ops.append({'op': 'remove', 'path': f"{path}/{escape_token(key)}"})
+        for key, value in b.items():
+            child = f"{path}/{escape_token(key)}"
+            if key in a:
+                _diff(a[key], value, child, ops)
+            else:
+                ops.append({'op': 'add', 'path': child, 'value': value})
+    elif isinstance(a, list) and isinstance(b, list):
+        _diff_list(a, b, path, ops)
+    else:
+        ops.append({'op': 'replace', 'path': path, 'value': b})
+
+
+def _diff_list(a: list, b: list, path: str, ops: Patch) -> None:
+    n, m = len(a), len(b)
+    start = 0
+    while start < min(n, m) and json_equal(a[start], b[start]):
+        start += 1
+    end = 0
+    while end < min(n, m) - start and json_equal(a[n - 1 - end], b[m - 1 - end]):
+        end += 1
+    old, new = a[start:n - end], b[start:m - end]
+    common = min(len(old), len(new))
+    for i in range(common):
+        _diff(old[i], new[i], f"{path}/{start + i}", ops)
+    for _ in range(common, len(old)):
+        ops.append({'op': 'remove', 'path': f"{path}/{start + common}"})
+    for i in range(common, len(new)):
+        ops.append({'op': 'add', 'path': f"{path}/{start + i}", 'value': new[i]})
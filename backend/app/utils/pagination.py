@@ -0,0 +1,59 @@
+"""
+Keyset (cursor) pagination helpers.
+A cursor is the sort key of the last row on a page, encoded as opaque
+URL-safe text; the next page is "rows after this key" in index order, so
+page N costs the same as page 1 (no OFFSET scan).
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+class InvalidCursor(ValueError):
+    """A cursor that was not produced by encode_cursor (or for a different sort)."""
+
+
+def encode_cursor(*values: Any) -> str:
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, *types: type) -> Tuple[Any, ...]:
+    """Sort key values of cursor, converted to types (datetime, int, str, ...)."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError("wrong number of values")
+        return tuple(datetime.fromisoformat(v) if t is datetime else t(v) for v, t in zip(payload, types))
+    except (ValueError, TypeError) as e:  # binascii.Error and JSONDecodeError are ValueErrors
+        raise InvalidCursor("Invalid pagination cursor") from e
+
+
+def split_page(rows: Sequence[Any], limit: int, key: Callable[[Any], tuple]) -> Tuple[List[Any], Optional[str]]:
+    """
+    (page, next_cursor) from rows fetched with LIMIT limit + 1: the extra row
+    only signals that another page exists.
+    """
+    page = list(rows[:limit])
+    next_cursor = encode_cursor(*key(page[-1])) if len(rows) > limit else None
+    return page, next_cursor
+
+
+def estimated_row_count(db: Session, table: str) -> Optional[int]:
+    """
+    Planner's row estimate for a whole table (pg_class.reltuples, kept fresh by
+    autovacuum / ANALYZE): a catalog lookup instead of a COUNT(*) scan.
+    None off PostgreSQL or before the table's first ANALYZE.
+    """
+    if db.get_bind().dialect.name != 'postgresql':
+        return None
+    estimate = db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"), {'table': table}
+    ).scalar()
+    return estimate if estimate and estimate > 0 else None
@@ -0,0 +1,136 @@
+"""
+Resource-limited CV extraction.
+Parsing runs in worker processes that cap their own address space (RLIMIT_AS)
+and the time spent on each file, so a huge or hostile upload fails with
+ExtractionLimitError instead of exhausting the API process.
+Used by the single-file upload endpoint and the bulk importer.
+"""
+
+import logging
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+
+try:
+    import resource  # Unix only
+except ImportError:  # pragma: no cover - Windows dev machines
+    resource = None
+
+from app.config import PARSE_WORKER_MEMORY_MB, PARSE_WORKER_TIME_LIMIT, PARSE_WORKERS
+from app.utils.cv_parser import ExtractionLimitError, parse_cv_file
+
+logger = logging.getLogger(__name__)
+
+# Extra CPU seconds before the kernel kills a worker stuck inside C code
+# (where the Python-level alarm cannot interrupt it).
+_CPU_GRACE_SECONDS = 5
+
+
+# ── Worker side ───────────────────────────────────────────────────────────────
+
+def limit_worker_resources() -> None:
+    """ProcessPoolExecutor initializer: cap this worker's address space."""
+    if resource is None or PARSE_WORKER_MEMORY_MB <= 0:
+        return
+    limit = PARSE_WORKER_MEMORY_MB * 1024 * 1024
+    try:
+        _soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    except (ValueError, OSError) as e:
+        logger.warning("Could not set worker memory limit: %s", e)
+
+
+def _on_alarm(signum, frame):
+    raise ExtractionLimitError(f"Extraction took longer than {PARSE_WORKER_TIME_LIMIT}s")
+
+
+def _set_cpu_backstop() -> None:
+    """Let the kernel terminate this worker if it burns the time limit (+grace) in CPU."""
+    if resource is None:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime)
+    _soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = used + PARSE_WORKER_TIME_LIMIT + _CPU_GRACE_SECONDS
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    except (ValueError, OSError) as e:
+        logger.warning("Could not set worker CPU limit: %s", e)
+
+
+def parse_in_worker(file_path: str) -> Dict[str, Any]:
+    """Task function for worker processes: parse_cv_file under the per-file time limit."""
+    timed = PARSE_WORKER_TIME_LIMIT > 0 and hasattr(signal, 'SIGALRM')
+    if timed:
+        _set_cpu_backstop()
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.alarm(PARSE_WORKER_TIME_LIMIT)
+    try:
+        return parse_cv_file(file_path)
+    finally:
+        if timed:
+            signal.alarm(0)
+
+
+# ── API side ──────────────────────────────────────────────────────────────────
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS, initializer=limit_worker_resources)
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_cv_file_isolated(file_path: str) -> Dict[str, Any]:
+    """
+    parse_cv_file in a resource-limited worker process.
+    Raises ExtractionLimitError when the file exceeds a limit or the worker is
+    killed by the OS. With PARSE_WORKERS=0 the file is parsed in-process.
+    A killed worker breaks the shared pool for every upload being parsed on
+    it, so the file is retried once on a worker of its own: only the file
+    that gets that worker killed too is rejected.
+    """
+    if PARSE_WORKERS <= 0:
+        return parse_cv_file(file_path)
+
+    pool = _get_pool()
+    try:
+        return pool.submit(parse_in_worker, file_path).result()
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        logger.warning("Parse worker died while extracting %s, retrying on its own worker", file_path)
+
+    with ProcessPoolExecutor(max_workers=1, initializer=limit_worker_resources) as own_pool:
+        try:
+            return own_pool.submit(parse_in_worker, file_path).result()
+        except BrokenProcessPool:
+            logger.warning("Parse worker died again while extracting %s", file_path)
+    raise ExtractionLimitError("File exceeds the memory or time limit for extraction")
+
+
+def shutdown_parse_pool() -> None:
+    """Stop the worker processes (called on application shutdown)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
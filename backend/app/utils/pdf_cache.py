@@ -0,0 +1,245 @@
+"""
+On-disk cache of rendered CV PDFs.
+Entries are keyed by (cv_id, content hash, theme hash, renderer version), so a
+CV that has not changed since its last export is served straight from disk and
+the key doubles as the HTTP ETag. First-page thumbnails ('<key>.png') share
+the key of the PDF they were made from, and cover letter exports
+('cl<id>-…') are cached the same way. Renderers write straight into a temp file
+in the cache directory that is renamed into place, so a finished PDF is never
+copied through memory again. The directory is kept under PDF_CACHE_MAX_BYTES
+by evicting the least recently used files; responses send a pinned hard link
+to their entry (pinned_file), so an eviction cannot delete it mid-response.
+"""
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import secrets
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.config import PDF_CACHE_DIR, PDF_CACHE_MAX_BYTES
+from app.utils.fonts import resolve_font_family
+from app.utils.pdf_generator import PDF_RENDERER_VERSION
+
+logger = logging.getLogger(__name__)
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_evict_lock = threading.Lock()
+
+_TMP_SUFFIX = '.tmp'
+# Temp files older than this belong to renders nobody collected (killed worker, crash)
+_ORPHAN_TMP_SECONDS = 3600
+
+
+# ── Keys ──────────────────────────────────────────────────────────────────────
+
+def _digest(value: Any) -> str:
+    payload = json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _file_signature(url_path: str) -> Optional[list]:
+    """(mtime, size) of an uploaded file, so re-uploading under the same name changes the key."""
+    if not url_path:
+        return None
+    try:
+        st = os.stat(os.path.join(_BACKEND_DIR, str(url_path).lstrip('/')))
+        return [st.st_mtime_ns, st.st_size]
+    except OSError:
+        return None
+
+
+def pdf_cache_key(cv_id: int, cv_data: Dict[str, Any], title: str, theme: Optional[Dict[str, Any]]) -> str:
+    """Cache key / ETag for a render of cv_data with theme."""
+    pi = cv_data.get('personalInfo') or {}
+    content = {
+        'title': title,
+        'cv': cv_data,
+        'photo': _file_signature(cv_data.get('photo_pdf') or pi.get('photo') or ''),
+    }
+    return f"{cv_id}-{_digest(content)[:20]}-{_look_digest(theme)}-r{PDF_RENDERER_VERSION}"
+
+
+def cover_letter_cache_key(
+    cl_id: int, fmt: str, updated_at: Any, sender: Dict[str, Any], theme: Optional[Dict[str, Any]]
+) -> str:
+    """Cache key / ETag for a cover letter export in fmt (its letterhead comes from the linked CV)."""
+    content = {'updated_at': str(updated_at), 'sender': sender}
+    return f"cl{cl_id}-{fmt}-{_digest(content)[:20]}-{_look_digest(theme)}-r{PDF_RENDERER_VERSION}"
+
+
+def _look_digest(theme: Optional[Dict[str, Any]]) -> str:
+    # The resolved font, not just fontFamily: installing a font family changes the output
+    font = resolve_font_family((theme or {}).get('fontFamily'))
+    return _digest({'theme': theme or {}, 'font': list(font)})[:8]
+
+
+def etag_matches(if_none_match: Optional[str], key: str) -> bool:
+    """True if an If-None-Match header value covers the ETag for key."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    tags = [t.strip() for t in if_none_match.split(',')]
+    return f'"{key}"' in tags or f'W/"{key}"' in tags
+
+
+# ── Storage ───────────────────────────────────────────────────────────────────
+
+_CACHED_EXTENSIONS = ('.pdf', '.png', '.docx')
+
+
+def _path_for(key: str, ext: str = '.pdf') -> str:
+    return os.path.join(PDF_CACHE_DIR, f"{key}{ext}")
+
+
+def get_cached_file(key: str, ext: str) -> Optional[str]:
+    """Return the cached '<key><ext>' file (marking it recently used), or None."""
+    path = _path_for(key, ext)
+    try:
+        os.utime(path)  # mtime is the LRU clock
+    except OSError:
+        return None
+    return path
+
+
+def get_cached_pdf(key: str) -> Optional[str]:
+    """Return the cached file for key (marking it recently used), or None."""
+    return get_cached_file(key, '.pdf')
+
+
+def get_cached_thumbnail(key: str) -> Optional[str]:
+    """Return the cached first-page PNG for key (marking it recently used), or None."""
+    return get_cached_file(key, '.png')
+
+
+def new_render_file() -> Tuple[int, str]:
+    """
+    (fd, path) of a fresh temp file in the cache directory for a renderer to
+    write into. Being on the same filesystem, store_pdf can rename it into place.
+    """
+    os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+    return tempfile.mkstemp(dir=PDF_CACHE_DIR, suffix=_TMP_SUFFIX)
+
+
+def discard_render_file(tmp_path: str) -> None:
+    """Delete a render temp file that will not be stored."""
+    _remove(tmp_path)
+
+
+def store_file(key: str, tmp_path: str, ext: str) -> str:
+    """Move a finished temp file (from new_render_file) into the cache as '<key><ext>' and return its path."""
+    path = _path_for(key, ext)
+    try:
+        os.replace(tmp_path, path)
+    except Exception:
+        _remove(tmp_path)
+        raise
+
+    # Older renders / thumbnails of the same CV (or cover letter format) can never be
+    # requested again. The key ends in three content fields (digest, look, renderer);
+    # what precedes them ('<cv_id>' or 'cl<id>-<fmt>') names the file's owner.
+    cv_prefix = key.rsplit('-', 3)[0]
+    for stale in _cached_files(cv_prefix):
+        if os.path.splitext(os.path.basename(stale))[0] != key:
+            _remove(stale)
+    _evict()
+    return path
+
+
+def store_pdf(key: str, tmp_path: str) -> str:
+    """Move a finished render (from new_render_file) into the cache atomically and return its path."""
+    return store_file(key, tmp_path, '.pdf')
+
+
+def store_thumbnail(key: str, tmp_path: str) -> str:
+    """Move a finished thumbnail (from new_render_file) into the cache atomically and return its path."""
+    return store_file(key, tmp_path, '.png')
+
+
+def pin_file(path: str) -> Optional[str]:
+    """
+    A private hard link to path, or None if path is gone. Eviction only
+    unlinks the cache name, so the link stays readable until it is removed
+    with discard_render_file (leftovers are cleaned up like orphaned temp files).
+    """
+    pinned = os.path.join(PDF_CACHE_DIR, f"pin-{secrets.token_hex(8)}{_TMP_SUFFIX}")
+    try:
+        os.link(path, pinned)
+    except FileNotFoundError:
+        return None
+    return pinned
+
+
+def pinned_file(key: str, ext: str, create: Callable[[], str]) -> str:
+    """
+    Pinned link (pin_file) to the cached '<key><ext>', for a response to serve
+    and then discard. If it is not cached, or is evicted before it is pinned,
+    create() makes a new temp file (from new_render_file), which is pinned
+    while still private and then stored.
+    """
+    path = get_cached_file(key, ext)
+    pinned = pin_file(path) if path else None
+    if pinned is None:
+        tmp_path = create()
+        pinned = pin_file(tmp_path)
+        try:
+            store_file(key, tmp_path, ext)
+        except Exception:
+            discard_render_file(pinned)
+            raise
+    return pinned
+
+
+def _cached_files(cv_prefix) -> list:
+    return [path for path in glob.glob(os.path.join(PDF_CACHE_DIR, f"{cv_prefix}-*"))
+            if path.endswith(_CACHED_EXTENSIONS)]
+
+
+def invalidate_cv(cv_id: int) -> None:
+    """Drop every cached render and thumbnail of a CV (e.g. when it is deleted)."""
+    for path in _cached_files(cv_id):
+        _remove(path)
+
+
+def invalidate_cover_letter(cl_id: int) -> None:
+    """Drop every cached export of a cover letter."""
+    for path in _cached_files(f"cl{cl_id}"):
+        _remove(path)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _evict() -> None:
+    """Delete least recently used files until the cache fits PDF_CACHE_MAX_BYTES."""
+    with _evict_lock:
+        entries = []
+        total = 0
+        orphan_cutoff = time.time() - _ORPHAN_TMP_SECONDS
+        for entry in os.scandir(PDF_CACHE_DIR):
+            if entry.is_file() and entry.name.endswith(_TMP_SUFFIX):
+                if entry.stat().st_mtime < orphan_cutoff:
+                    _remove(entry.path)
+            elif entry.is_file() and entry.name.endswith(_CACHED_EXTENSIONS):
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+        if total <= PDF_CACHE_MAX_BYTES:
+            return
+        entries.sort()
+        for _mtime, size, path in entries:
+            if total <= PDF_CACHE_MAX_BYTES:
+                break
+            _remove(path)
+            total -= size
+        logger.info("PDF cache evicted down to %d bytes", total)
@@ -0,0 +1,161 @@
+"""
+Cache-aware PDF export helpers.
+get_pinned_pdf serves a single export from the render cache or the render
+pool. stream_pdf_zip renders many CVs in parallel and streams them into a ZIP
+archive as each one finishes, so the archive is never held in memory as a whole.
+"""
+
+import logging
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.config import PDF_RENDER_TIMEOUT, PDF_RENDER_WORKERS
+from app.utils.pdf_cache import get_cached_pdf, pdf_cache_key, pinned_file, store_pdf
+from app.utils.render_pool import RenderQueueFull, abandon_render, render_pdf, submit_render
+
+logger = logging.getLogger(__name__)
+
+_ZIP_READ_CHUNK = 64 * 1024
+
+
+def get_pinned_pdf(cv_id: int, cv_data: Dict[str, Any], title: str, theme: Optional[Dict[str, Any]]) -> str:
+    """
+    Pinned link (pin_file) to the cached render for this CV state, rendering
+    it on the pool if needed. Eviction cannot delete it while it is read;
+    remove it with discard_render_file when done.
+    """
+    key = pdf_cache_key(cv_id, cv_data, title, theme)
+    return pinned_file(key, '.pdf', lambda: render_pdf(cv_data, title=title, theme=theme))
+
+
+# ── Batch export ──────────────────────────────────────────────────────────────
+
+class _ChunkSink:
+    """Write-only, non-seekable file object: zipfile appends, the generator drains."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _add_file(archive: zipfile.ZipFile, sink: _ChunkSink, arcname: str, path: str) -> Iterator[bytes]:
+    with open(path, 'rb') as src, archive.open(arcname, 'w') as dest:
+        while True:
+            chunk = src.read(_ZIP_READ_CHUNK)
+            if not chunk:
+                break
+            dest.write(chunk)
+            data = sink.drain()
+            if data:
+                yield data
+    data = sink.drain()
+    if data:
+        yield data
+
+
+def _store_quietly(job: Dict[str, Any], tmp_path: str) -> None:
+    """Cache a batch render that is already in the archive; failing to cache it does not fail the export."""
+    try:
+        store_pdf(job['key'], tmp_path)
+    except OSError as e:
+        logger.warning("Caching batch render of CV %s failed: %s", job['cv_id'], e)
+
+
+def stream_pdf_zip(jobs: List[Dict[str, Any]]) -> Iterator[bytes]:
+    """
+    Yield a ZIP archive containing one PDF per job.
+
+    Each job is {'cv_id', 'cv_data', 'title', 'theme', 'filename'} (plain data,
+    so the caller's DB session can be closed before streaming starts). Cached
+    renders are added first; the rest are rendered on the pool, keeping at most
+    PDF_RENDER_WORKERS renders of this batch in flight, and added in completion
+    order. Failures are listed in ERRORS.txt instead of aborting the archive.
+    """
+    sink = _ChunkSink()
+    archive = zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=1)
+    errors: List[str] = []
+    pending: List[Dict[str, Any]] = []
+
+    for job in jobs:
+        job['key'] = pdf_cache_key(job['cv_id'], job['cv_data'], job['title'], job['theme'])
+        path = get_cached_pdf(job['key'])
+        if path:
+            try:
+                yield from _add_file(archive, sink, job['filename'], path)
+                continue
+            except FileNotFoundError:  # evicted since the lookup — render it again
+                pass
+        pending.append(job)
+
+    window = max(1, PDF_RENDER_WORKERS)
+    in_flight: Dict[Future, Dict[str, Any]] = {}
+    queue_full_since: Optional[float] = None
+
+    try:
+        while pending or in_flight:
+            # Top up this batch's share of the render pool
+            while pending and len(in_flight) < window:
+                job = pending[0]
+                try:
+                    future = submit_render(job['cv_data'], title=job['title'], theme=job['theme'])
+                except RenderQueueFull:
+                    if in_flight:
+                        break  # wait for one of ours to finish, then retry
+                    if queue_full_since is None:
+                        queue_full_since = time.monotonic()
+                    if time.monotonic() - queue_full_since > PDF_RENDER_TIMEOUT:
+                        pending.pop(0)
+                        errors.append(f"{job['filename']}: render queue is full")
+                        queue_full_since = None
+                    else:
+                        time.sleep(0.2)
+                    continue
+                queue_full_since = None
+                in_flight[future] = pending.pop(0)
+
+            if not in_flight:
+                continue
+
+            done, _ = wait(in_flight, timeout=PDF_RENDER_TIMEOUT, return_when=FIRST_COMPLETED)
+            if not done:  # nothing finished in time — give up on everything still running
+                for future, job in in_flight.items():
+                    abandon_render(future)
+                    errors.append(f"{job['filename']}: rendering timed out")
+                in_flight.clear()
+                continue
+
+            for future in done:
+                job = in_flight.pop(future)
+                try:
+                    tmp_path = future.result()
+                except Exception as e:
+                    logger.warning("Batch export of CV %s failed: %s", job['cv_id'], e)
+                    errors.append(f"{job['filename']}: {e}")
+                    continue
+                # Add the render while it is still private: once stored, eviction can remove it before it is read
+                try:
+                    yield from _add_file(archive, sink, job['filename'], tmp_path)
+                finally:
+                    _store_quietly(job, tmp_path)
+    finally:
+        # Client went away mid-download: don't leave renders behind in the cache dir
+        for future in in_flight:
+            abandon_render(future)
+
+    if errors:
+        archive.writestr('ERRORS.txt', '\n'.join(errors) + '\n')
+    archive.close()
+    yield sink.drain()
@@ -6,54 +6,29 @@ custom sections, interests, and both German and English labels.
 
 from io import BytesIO
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import cm
-from reportlab.lib import colors
 from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, HRFlowable, Table, TableStyle
+    SimpleDocTemplate, Paragraph, Spacer, HRFlowable, Table
 )
-from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY, TA_RIGHT
 from reportlab.platypus import Image as RLImage
-from typing import Dict, Any, Optional
+from typing import BinaryIO, Dict, Any, Optional
 import os, re
 
-DEFAULT_COLOR = '#1a1a1a'
-
-DEFAULT_LABELS_EN = {
-    'summary': 'Profile',
-    'experience': 'Professional Experience',
-    'education': 'Education',
-    'skills': 'Skills',
-    'certifications': 'Certifications',
-    'languages': 'Languages',
-    'projects': 'Projects',
-    'interests': 'Interests',
-}
-
-DEFAULT_LABELS_DE = {
-    'summary': 'Profil',
-    'experience': 'Berufserfahrung',
-    'education': 'Bildung',
-    'skills': 'Fähigkeiten',
-    'certifications': 'Zertifikate',
-    'languages': 'Sprachen',
-    'projects': 'Projekte',
-    'interests': 'Interessen',
-}
-
-
-def _hex_to_rl(hexstr: str):
-    """Convert a hex color string to a reportlab color."""
-    hexstr = hexstr.strip().lstrip('#')
-    if len(hexstr) == 3:
-        hexstr = ''.join(c*2 for c in hexstr)
-    r, g, b = int(hexstr[0:2], 16), int(hexstr[2:4], 16), int(hexstr[4:6], 16)
-    return colors.Color(r/255, g/255, b/255)
-
-
-def _rgba_rl(hexstr: str, alpha=1.0):
-    c = _hex_to_rl(hexstr)
-    return colors.Color(c.red, c.green, c.blue, alpha)
+from app.utils.pdf_templates import get_template
+
+# Bump whenever the rendered output changes so cached PDFs (app.utils.pdf_cache) are rebuilt
+PDF_RENDERER_VERSION = "2"
+
+
+def _resolve_upload_path(url_path: str) -> str:
+    """
+    Map an upload URL like '/uploads/photo.jpg' or 'uploads/photo.jpg' to a file
+    relative to the backend project root. Returns '' if the file does not exist.
+    """
+    if not url_path:
+        return ''
+    backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    candidate = os.path.join(backend_dir, url_path.lstrip('/'))
+    return candidate if os.path.isfile(candidate) else ''
 
 
 def _detect_german(cv_data: dict) -> bool:
@@ -120,7 +95,19 @@ def generate_cv_pdf(
     title: str = "CV",
     theme: Optional[Dict[str, Any]] = None,
 ) -> bytes:
-    """Generate a PDF from CV data and return bytes.
+    """Generate a PDF from CV data and return bytes (see write_cv_pdf)."""
+    buffer = BytesIO()
+    write_cv_pdf(buffer, cv_data, title=title, theme=theme)
+    return buffer.getvalue()
+
+
+def write_cv_pdf(
+    output: BinaryIO,
+    cv_data: Dict[str, Any],
+    title: str = "CV",
+    theme: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Generate a PDF from CV data and write it to the binary file object output.
     
     cv_data keys accepted:
       personalInfo / personal_info — personal details dict
@@ -134,17 +121,8 @@ def generate_cv_pdf(
       interests                   — list of strings or dicts
       custom_sections             — list of {title, content} dicts
       sectionLabels               — override label names
+      photo_pdf                   — URL of the pre-sized photo JPEG (used as-is, no resizing)
     """
-    theme = theme or {}
-    primary_hex = theme.get('primaryColor') or DEFAULT_COLOR
-    layout = theme.get('layout', 'clean')
-
-    PRIMARY = _hex_to_rl(primary_hex)
-    PRIMARY_LIGHT = _rgba_rl(primary_hex, 0.15)
-    GRAY = colors.HexColor('#6b7280')
-    TEXT = colors.HexColor('#1a1a1a')
-
-    buffer = BytesIO()
 
     # ----- Normalize input keys -----
     pi = cv_data.get('personalInfo') or cv_data.get('personal_info') or {}
@@ -172,22 +150,18 @@ def generate_cv_pdf(
     interests = [i for i in interests if i]
     custom_sections = cv_data.get('custom_sections') or []
 
-    # Language detection for labels
+    # Language detection for labels; styles, colours and table styles come precompiled
     is_german = _detect_german(cv_data)
-    base_labels = DEFAULT_LABELS_DE if is_german else DEFAULT_LABELS_EN
-    labels = {**base_labels, **(cv_data.get('sectionLabels') or {})}
+    tpl = get_template(theme, is_german)
+    primary_hex = tpl.primary_hex
+    labels = {**tpl.labels, **(cv_data.get('sectionLabels') or {})}
+    body_style, sub_style, bullet_s = tpl.body, tpl.sub, tpl.bullet
 
     # Photo path resolution
     photo_path = pi.get('photo') or cv_data.get('photo_path') or ''
-    photo_abs = ''
-    if photo_path:
-        # photo_path is usually like '/uploads/photo.jpg' or 'uploads/photo.jpg'
-        # Resolve relative to the backend project root
-        backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        clean_path = photo_path.lstrip('/')
-        candidate = os.path.join(backend_dir, clean_path)
-        if os.path.isfile(candidate):
-            photo_abs = candidate
+    photo_abs = _resolve_upload_path(photo_path)
+    # Square JPEG normalized at upload time (app.utils.photos) — embedded as-is
+    photo_ready = _resolve_upload_path(cv_data.get('photo_pdf') or '')
 
     _photo_tmp_path = [None]  # list so inner functions can write to it
 
@@ -201,6 +175,8 @@ def generate_cv_pdf(
           - Saves as JPEG quality=80 instead of uncompressed PNG.
           - Temp file is cleaned up after doc.build().
         """
+        if photo_ready:
+            return RLImage(photo_ready, width=size_pts, height=size_pts)
         if not photo_abs:
             return None
         try:
@@ -254,83 +230,59 @@ def generate_cv_pdf(
             return None
 
     # ----- Document -----
-    is_modern_sidebar = (layout == 'modern')
-    margin = 1.6 * cm
-
     doc = SimpleDocTemplate(
-        buffer,
+        output,
         pagesize=A4,
-        leftMargin=margin if not is_modern_sidebar else 0,
-        rightMargin=margin if not is_modern_sidebar else 0,
-        topMargin=0,
-        bottomMargin=1.4 * cm,
+        leftMargin=tpl.left_margin,
+        rightMargin=tpl.right_margin,
+        topMargin=tpl.top_margin,
+        bottomMargin=tpl.bottom_margin,
         title=title,
     )
 
-    styles = getSampleStyleSheet()
-
-    def s(name_s, **kw):
-        base = kw.pop('base', 'Normal')
-        return ParagraphStyle(name_s, parent=styles[base], **kw)
-
-    # Common styles
-    body_style  = s('CVBody',     fontSize=8.5, textColor=TEXT, leading=13, spaceAfter=2)
-    sub_style   = s('CVSub',     fontSize=8, textColor=GRAY, leading=12)
-    bullet_s    = s('CVBullet',  fontSize=8.5, textColor=TEXT, leading=13, leftIndent=10)
-
     story = []
 
+    def section_header(label):
+        story.append(Spacer(1, tpl.section_space_before))
+        story.append(Paragraph(tpl.section_markup.format(label=label.upper()), tpl.section))
+        story.append(HRFlowable(width='100%', thickness=tpl.section_rule_thickness,
+                                color=tpl.section_rule_color, spaceAfter=tpl.section_rule_space_after))
+
+    # ── Header contact line (shared by both header styles) ──
+    contact_parts = []
+    if email:    contact_parts.append(f'\u2709  {email}')
+    if phone:    contact_parts.append(f'\u2706  {phone}')
+    if location: contact_parts.append(f'{tpl.location_icon}  {location}')
+    if linkedin: contact_parts.append(f'in  {linkedin}')
+    if website:  contact_parts.append(f'\ud83d\udd17  {website}')
+    contact_line = '    |    '.join(contact_parts)
+
+    name_block = [Paragraph(name, tpl.name)]
+    if job_headline: name_block.append(Paragraph(job_headline, tpl.title))
+    if contact_line: name_block.append(Paragraph(contact_line, tpl.contact))
+
     # =======================================================================
     # CLEAN LAYOUT (default, matches German reference CV)
     # =======================================================================
-    if layout in ('clean', 'minimal', 'executive'):
-        name_style = s('CVName', fontSize=20 if layout=='clean' else 18, textColor=TEXT, fontName='Helvetica-Bold', leading=24, spaceAfter=1)
-        title_style_p = s('CVTitleP', fontSize=10, textColor=GRAY, fontName='Helvetica', leading=14, spaceAfter=6)
-        contact_style_p = s('CVContactP', fontSize=7.5, textColor=GRAY, fontName='Helvetica', leading=11)
-        section_s = s('CVSection', fontSize=8.5, textColor=TEXT, fontName='Helvetica-Bold', spaceAfter=1, spaceBefore=6)
-
-        def section_header(label):
-            story.append(Spacer(1, 6))
-            story.append(Paragraph(f'<b>{label.upper()}</b>', section_s))
-            story.append(HRFlowable(width='100%', thickness=1.5, color=_hex_to_rl(primary_hex), spaceAfter=5))
-
+    if not tpl.banner:
         # ── Header (name + contact + optional photo) ──
-        contact_parts = []
-        if email:    contact_parts.append(f'\u2709  {email}')
-        if phone:    contact_parts.append(f'\u2706  {phone}')
-        if location: contact_parts.append(f'\ud83d\udccd  {location}')
-        if linkedin: contact_parts.append(f'in  {linkedin}')
-        if website:  contact_parts.append(f'\ud83d\udd17  {website}')
-        contact_line = '    |    '.join(contact_parts)
-
-        name_block = [Paragraph(name, name_style)]
-        if job_headline: name_block.append(Paragraph(job_headline, title_style_p))
-        if contact_line: name_block.append(Paragraph(contact_line, contact_style_p))
-
         story.append(Spacer(1, 12))
 
-        photo_img = _make_photo_image(size_pts=54)
+        photo_img = _make_photo_image(size_pts=tpl.photo_size)
         if photo_img:
             # Two-column header: name+contact on left, photo on right
             header_row = [[name_block, photo_img]]
-            photo_col_w = 58
+            photo_col_w = tpl.photo_col_width
             text_col_w = doc.width - photo_col_w
             ht = Table(header_row, colWidths=[text_col_w, photo_col_w])
-            ht.setStyle(TableStyle([
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
-                ('TOPPADDING', (0, 0), (-1, -1), 0),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
-                ('LEFTPADDING', (0, 0), (-1, -1), 0),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-            ]))
+            ht.setStyle(tpl.header_table)
             story.append(ht)
         else:
             for p in name_block:
                 story.append(p)
 
         story.append(Spacer(1, 8))
-        story.append(HRFlowable(width='100%', thickness=2, color=TEXT, spaceAfter=12))
+        story.append(HRFlowable(width='100%', thickness=2, color=tpl.text, spaceAfter=12))
 
         # ── Body sections ──
         if summary:
@@ -344,14 +296,14 @@ def generate_cv_pdf(
                 company = exp.get('company') or ''
                 loc_e = exp.get('location') or ''
                 start = exp.get('startDate') or ''
-                end = ('Heute' if is_german else 'Present') if exp.get('current') else (exp.get('endDate') or '')
+                end = tpl.present_label if exp.get('current') else (exp.get('endDate') or '')
                 date_str = f'{start} – {end}' if (start or end) else ''
                 left_p = f'<b>{role}</b>'
                 if company: left_p += f', {company}'
                 if loc_e:   left_p += f' <font color="#6b7280">— {loc_e}</font>'
                 row = [[Paragraph(left_p, body_style), Paragraph(date_str, sub_style)]]
                 t = Table(row, colWidths=[doc.width * 0.73, doc.width * 0.27])
-                t.setStyle(TableStyle([('ALIGN', (1,0), (1,0), 'RIGHT'), ('VALIGN', (0,0), (-1,-1), 'TOP'), ('TOPPADDING', (0,0), (-1,-1), 0), ('BOTTOMPADDING', (0,0), (-1,-1), 1)]))
+                t.setStyle(tpl.dated_row)
                 story.append(t)
                 desc = exp.get('description') or exp.get('responsibilities') or ''
                 if desc:
@@ -375,7 +327,7 @@ def generate_cv_pdf(
                 if inst:  deg_s += f', {inst}'
                 row = [[Paragraph(deg_s, body_style), Paragraph(date_str, sub_style)]]
                 t = Table(row, colWidths=[doc.width * 0.73, doc.width * 0.27])
-                t.setStyle(TableStyle([('ALIGN', (1,0), (1,0), 'RIGHT'), ('VALIGN', (0,0), (-1,-1), 'TOP'), ('TOPPADDING', (0,0), (-1,-1), 0), ('BOTTOMPADDING', (0,0), (-1,-1), 2)]))
+                t.setStyle(tpl.education_row)
                 story.append(t)
                 if edu.get('grade'):
                     story.append(Paragraph(f'<font color="#6b7280">Note: {edu["grade"]}</font>', sub_style))
@@ -395,13 +347,7 @@ def generate_cv_pdf(
                     rows = [cells[i:i+cols] for i in range(0, len(cells), cols)]
                     col_w = doc.width / cols
                     t = Table(rows, colWidths=[col_w]*cols)
-                    t.setStyle(TableStyle([
-                        ('TOPPADDING', (0,0), (-1,-1), 1),
-                        ('BOTTOMPADDING', (0,0), (-1,-1), 1),
-                        ('LEFTPADDING', (0,0), (-1,-1), 0),
-                        ('RIGHTPADDING', (0,0), (-1,-1), 2),
-                        ('VALIGN', (0,0), (-1,-1), 'TOP'),
-                    ]))
+                    t.setStyle(tpl.skills_grid)
                     story.append(t)
                     story.append(Spacer(1, 3))
             else:
@@ -413,13 +359,7 @@ def generate_cv_pdf(
                 rows = [skill_cells[i:i+cols] for i in range(0, len(skill_cells), cols)]
                 col_w = doc.width / cols
                 skills_table = Table(rows, colWidths=[col_w] * cols)
-                skills_table.setStyle(TableStyle([
-                    ('TOPPADDING', (0,0), (-1,-1), 1),
-                    ('BOTTOMPADDING', (0,0), (-1,-1), 1),
-                    ('LEFTPADDING', (0,0), (-1,-1), 0),
-                    ('RIGHTPADDING', (0,0), (-1,-1), 2),
-                    ('VALIGN', (0,0), (-1,-1), 'TOP'),
-                ]))
+                skills_table.setStyle(tpl.skills_grid)
                 story.append(skills_table)
             story.append(Spacer(1, 2))
 
@@ -428,7 +368,7 @@ def generate_cv_pdf(
             for l in langs:
                 row = [[Paragraph(f'<b>{l.get("language","")}</b>', body_style), Paragraph(l.get('proficiency',''), sub_style)]]
                 t = Table(row, colWidths=[doc.width * 0.5, doc.width * 0.5])
-                t.setStyle(TableStyle([('ALIGN', (1,0), (1,0), 'RIGHT'), ('TOPPADDING', (0,0), (-1,-1), 0), ('BOTTOMPADDING', (0,0), (-1,-1), 2)]))
+                t.setStyle(tpl.plain_row)
                 story.append(t)
 
         if interests:
@@ -454,7 +394,7 @@ def generate_cv_pdf(
                 date_c = c.get('issueDate') or c.get('date') or ''
                 row = [[Paragraph(left_c, body_style), Paragraph(date_c, sub_style)]]
                 t = Table(row, colWidths=[doc.width * 0.73, doc.width * 0.27])
-                t.setStyle(TableStyle([('ALIGN', (1,0), (1,0), 'RIGHT'), ('TOPPADDING', (0,0), (-1,-1), 0), ('BOTTOMPADDING', (0,0), (-1,-1), 2)]))
+                t.setStyle(tpl.plain_row)
                 story.append(t)
 
         # Custom sections
@@ -469,57 +409,22 @@ def generate_cv_pdf(
     # CLASSIC LAYOUT  (colored header banner)
     # =======================================================================
     else:
-        name_style  = s('CVName2', fontSize=20, textColor=colors.white, fontName='Helvetica-Bold', leading=24, spaceAfter=2)
-        title_style2 = s('CVTitle2', fontSize=10, textColor=_rgba_rl('#ffffff', 0.85), fontName='Helvetica', leading=14)
-        contact_s2  = s('CVContact2', fontSize=7.5, textColor=_rgba_rl('#ffffff', 0.9), fontName='Helvetica', leading=11)
-        section_s2  = s('CVSection2', fontSize=8.5, textColor=PRIMARY, fontName='Helvetica-Bold', spaceAfter=2, spaceBefore=8)
-
-        def section_header(label):
-            story.append(Spacer(1, 4))
-            story.append(Paragraph(f'<font color="{primary_hex}"><b>{label.upper()}</b></font>', section_s2))
-            story.append(HRFlowable(width='100%', thickness=0.5, color=PRIMARY, spaceAfter=4))
-
         # ── Colored header with optional photo ──
-        contact_parts = []
-        if email:    contact_parts.append(f'\u2709  {email}')
-        if phone:    contact_parts.append(f'\u2706  {phone}')
-        if location: contact_parts.append(f'\u231b  {location}')
-        if linkedin: contact_parts.append(f'in  {linkedin}')
-        if website:  contact_parts.append(f'\ud83d\udd17  {website}')
-        contact_line = '    |    '.join(contact_parts)
-
-        name_block = [Paragraph(name, name_style)]
-        if job_headline: name_block.append(Paragraph(job_headline, title_style2))
-        if contact_line: name_block.append(Paragraph(contact_line, contact_s2))
-
-        photo_img = _make_photo_image(size_pts=50)
+        margin = tpl.margin
+        photo_img = _make_photo_image(size_pts=tpl.photo_size)
         if photo_img:
             # Two-column header inside colored band: text left, photo right
             header_col_data = [[name_block, photo_img]]
-            photo_col_w = 56
+            photo_col_w = tpl.photo_col_width
             text_col_w = doc.width + 2 * margin - photo_col_w - 36
             header_inner = Table(header_col_data, colWidths=[text_col_w, photo_col_w])
-            header_inner.setStyle(TableStyle([
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
-                ('TOPPADDING', (0, 0), (-1, -1), 0),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
-                ('LEFTPADDING', (0, 0), (-1, -1), 0),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-            ]))
+            header_inner.setStyle(tpl.header_table)
             header_table = Table([[header_inner]], colWidths=[doc.width + 2 * margin])
         else:
             header_content = name_block
             header_table = Table([[p] for p in header_content], colWidths=[doc.width + 2 * margin])
 
-        header_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), PRIMARY),
-            ('TOPPADDING', (0, 0), (-1, 0), 16),
-            ('BOTTOMPADDING', (0, -1), (-1, -1), 14),
-            ('LEFTPADDING', (0, 0), (-1, -1), 18),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 18),
-            ('TOPPADDING', (0, 1), (-1, -1), 2),
-        ]))
+        header_table.setStyle(tpl.banner_table)
         story.append(header_table)
         story.append(Spacer(1, 10))
 
@@ -535,14 +440,14 @@ def generate_cv_pdf(
                 company = exp.get('company') or ''
                 loc_e = exp.get('location') or ''
                 start = exp.get('startDate') or ''
-                end_x = ('Present') if exp.get('current') else (exp.get('endDate') or '')
+                end_x = tpl.present_label if exp.get('current') else (exp.get('endDate') or '')
                 date_str = f'{start} – {end_x}' if (start or end_x) else ''
                 left_p = f'<b>{role}</b>'
                 if company: left_p += f' <font color="{primary_hex}"><b>· {company}</b></font>'
                 if loc_e:   left_p += f' <font color="#6b7280">— {loc_e}</font>'
                 row = [[Paragraph(left_p, body_style), Paragraph(date_str, sub_style)]]
                 t = Table(row, colWidths=[doc.width*0.73, doc.width*0.27])
-                t.setStyle(TableStyle([('ALIGN',(1,0),(1,0),'RIGHT'),('VALIGN',(0,0),(-1,-1),'TOP'),('TOPPADDING',(0,0),(-1,-1),0),('BOTTOMPADDING',(0,0),(-1,-1),1)]))
+                t.setStyle(tpl.dated_row)
                 story.append(t)
                 desc = exp.get('description') or ''
                 if desc:
@@ -565,7 +470,7 @@ def generate_cv_pdf(
                 if inst:  deg_s += f' <font color="{primary_hex}"><b>· {inst}</b></font>'
                 row = [[Paragraph(deg_s, body_style), Paragraph(date_str, sub_style)]]
                 t = Table(row, colWidths=[doc.width*0.73, doc.width*0.27])
-                t.setStyle(TableStyle([('ALIGN',(1,0),(1,0),'RIGHT'),('TOPPADDING',(0,0),(-1,-1),0),('BOTTOMPADDING',(0,0),(-1,-1),2)]))
+                t.setStyle(tpl.education_row)
                 story.append(t)
                 if edu.get('grade'):
                     story.append(Paragraph(f'<font color="#6b7280">Grade: {edu["grade"]}</font>', sub_style))
@@ -580,13 +485,7 @@ def generate_cv_pdf(
             rows = [skill_cells[i:i+cols] for i in range(0, len(skill_cells), cols)]
             col_w = doc.width / cols
             skills_table = Table(rows, colWidths=[col_w] * cols)
-            skills_table.setStyle(TableStyle([
-                ('TOPPADDING', (0,0), (-1,-1), 1),
-                ('BOTTOMPADDING', (0,0), (-1,-1), 1),
-                ('LEFTPADDING', (0,0), (-1,-1), 0),
-                ('RIGHTPADDING', (0,0), (-1,-1), 2),
-                ('VALIGN', (0,0), (-1,-1), 'TOP'),
-            ]))
+            skills_table.setStyle(tpl.skills_grid)
             story.append(skills_table)
 
         if langs:
@@ -594,7 +493,7 @@ def generate_cv_pdf(
             for l in langs:
                 row = [[Paragraph(f'<b>{l.get("language","")}</b>', body_style), Paragraph(l.get('proficiency',''), sub_style)]]
                 t = Table(row, colWidths=[doc.width*0.5, doc.width*0.5])
-                t.setStyle(TableStyle([('ALIGN',(1,0),(1,0),'RIGHT'),('TOPPADDING',(0,0),(-1,-1),0),('BOTTOMPADDING',(0,0),(-1,-1),2)]))
+                t.setStyle(tpl.plain_row)
                 story.append(t)
 
         if interests:
@@ -608,7 +507,7 @@ def generate_cv_pdf(
                 if c.get('issuer'): left_c += f' <font color="#6b7280">— {c["issuer"]}</font>'
                 row = [[Paragraph(left_c, body_style), Paragraph(c.get('issueDate') or c.get('date',''), sub_style)]]
                 t = Table(row, colWidths=[doc.width*0.73, doc.width*0.27])
-                t.setStyle(TableStyle([('ALIGN',(1,0),(1,0),'RIGHT'),('TOPPADDING',(0,0),(-1,-1),0),('BOTTOMPADDING',(0,0),(-1,-1),2)]))
+                t.setStyle(tpl.plain_row)
                 story.append(t)
 
         if projects:
@@ -637,5 +536,3 @@ def generate_cv_pdf(
             _os.unlink(_photo_tmp_path[0])
         except Exception:
             pass
-
-    return buffer.getvalue()
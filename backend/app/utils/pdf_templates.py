@@ -0,0 +1,240 @@
+"""
+Compiled PDF layout templates.
+Everything in a CV PDF that depends only on the theme (layout, primary colour,
+font family) and the label language — paragraph styles, colours, page geometry, table
+styles, default section labels — is built once per combination and cached.
+generate_cv_pdf then only creates the flowables for the CV content.
+Templates are shared between renders and must not be mutated.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import cm
+from reportlab.platypus import TableStyle
+
+from app.utils.fonts import FontFaces, resolve_font_family
+
+DEFAULT_COLOR = '#1a1a1a'
+DEFAULT_LAYOUT = 'clean'
+# Layouts rendered with a plain header and rule-underlined section titles;
+# anything else ('modern', unknown values) gets the coloured header band.
+PLAIN_HEADER_LAYOUTS = ('clean', 'minimal', 'executive')
+
+DEFAULT_LABELS_EN = {
+    'summary': 'Profile',
+    'experience': 'Professional Experience',
+    'education': 'Education',
+    'skills': 'Skills',
+    'certifications': 'Certifications',
+    'languages': 'Languages',
+    'projects': 'Projects',
+    'interests': 'Interests',
+}
+
+DEFAULT_LABELS_DE = {
+    'summary': 'Profil',
+    'experience': 'Berufserfahrung',
+    'education': 'Bildung',
+    'skills': 'Fähigkeiten',
+    'certifications': 'Zertifikate',
+    'languages': 'Sprachen',
+    'projects': 'Projekte',
+    'interests': 'Interessen',
+}
+
+
+def _hex_to_rl(hexstr: str):
+    """Convert a hex color string to a reportlab color."""
+    hexstr = hexstr.strip().lstrip('#')
+    if len(hexstr) == 3:
+        hexstr = ''.join(c*2 for c in hexstr)
+    r, g, b = int(hexstr[0:2], 16), int(hexstr[2:4], 16), int(hexstr[4:6], 16)
+    return colors.Color(r/255, g/255, b/255)
+
+
+def _rgba_rl(hexstr: str, alpha=1.0):
+    c = _hex_to_rl(hexstr)
+    return colors.Color(c.red, c.green, c.blue, alpha)
+
+
+@dataclass(frozen=True)
+class PdfTemplate:
+    layout: str
+    primary_hex: str
+    is_german: bool
+    font: FontFaces
+    banner: bool  # coloured header band instead of the plain header
+
+    # Page geometry (points)
+    margin: float
+    left_margin: float
+    right_margin: float
+    top_margin: float
+    bottom_margin: float
+    width: float  # frame width, same as SimpleDocTemplate.width
+
+    # Colours
+    primary: Any
+    primary_light: Any
+    gray: Any
+    text: Any
+
+    labels: Mapping[str, str]
+    present_label: str
+
+    # Paragraph styles
+    body: ParagraphStyle
+    sub: ParagraphStyle
+    bullet: ParagraphStyle
+    name: ParagraphStyle
+    title: ParagraphStyle
+    contact: ParagraphStyle
+    section: ParagraphStyle
+
+    # Section headers
+    section_markup: str  # format string with {label} (already upper-cased)
+    section_space_before: float
+    section_rule_thickness: float
+    section_rule_color: Any
+    section_rule_space_after: float
+
+    # Header
+    location_icon: str
+    photo_size: int
+    photo_col_width: float
+    header_table: TableStyle  # name block + photo side by side
+    banner_table: Optional[TableStyle]
+
+    # Content tables
+    dated_row: TableStyle  # experience rows: text left, dates right
+    education_row: TableStyle
+    plain_row: TableStyle  # languages and certifications
+    skills_grid: TableStyle
+
+
+@lru_cache(maxsize=128)
+def _compile(layout: str, primary_hex: str, is_german: bool, font: FontFaces) -> PdfTemplate:
+    primary = _hex_to_rl(primary_hex)
+    gray = colors.HexColor('#6b7280')
+    text = colors.HexColor('#1a1a1a')
+    banner = layout not in PLAIN_HEADER_LAYOUTS
+
+    margin = 1.6 * cm
+    side_margin = 0 if layout == 'modern' else margin
+
+    styles = getSampleStyleSheet()
+
+    def s(name_s, **kw):
+        base = kw.pop('base', 'Normal')
+        return ParagraphStyle(name_s, parent=styles[base], **kw)
+
+    body = s('CVBody', fontSize=8.5, textColor=text, fontName=font.regular, leading=13, spaceAfter=2)
+    sub = s('CVSub', fontSize=8, textColor=gray, fontName=font.regular, leading=12)
+    bullet = s('CVBullet', fontSize=8.5, textColor=text, fontName=font.regular, leading=13, leftIndent=10)
+
+    no_padding = [
+        ('TOPPADDING', (0, 0), (-1, -1), 0),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
+        ('LEFTPADDING', (0, 0), (-1, -1), 0),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+    ]
+
+    if not banner:
+        name = s('CVName', fontSize=20 if layout == 'clean' else 18, textColor=text, fontName=font.bold, leading=24, spaceAfter=1)
+        title = s('CVTitleP', fontSize=10, textColor=gray, fontName=font.regular, leading=14, spaceAfter=6)
+        contact = s('CVContactP', fontSize=7.5, textColor=gray, fontName=font.regular, leading=11)
+        section = s('CVSection', fontSize=8.5, textColor=text, fontName=font.bold, spaceAfter=1, spaceBefore=6)
+        section_markup = '<b>{label}</b>'
+        section_kw = dict(section_space_before=6, section_rule_thickness=1.5, section_rule_color=primary,
+                          section_rule_space_after=5)
+        header_kw = dict(
+            location_icon='\ud83d\udccd', photo_size=54, photo_col_width=58,
+            header_table=TableStyle([('VALIGN', (0, 0), (-1, -1), 'TOP'), ('ALIGN', (1, 0), (1, 0), 'RIGHT')] + no_padding),
+            banner_table=None,
+        )
+        education_row = TableStyle([('ALIGN', (1,0), (1,0), 'RIGHT'), ('VALIGN', (0,0), (-1,-1), 'TOP'), ('TOPPADDING', (0,0), (-1,-1), 0), ('BOTTOMPADDING', (0,0), (-1,-1), 2)])
+        present_label = 'Heute' if is_german else 'Present'
+    else:
+        name = s('CVName2', fontSize=20, textColor=colors.white, fontName=font.bold, leading=24, spaceAfter=2)
+        title = s('CVTitle2', fontSize=10, textColor=_rgba_rl('#ffffff', 0.85), fontName=font.regular, leading=14)
+        contact = s('CVContact2', fontSize=7.5, textColor=_rgba_rl('#ffffff', 0.9), fontName=font.regular, leading=11)
+        section = s('CVSection2', fontSize=8.5, textColor=primary, fontName=font.bold, spaceAfter=2, spaceBefore=8)
+        section_markup = f'<font color="{primary_hex}"><b>{{label}}</b></font>'
+        section_kw = dict(section_space_before=4, section_rule_thickness=0.5, section_rule_color=primary,
+                          section_rule_space_after=4)
+        header_kw = dict(
+            location_icon='\u231b', photo_size=50, photo_col_width=56,
+            header_table=TableStyle([('VALIGN', (0, 0), (-1, -1), 'MIDDLE'), ('ALIGN', (1, 0), (1, 0), 'RIGHT')] + no_padding),
+            banner_table=TableStyle([
+                ('BACKGROUND', (0, 0), (-1, -1), primary),
+                ('TOPPADDING', (0, 0), (-1, 0), 16),
+                ('BOTTOMPADDING', (0, -1), (-1, -1), 14),
+                ('LEFTPADDING', (0, 0), (-1, -1), 18),
+                ('RIGHTPADDING', (0, 0), (-1, -1), 18),
+                ('TOPPADDING', (0, 1), (-1, -1), 2),
+            ]),
+        )
+        education_row = TableStyle([('ALIGN',(1,0),(1,0),'RIGHT'),('TOPPADDING',(0,0),(-1,-1),0),('BOTTOMPADDING',(0,0),(-1,-1),2)])
+        present_label = 'Present'
+
+    return PdfTemplate(
+        layout=layout,
+        primary_hex=primary_hex,
+        is_german=is_german,
+        font=font,
+        banner=banner,
+        margin=margin,
+        left_margin=side_margin,
+        right_margin=side_margin,
+        top_margin=0,
+        bottom_margin=1.4 * cm,
+        width=A4[0] - 2 * side_margin,
+        primary=primary,
+        primary_light=_rgba_rl(primary_hex, 0.15),
+        gray=gray,
+        text=text,
+        labels=MappingProxyType(DEFAULT_LABELS_DE if is_german else DEFAULT_LABELS_EN),
+        present_label=present_label,
+        body=body,
+        sub=sub,
+        bullet=bullet,
+        name=name,
+        title=title,
+        contact=contact,
+        section=section,
+        section_markup=section_markup,
+        **section_kw,
+        **header_kw,
+        dated_row=TableStyle([('ALIGN', (1,0), (1,0), 'RIGHT'), ('VALIGN', (0,0), (-1,-1), 'TOP'), ('TOPPADDING', (0,0), (-1,-1), 0), ('BOTTOMPADDING', (0,0), (-1,-1), 1)]),
+        education_row=education_row,
+        plain_row=TableStyle([('ALIGN', (1,0), (1,0), 'RIGHT'), ('TOPPADDING', (0,0), (-1,-1), 0), ('BOTTOMPADDING', (0,0), (-1,-1), 2)]),
+        skills_grid=TableStyle([
+            ('TOPPADDING', (0,0), (-1,-1), 1),
+            ('BOTTOMPADDING', (0,0), (-1,-1), 1),
+            ('LEFTPADDING', (0,0), (-1,-1), 0),
+            ('RIGHTPADDING', (0,0), (-1,-1), 2),
+            ('VALIGN', (0,0), (-1,-1), 'TOP'),
+        ]),
+    )
+
+
+def get_template(theme: Optional[Dict[str, Any]], is_german: bool = False) -> PdfTemplate:
+    """Compiled template for a CV theme ({primaryColor, fontFamily, layout, ...}) and label language."""
+    theme = theme or {}
+    return _compile(
+        str(theme.get('layout', DEFAULT_LAYOUT)),
+        str(theme.get('primaryColor') or DEFAULT_COLOR),
+        bool(is_german),
+        resolve_font_family(theme.get('fontFamily')),
+    )
+
+
+def template_cache_info():
+    """functools cache statistics (hits, misses, currsize) for the compiled templates."""
+    return _compile.cache_info()
@@ -0,0 +1,76 @@
+"""
+Profile photo derivatives.
+An uploaded photo is normalized once (EXIF rotation, RGB, centred square crop)
+and saved as small JPEGs in a subdirectory of the upload directory, so exports
+and previews never have to open and resize the full-size upload again.
+"""
+
+import hashlib
+import logging
+import os
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Square edge in pixels per derivative.
+# 'pdf' is 2x the largest header photo in pdf_generator (72pt) for HiDPI output.
+PHOTO_DERIVATIVE_SIZES = {
+    'pdf': 144,
+    'thumb': 96,
+    'web': 400,
+}
+JPEG_QUALITY = 80
+# Derivatives live apart from uploads, so an upload named like one ('me_web.jpg')
+# can never overwrite it (or be deleted as a stale derivative)
+PHOTO_DERIVATIVE_DIR = 'derived'
+
+
+def make_photo_derivatives(source_path: str) -> Dict[str, str]:
+    """
+    Write one JPEG per PHOTO_DERIVATIVE_SIZES entry into PHOTO_DERIVATIVE_DIR
+    beside source_path ('<stem>_<kind>_<content hash>.jpg') and return {kind: file path}.
+    Returns {} when Pillow is not installed; raises ValueError if the file is not an image.
+    """
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        logger.warning("Pillow not installed — photo derivatives skipped")
+        return {}
+
+    try:
+        with Image.open(source_path) as img:
+            img = ImageOps.exif_transpose(img)
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            w, h = img.size
+            side = min(w, h)
+            left, top = (w - side) // 2, (h - side) // 2
+            square = img.crop((left, top, left + side, top + side))
+    except Exception as e:
+        raise ValueError(f"Not a valid image: {e}")
+
+    with open(source_path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:12]
+    out_dir = os.path.join(os.path.dirname(source_path), PHOTO_DERIVATIVE_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+    stem = os.path.join(out_dir, os.path.splitext(os.path.basename(source_path))[0])
+    paths = {}
+    # Largest first so each smaller size is resampled from an already reduced image
+    for kind, size in sorted(PHOTO_DERIVATIVE_SIZES.items(), key=lambda kv: -kv[1]):
+        if square.width > size:
+            square = square.resize((size, size), Image.LANCZOS)
+        path = f"{stem}_{kind}_{digest}.jpg"
+        square.save(path, 'JPEG', quality=JPEG_QUALITY, optimize=True)
+        paths[kind] = path
+    return paths
+
+
+def remove_photo_derivatives(derivatives: Optional[Dict[str, str]], backend_dir: str) -> None:
+    """Delete derivative files recorded on a CV (URL paths relative to backend_dir)."""
+    for url in (derivatives or {}).values():
+        path = os.path.join(backend_dir, str(url).lstrip('/'))
+        if os.path.isfile(path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
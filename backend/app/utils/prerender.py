@@ -0,0 +1,95 @@
+"""
+Debounced background pre-rendering of CV PDFs.
+Every write to a CV calls schedule_prerender, which (re)starts a per-CV timer.
+Only when a CV has been quiet for PDF_PRERENDER_DELAY seconds is its latest
+state rendered into the PDF cache (plus the list thumbnail), so a burst of
+autosaves costs one render and "Download PDF" is normally a cache hit.
+
+Timers live in the API process: each worker debounces the writes it sees.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Optional, Set, Tuple
+
+from app.config import PDF_PRERENDER_DELAY
+from app.utils.pdf_cache import invalidate_cv
+from app.utils.render_pool import RenderQueueFull
+from app.utils.thumbnails import get_or_render_thumbnail
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_timers: Dict[int, threading.Timer] = {}
+_latest: Dict[int, Tuple[Dict[str, Any], str, Optional[Dict[str, Any]]]] = {}
+# Renders in progress per CV, and CVs deleted while one was: the render still
+# stores its PDF / thumbnail, so those are invalidated again when it finishes
+_running: Dict[int, int] = {}
+_cancelled: Set[int] = set()
+
+
+def schedule_prerender(cv_id: int, cv_data: Dict[str, Any], title: str, theme: Optional[Dict[str, Any]]) -> None:
+    """Render this CV state in the background once no newer write arrives for PDF_PRERENDER_DELAY seconds."""
+    if PDF_PRERENDER_DELAY <= 0:
+        return
+    with _lock:
+        _latest[cv_id] = (cv_data, title, theme)
+        previous = _timers.get(cv_id)
+        if previous is not None:
+            previous.cancel()
+        timer = threading.Timer(PDF_PRERENDER_DELAY, _fire, args=(cv_id,))
+        timer.daemon = True
+        _timers[cv_id] = timer
+        timer.start()
+
+
+def _fire(cv_id: int) -> None:
+    with _lock:
+        if _timers.get(cv_id) is not threading.current_thread():
+            return  # superseded by a newer write
+        del _timers[cv_id]
+        cv_data, title, theme = _latest.pop(cv_id)
+        _running[cv_id] = _running.get(cv_id, 0) + 1
+    try:
+        get_or_render_thumbnail(cv_id, cv_data, title, theme)
+    except RenderQueueFull:
+        logger.info("Pre-render of CV %s skipped: render queue is full", cv_id)
+    except Exception as e:
+        logger.warning("Pre-render of CV %s failed: %s", cv_id, e)
+    finally:
+        with _lock:
+            _running[cv_id] -= 1
+            cancelled = cv_id in _cancelled
+            if not _running[cv_id]:
+                del _running[cv_id]
+                _cancelled.discard(cv_id)
+        if cancelled:
+            invalidate_cv(cv_id)
+
+
+def cancel_prerender(cv_id: int) -> None:
+    """
+    Drop a CV's scheduled pre-render (the CV is being deleted). A render already
+    running is left to finish, then its output is removed with invalidate_cv.
+    """
+    with _lock:
+        timer = _timers.pop(cv_id, None)
+        _latest.pop(cv_id, None)
+        if cv_id in _running:
+            _cancelled.add(cv_id)
+    if timer is not None:
+        timer.cancel()
+
+
+def pending_prerenders() -> int:
+    with _lock:
+        return len(_timers)
+
+
+def cancel_prerenders() -> None:
+    """Drop every scheduled pre-render (called on application shutdown)."""
+    with _lock:
+        for timer in _timers.values():
+            timer.cancel()
+        _timers.clear()
+        _latest.clear()
@@ -0,0 +1,233 @@
+"""
+Process pool for PDF rendering.
+reportlab layout is CPU-bound Python, so rendering inline makes concurrent
+exports serialize on the GIL and slows every other request in the worker.
+Renders are sent to a small dedicated process pool instead. The number of
+renders waiting or running is capped (RenderQueueFull when exceeded) and the
+caller waits at most PDF_RENDER_TIMEOUT seconds (RenderTimeout).
+Workers write the PDF to a temp file in the cache directory and only the path
+comes back, so large documents are not pickled between processes; pass it to
+pdf_cache.store_pdf (or discard_render_file).
+Queue-wait and render times are kept for the admin metrics endpoint.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, InvalidStateError, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import PDF_RENDER_MAX_QUEUE, PDF_RENDER_TIMEOUT, PDF_RENDER_WORKERS
+from app.utils.fonts import register_fonts
+from app.utils.pdf_cache import discard_render_file, new_render_file
+from app.utils.pdf_generator import write_cv_pdf
+
+logger = logging.getLogger(__name__)
+
+
+class RenderQueueFull(Exception):
+    """Raised when too many renders are already waiting."""
+
+
+class RenderTimeout(Exception):
+    """Raised when a render does not finish within PDF_RENDER_TIMEOUT."""
+
+
+# ── Worker side ───────────────────────────────────────────────────────────────
+
+def _render_job(cv_data: Dict[str, Any], title: str, theme: Optional[Dict[str, Any]]) -> Tuple[str, float, float]:
+    """Runs in a pool process. Returns (temp file path, wall-clock start, render seconds)."""
+    started = time.time()
+    t0 = time.perf_counter()
+    fd, tmp_path = new_render_file()
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write_cv_pdf(f, cv_data, title=title, theme=theme)
+    except BaseException:
+        discard_render_file(tmp_path)
+        raise
+    return tmp_path, started, time.perf_counter() - t0
+
+
+# ── Metrics ───────────────────────────────────────────────────────────────────
+
+_SAMPLE_WINDOW = 500
+
+_lock = threading.Lock()
+_inflight = 0
+_counters = {'completed': 0, 'failed': 0, 'rejected': 0, 'timed_out': 0}
+_queue_wait = deque(maxlen=_SAMPLE_WINDOW)
+_render_time = deque(maxlen=_SAMPLE_WINDOW)
+
+
+def _record(queue_wait: float, render_time: float) -> None:
+    with _lock:
+        _counters['completed'] += 1
+        _queue_wait.append(max(0.0, queue_wait))
+        _render_time.append(render_time)
+
+
+def _summary(samples) -> Dict[str, float]:
+    if not samples:
+        return {'count': 0, 'mean_ms': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
+    ordered = sorted(samples)
+    n = len(ordered)
+    return {
+        'count': n,
+        'mean_ms': round(sum(ordered) / n * 1000, 2),
+        'p50_ms': round(ordered[n // 2] * 1000, 2),
+        'p95_ms': round(ordered[min(n - 1, int(n * 0.95))] * 1000, 2),
+        'max_ms': round(ordered[-1] * 1000, 2),
+    }
+
+
+def render_metrics() -> Dict[str, Any]:
+    """Snapshot of pool settings, counters and recent queue-wait / render timings."""
+    with _lock:
+        return {
+            'workers': PDF_RENDER_WORKERS,
+            'max_queue': PDF_RENDER_MAX_QUEUE,
+            'timeout_seconds': PDF_RENDER_TIMEOUT,
+            'in_flight': _inflight,
+            **_counters,
+            'queue_wait': _summary(list(_queue_wait)),
+            'render_time': _summary(list(_render_time)),
+        }
+
+
+# ── Pool ──────────────────────────────────────────────────────────────────────
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=PDF_RENDER_WORKERS, initializer=register_fonts)
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    global _pool
+    with _lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _release(failed: bool) -> None:
+    global _inflight
+    with _lock:
+        _inflight -= 1
+        if failed:
+            _counters['failed'] += 1
+
+
+def _submit(cv_data: Dict[str, Any], title: str, theme: Optional[Dict[str, Any]]) -> Future:
+    """Queue a render. Returns a future resolving to the temp file path."""
+    global _inflight
+    with _lock:
+        capacity = max(1, PDF_RENDER_WORKERS) + PDF_RENDER_MAX_QUEUE
+        if _inflight >= capacity:
+            _counters['rejected'] += 1
+            raise RenderQueueFull(f"{_inflight} PDF renders already queued")
+        _inflight += 1
+
+    result: Future = Future()
+    submitted = time.time()
+
+    if PDF_RENDER_WORKERS <= 0:  # render inline (debugging, single-process deployments)
+        try:
+            tmp_path, started, render_s = _render_job(cv_data, title, theme)
+        except Exception as e:
+            _release(failed=True)
+            result.set_exception(e)
+            return result
+        _release(failed=False)
+        _record(started - submitted, render_s)
+        result.set_result(tmp_path)
+        return result
+
+    pool = _get_pool()
+    try:
+        inner = pool.submit(_render_job, cv_data, title, theme)
+    except BrokenProcessPool:
+        _release(failed=True)
+        _discard_pool(pool)
+        raise
+
+    def _done(f: Future) -> None:
+        if f.cancelled():
+            _release(failed=True)
+            result.cancel()
+            return
+        try:
+            tmp_path, started, render_s = f.result()
+        except BaseException as e:
+            _release(failed=True)
+            if isinstance(e, BrokenProcessPool):
+                _discard_pool(pool)
+            if not result.cancelled():
+                result.set_exception(e)
+            return
+        _release(failed=False)
+        _record(started - submitted, render_s)
+        try:
+            result.set_result(tmp_path)
+        except InvalidStateError:  # abandoned by the caller while rendering
+            discard_render_file(tmp_path)
+
+    inner.add_done_callback(_done)
+    # Cancelling the caller's future also drops the job if it has not started yet
+    result.add_done_callback(lambda r: r.cancelled() and inner.cancel())
+    return result
+
+
+def submit_render(cv_data: Dict[str, Any], title: str = "CV", theme: Optional[Dict[str, Any]] = None) -> Future:
+    """Queue a render and return a future resolving to the temp file path. Raises RenderQueueFull."""
+    return _submit(cv_data, title, theme)
+
+
+def _discard_result(f: Future) -> None:
+    if not f.cancelled() and f.exception() is None:
+        discard_render_file(f.result())
+
+
+def abandon_render(future: Future) -> None:
+    """Give up on a submitted render: cancel it, or delete its file once it finishes."""
+    if not future.cancel():
+        future.add_done_callback(_discard_result)
+
+
+def render_pdf(
+    cv_data: Dict[str, Any],
+    title: str = "CV",
+    theme: Optional[Dict[str, Any]] = None,
+    timeout: Optional[float] = None,
+) -> str:
+    """
+    Render on the pool and wait for the temp file path.
+    Raises RenderQueueFull when the queue is full and RenderTimeout after
+    timeout (default PDF_RENDER_TIMEOUT) seconds.
+    """
+    result = _submit(cv_data, title, theme)
+    try:
+        return result.result(timeout=timeout or PDF_RENDER_TIMEOUT)
+    except FutureTimeout:
+        abandon_render(result)
+        with _lock:
+            _counters['timed_out'] += 1
+        raise RenderTimeout(f"PDF rendering took longer than {timeout or PDF_RENDER_TIMEOUT}s")
+
+
+def shutdown_render_pool() -> None:
+    """Stop the render processes (called on application shutdown)."""
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
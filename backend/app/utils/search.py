@@ -0,0 +1,90 @@
+"""
+Indexed admin search: users by name / email substring, CVs by skill.
+
+Substring search (lower(col) LIKE '%term%') is served by pg_trgm GIN
+indexes on lower(name) / lower(email); terms of three or more characters
+use them, shorter ones fall back to a scan. Skills are stored in several
+JSONB shapes (list of strings, list of {name, ...}, or {category: [...]}),
+so cv_skill_names(skills) flattens any of them to a lower-cased text[]
+and a GIN expression index on it answers "has all / any of these skills"
+with @> / && instead of walking every CV's JSON.
+
+db_migrate applies SKILL_SEARCH_DDL (required: the CV search query calls
+cv_skill_names) and TRIGRAM_DDL (optional: CREATE EXTENSION needs privileges
+the app role may lack, and user search then just runs unindexed) separately.
+"""
+
+from typing import Iterable, List
+
+from sqlalchemy import Text, func, or_
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.models import CV, User
+
+# Flatten any stored skills shape to distinct lower-cased, trimmed names. IMMUTABLE so it can be indexed.
+CV_SKILL_NAMES_FUNCTION = """
+CREATE OR REPLACE FUNCTION cv_skill_names(skills jsonb) RETURNS text[]
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT COALESCE(array_agg(DISTINCT lower(btrim(name))) FILTER (WHERE btrim(name) <> ''), '{}')
+    FROM (
+        SELECT CASE jsonb_typeof(item) WHEN 'string' THEN item #>> '{}' WHEN 'object' THEN item ->> 'name' END AS name
+        FROM jsonb_array_elements(CASE jsonb_typeof(skills) WHEN 'array' THEN skills ELSE '[]'::jsonb END) AS item
+        UNION ALL
+        SELECT CASE jsonb_typeof(item) WHEN 'string' THEN item #>> '{}' WHEN 'object' THEN item ->> 'name' END
+        FROM jsonb_each(CASE jsonb_typeof(skills) WHEN 'object' THEN skills ELSE '{}'::jsonb END) AS category(key, items),
+             jsonb_array_elements(CASE jsonb_typeof(items) WHEN 'array' THEN items ELSE '[]'::jsonb END) AS item
+    ) AS flattened
+$$
+"""
+
+# name → CREATE statement; the benchmark drops and recreates these by name
+SEARCH_INDEXES = {
+    'idx_user_name_trgm': "CREATE INDEX IF NOT EXISTS idx_user_name_trgm ON users USING gin (lower(name) gin_trgm_ops)",
+    'idx_user_email_trgm': "CREATE INDEX IF NOT EXISTS idx_user_email_trgm ON users USING gin (lower(email) gin_trgm_ops)",
+    'idx_cv_skill_names': "CREATE INDEX IF NOT EXISTS idx_cv_skill_names ON cvs USING gin (cv_skill_names(skills))",
+}
+
+SKILL_SEARCH_DDL = [CV_SKILL_NAMES_FUNCTION, SEARCH_INDEXES['idx_cv_skill_names']]
+TRIGRAM_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    SEARCH_INDEXES['idx_user_name_trgm'],
+    SEARCH_INDEXES['idx_user_email_trgm'],
+]
+SEARCH_DDL = [*SKILL_SEARCH_DDL, *TRIGRAM_DDL]
+
+SKILL_MATCH_PATTERN = "^(all|any)$"
+
+
+def _like_escape(term: str) -> str:
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def user_search_filter(search: str):
+    """Case-insensitive substring match on name or email (LIKE wildcards in search are literal)."""
+    like = f"%{_like_escape(search.lower())}%"
+    return or_(
+        func.lower(User.name).like(like, escape='\\'),
+        func.lower(User.email).like(like, escape='\\'),
+    )
+
+
+def normalize_skills(values: Iterable[str]) -> List[str]:
+    """Skill names as cv_skill_names stores them: trimmed, lower-cased, distinct, non-empty."""
+    names: List[str] = []
+    for value in values:
+        for name in value.split(','):
+            name = name.strip().lower()
+            if name and name not in names:
+                names.append(name)
+    return names
+
+
+def cv_skill_names():
+    """SQL expression for a CV's indexed skill names (matches idx_cv_skill_names)."""
+    return func.cv_skill_names(CV.skills, type_=ARRAY(Text))
+
+
+def cv_skill_filter(skills: List[str], match: str = "all"):
+    """CVs having all (@>) or any (&&) of the normalized skill names."""
+    names = cv_skill_names()
+    return names.contains(skills) if match == "all" else names.overlap(skills)
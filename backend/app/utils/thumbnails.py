@@ -0,0 +1,63 @@
+"""
+First-page PNG thumbnails of CV PDFs for list previews.
+A thumbnail is rasterized from the cached PDF (pypdfium2) and stored in the
+PDF cache under the same key, so it goes stale exactly when the PDF does and
+a list of previews is served as plain file reads.
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+from app.config import PDF_THUMBNAIL_WIDTH
+from app.utils.pdf_cache import (
+    discard_render_file, get_cached_thumbnail, new_render_file, pdf_cache_key, pinned_file, store_thumbnail,
+)
+from app.utils.pdf_export import get_pinned_pdf
+
+
+def rasterize_first_page(pdf_path: str, width: int = PDF_THUMBNAIL_WIDTH) -> str:
+    """Render page 1 of pdf_path as a PNG width pixels wide. Returns a temp file for store_thumbnail."""
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        page = pdf[0]
+        try:
+            bitmap = page.render(scale=width / page.get_width())
+            image = bitmap.to_pil()
+        finally:
+            page.close()
+    finally:
+        pdf.close()
+
+    fd, tmp_path = new_render_file()
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            image.save(f, 'PNG', optimize=True)
+    except Exception:
+        discard_render_file(tmp_path)
+        raise
+    return tmp_path
+
+
+def _render_thumbnail(cv_id: int, cv_data: Dict[str, Any], title: str, theme: Optional[Dict[str, Any]]) -> str:
+    pdf_path = get_pinned_pdf(cv_id, cv_data, title, theme)
+    try:
+        return rasterize_first_page(pdf_path)
+    finally:
+        discard_render_file(pdf_path)
+
+
+def get_or_render_thumbnail(cv_id: int, cv_data: Dict[str, Any], title: str, theme: Optional[Dict[str, Any]]) -> str:
+    """Path of the cached thumbnail for this CV state, rendering the PDF first if needed."""
+    key = pdf_cache_key(cv_id, cv_data, title, theme)
+    path = get_cached_thumbnail(key)
+    if path is None:
+        path = store_thumbnail(key, _render_thumbnail(cv_id, cv_data, title, theme))
+    return path
+
+
+def get_pinned_thumbnail(cv_id: int, cv_data: Dict[str, Any], title: str, theme: Optional[Dict[str, Any]]) -> str:
+    """Pinned link (pin_file) to the thumbnail, as get_pinned_pdf; remove it with discard_render_file when done."""
+    key = pdf_cache_key(cv_id, cv_data, title, theme)
+    return pinned_file(key, '.png', lambda: _render_thumbnail(cv_id, cv_data, title, theme))
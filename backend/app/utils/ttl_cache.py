@@ -0,0 +1,75 @@
+"""
+Small in-process TTL cache for hot, cheap-to-be-slightly-stale reads
+(dashboard stats polled every few seconds, the user behind each request).
+Entries expire after ttl seconds and writers invalidate the keys they
+affect, so the process that handled a write serves fresh numbers at once;
+other worker processes catch up within ttl.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from app.config import AUTH_USER_CACHE_TTL_SECONDS, STATS_CACHE_TTL_SECONDS
+
+
+class TTLCache:
+    """Thread-safe key → value cache; least recently used entries go first past maxsize."""
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_set(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Cached value, or compute() stored under key (computed outside the lock)."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one key, or everything when key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+_MISSING = object()
+
+
+# ── Shared caches ─────────────────────────────────────────────────────────────
+
+# GET /admin/stats (single key None): users and CVs created, deleted or re-flagged
+admin_stats_cache = TTLCache(STATS_CACHE_TTL_SECONDS, maxsize=1)
+# GET /job-applications/stats, keyed by user id: that user's applications written
+job_stats_cache = TTLCache(STATS_CACHE_TTL_SECONDS)
+# get_current_user*, keyed by user id: auth fields of a user; admin user changes invalidate it in
+# every worker (app.utils.cache_listener)
+auth_user_cache = TTLCache(AUTH_USER_CACHE_TTL_SECONDS, maxsize=10000)
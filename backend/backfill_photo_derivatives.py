@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Create the normalized photo JPEGs (pdf / thumb / web) for CVs whose photo was
+uploaded before derivatives existed. Safe to run multiple times.
+
+Usage:
+    python backfill_photo_derivatives.py
+    python backfill_photo_derivatives.py --force    # regenerate existing derivatives too
+"""
+
+import argparse
+import os
+
+from app.database import SessionLocal
+from app.models import CV
+from app.utils.photos import PHOTO_DERIVATIVE_DIR, make_photo_derivatives, remove_photo_derivatives
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def backfill(force: bool = False) -> None:
+    db = SessionLocal()
+    try:
+        query = db.query(CV).filter(CV.photo_path.isnot(None), CV.photo_path != '')
+        if not force:
+            query = query.filter(CV.photo_derivatives.is_(None))
+        done = skipped = 0
+        for cv in query.all():
+            source = os.path.join(BACKEND_DIR, cv.photo_path.lstrip('/'))
+            if not os.path.isfile(source):
+                print(f"⚠️  CV {cv.id}: photo file missing ({cv.photo_path})")
+                skipped += 1
+                continue
+            try:
+                paths = make_photo_derivatives(source)
+            except ValueError as e:
+                print(f"❌ CV {cv.id}: {e}")
+                skipped += 1
+                continue
+            url_dir = f"{os.path.dirname(cv.photo_path)}/{PHOTO_DERIVATIVE_DIR}"
+            derivatives = {kind: f"{url_dir}/{os.path.basename(p)}" for kind, p in paths.items()}
+            # --force: drop replaced files (e.g. ones written beside the upload by older versions)
+            remove_photo_derivatives(
+                {k: v for k, v in (cv.photo_derivatives or {}).items() if v not in derivatives.values()}, BACKEND_DIR
+            )
+            cv.photo_derivatives = derivatives or None
+            db.commit()
+            done += 1
+            print(f"✅ CV {cv.id}")
+        print(f"\n✅ {done} CV(s) updated, {skipped} skipped")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate photo derivatives for existing CVs")
+    parser.add_argument("--force", action="store_true", help="Regenerate derivatives that already exist")
+    args = parser.parse_args()
+
+    print("🚀 Backfilling photo derivatives...")
+    print("-" * 50)
+    backfill(force=args.force)
+    print("-" * 50)
+    print("✨ Done!")
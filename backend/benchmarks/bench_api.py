@@ -0,0 +1,240 @@
+"""
+API throughput benchmark for the CV, cover letter and job application routes.
+
+Drives a running API server with concurrent HTTP clients and reports per
+(scenario, concurrency):
+  - requests/sec, median / p95 latency and error count
+  - database connections in use on the server side — peak total and peak
+    non-idle, sampled from pg_stat_activity every 50 ms during the run
+Comparing runs before and after a change (e.g. the move from sync routes on
+psycopg2 to async routes on asyncpg) shows both throughput and how many
+connections the same load keeps checked out.
+
+A throwaway user is signed up and seeded with CVs, cover letters and job
+applications through the API, so the target database only needs the schema.
+
+Usage:
+    uvicorn app.main:app --workers 1 &                         # server under test
+    python -m benchmarks.bench_api                             # all scenarios, concurrency 1 / 16 / 64
+    python -m benchmarks.bench_api --scenarios list_cvs --concurrency 32 128
+    python -m benchmarks.bench_api --json api.json             # keep numbers for diffing between commits
+    python -m benchmarks.bench_api --baseline api.json         # print changes against an earlier run
+"""
+
+import argparse
+import contextlib
+import json
+import statistics
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+from sqlalchemy import create_engine, text
+
+from app.config import DATABASE_URL
+
+SCENARIOS = {
+    'list_cvs':        ('GET', '/api/cvs'),
+    'get_cv':          ('GET', '/api/cvs/{cv_id}'),
+    'update_cv':       ('PUT', '/api/cvs/{cv_id}'),
+    'list_letters':    ('GET', '/api/cover-letters'),
+    'list_jobs':       ('GET', '/api/job-applications'),
+    'job_stats':       ('GET', '/api/job-applications/stats'),
+}
+
+
+# ── Setup ─────────────────────────────────────────────────────────────────────
+
+def seed(base_url: str, cvs: int) -> Dict[str, Any]:
+    """Sign up a fresh user and create cvs CVs plus one cover letter and job application per CV."""
+    email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+    r = requests.post(f"{base_url}/api/auth/signup",
+                      json={'name': 'Bench User', 'email': email, 'password': 'bench-password-1'})
+    r.raise_for_status()
+    token = r.json()['access_token']
+    headers = {'Authorization': f'Bearer {token}'}
+
+    cv_ids = []
+    for i in range(cvs):
+        r = requests.post(f"{base_url}/api/cvs", headers=headers, json={
+            'title': f"Bench CV {i + 1}",
+            'personal_info': {'name': 'Bench User', 'email': email, 'summary': 'Backend engineer. ' * 20},
+            'skills': ['Python', 'PostgreSQL', 'FastAPI', 'Docker'],
+            'experiences': [{'role': 'Engineer', 'company': 'ACME', 'description': '• Built things\n' * 10}] * 5,
+        })
+        r.raise_for_status()
+        cv_id = r.json()['id']
+        cv_ids.append(cv_id)
+        # Content goes in with an update: older trees could not create letters with content
+        r = requests.post(f"{base_url}/api/cover-letters", headers=headers,
+                          json={'title': f"Letter {i + 1}", 'cv_id': cv_id})
+        r.raise_for_status()
+        requests.put(f"{base_url}/api/cover-letters/{r.json()['id']}", headers=headers, json={
+            'content': {'body': 'Dear team,\n\n' + 'I apply. ' * 80},
+        }).raise_for_status()
+        requests.post(f"{base_url}/api/job-applications", headers=headers, json={
+            'company': 'ACME', 'role': 'Engineer', 'cv_id': cv_id,
+        }).raise_for_status()
+    return {'headers': headers, 'cv_ids': cv_ids}
+
+
+# ── Connection sampling ───────────────────────────────────────────────────────
+
+class ConnectionSampler:
+    """Peak connections to the server's database (excluding this sampler) while running."""
+
+    QUERY = text("""
+        SELECT count(*), count(*) FILTER (WHERE state <> 'idle')
+        FROM pg_stat_activity
+        WHERE datname = current_database() AND pid <> pg_backend_pid()
+    """)
+
+    def __init__(self, db_url: str, interval: float = 0.05):
+        self._engine = create_engine(db_url, pool_size=1, max_overflow=0)
+        self._interval = interval
+        self._stop = threading.Event()
+        self.peak_total = self.peak_active = 0
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        with self._engine.connect() as conn:
+            while not self._stop.is_set():
+                total, active = conn.execute(self.QUERY).one()
+                conn.rollback()
+                self.peak_total = max(self.peak_total, total)
+                self.peak_active = max(self.peak_active, active)
+                self._stop.wait(self._interval)
+
+
+# ── Measurement ───────────────────────────────────────────────────────────────
+
+def _request_fn(base_url: str, scenario: str, ctx: Dict[str, Any]) -> Callable[[requests.Session, int], int]:
+    method, path = SCENARIOS[scenario]
+    cv_ids = ctx['cv_ids']
+
+    def call(session: requests.Session, i: int) -> int:
+        cv_id = cv_ids[i % len(cv_ids)]
+        body = {'profile_summary': f"Revision {i}"} if method == 'PUT' else None
+        return session.request(method, base_url + path.format(cv_id=cv_id), json=body).status_code
+
+    return call
+
+
+def measure(base_url: str, scenario: str, concurrency: int, requests_per_client: int,
+            ctx: Dict[str, Any], db_url: Optional[str]) -> Dict[str, Any]:
+    call = _request_fn(base_url, scenario, ctx)
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def client(worker: int) -> None:
+        nonlocal errors
+        session = requests.Session()
+        session.headers.update(ctx['headers'])
+        call(session, worker)  # warm-up: connection setup, first-request costs
+        local, failed = [], 0
+        for i in range(requests_per_client):
+            start = time.perf_counter()
+            code = call(session, worker * requests_per_client + i)
+            local.append(time.perf_counter() - start)
+            failed += code >= 400
+        with lock:
+            latencies.extend(local)
+            errors += failed
+
+    sampler = ConnectionSampler(db_url) if db_url else None
+    start = time.perf_counter()
+    with sampler or contextlib.nullcontext():
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(client, range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    ordered = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / elapsed, 1),
+        'median_ms': round(statistics.median(latencies) * 1000, 2),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))] * 1000, 2),
+        'peak_connections': sampler.peak_total if sampler else None,
+        'peak_active_connections': sampler.peak_active if sampler else None,
+    }
+
+
+def run(base_url: str, scenarios: List[str], concurrency: List[int], requests_per_client: int = 50,
+        cvs: int = 10, db_url: Optional[str] = DATABASE_URL) -> Dict[str, Any]:
+    ctx = seed(base_url, cvs)
+    results: Dict[str, Dict[str, Any]] = {}
+    for scenario in scenarios:
+        for c in concurrency:
+            case = f"{scenario}.c{c}"
+            results[case] = measure(base_url, scenario, c, requests_per_client, ctx, db_url)
+            print(f"  {case}: {results[case]['rps']} req/s")
+    return {
+        'meta': {
+            'url': base_url,
+            'requests_per_client': requests_per_client,
+            'cvs': cvs,
+            'connections_sampled': bool(db_url),
+        },
+        'results': results,
+    }
+
+
+# ── Report ────────────────────────────────────────────────────────────────────
+
+def _delta(new: Optional[float], old: Optional[float]) -> str:
+    if not old or new is None:
+        return ''
+    return f" ({(new - old) / old * 100:+.0f}%)"
+
+
+def _print_report(results: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+    old = (baseline or {}).get('results', {})
+    print(f"\n{'case':<22}{'req/s':>16}{'median ms':>16}{'p95 ms':>10}{'errors':>8}{'conns':>12}{'active':>12}")
+    for case, r in results['results'].items():
+        b = old.get(case, {})
+        rps = f"{r['rps']:.0f}{_delta(r['rps'], b.get('rps'))}"
+        median = f"{r['median_ms']:.1f}{_delta(r['median_ms'], b.get('median_ms'))}"
+        conns = '-' if r['peak_connections'] is None else \
+            f"{r['peak_connections']}{_delta(r['peak_connections'], b.get('peak_connections'))}"
+        active = '-' if r['peak_active_connections'] is None else str(r['peak_active_connections'])
+        print(f"{case:<22}{rps:>16}{median:>16}{r['p95_ms']:>10.1f}{r['errors']:>8}{conns:>12}{active:>12}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark API throughput and DB connection usage")
+    parser.add_argument("--url", default="http://localhost:8000", help="Base URL of the running API")
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 16, 64], help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per client per case")
+    parser.add_argument("--cvs", type=int, default=10, help="CVs (and letters / applications) seeded for the user")
+    parser.add_argument("--db-url", default=DATABASE_URL, help="Database to sample pg_stat_activity from")
+    parser.add_argument("--no-db", action="store_true", help="Skip connection sampling")
+    parser.add_argument("--json", dest="json_out", help="Write results as JSON to this path")
+    parser.add_argument("--baseline", help="Earlier --json output to compare against")
+    args = parser.parse_args()
+
+    results = run(args.url, args.scenarios, args.concurrency, args.requests, args.cvs,
+                  None if args.no_db else args.db_url)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    _print_report(results, baseline)
+    if args.json_out:
+        with open(args.json_out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results written to {args.json_out}")
@@ -0,0 +1,203 @@
+"""
+CV parser benchmark: per-stage timings and field-level accuracy.
+
+Runs extract_text_from_file + parse_cv_text over a synthetic corpus (see
+benchmarks/synthetic_cvs.py) and reports:
+  - timings per stage: extraction (per format), personal info, section split,
+    experience parsing, education parsing, full parse_cv_text
+  - which extraction tier served each format (PDF text layer vs layout pass)
+  - accuracy per field against the generated ground truth, per language
+
+Usage:
+    python -m benchmarks.bench_parser                         # generate a temp corpus (20 CVs/language)
+    python -m benchmarks.bench_parser --corpus /tmp/cv_corpus --rounds 5
+    python -m benchmarks.bench_parser --json results.json     # keep numbers for diffing between commits
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+from typing import Any, Dict, List
+
+from app.utils import cv_parser
+from benchmarks.synthetic_cvs import FORMATS, LANGUAGES, build_corpus
+
+
+# ── Timing ────────────────────────────────────────────────────────────────────
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def _run_stages(path: str, timings: Dict[str, List[float]], fmt: str, tiers: Dict[str, int]) -> Dict[str, Any]:
+    """Run every parser stage once on path, recording durations. Returns the parse result."""
+    (text, tier), t = _timed(cv_parser.extract_text_with_tier, path)
+    timings[f'extract.{fmt}'].append(t)
+    tiers[f'{fmt}.{tier}'] += 1
+
+    lines = [l.rstrip() for l in text.split('\n')]
+    clean_lines = [l.strip() for l in lines if l.strip()]
+    _, t = _timed(cv_parser._extract_personal_info, text, clean_lines)
+    timings['personal_info'].append(t)
+
+    sections, t = _timed(cv_parser._split_into_sections, lines)
+    timings['section_split'].append(t)
+
+    if 'experience' in sections:
+        _, t = _timed(cv_parser._parse_experience, sections['experience'][1])
+        timings['experience'].append(t)
+    if 'education' in sections:
+        _, t = _timed(cv_parser._parse_education, sections['education'][1])
+        timings['education'].append(t)
+
+    parsed, t = _timed(cv_parser.parse_cv_text, text)
+    timings['parse_cv_text'].append(t)
+    timings[f'total.{fmt}'].append(timings[f'extract.{fmt}'][-1] + t)
+    return parsed
+
+
+def _summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        'n': len(samples),
+        'mean_ms': round(statistics.fmean(samples) * 1000, 3),
+        'median_ms': round(statistics.median(samples) * 1000, 3),
+        'p95_ms': round(p95 * 1000, 3),
+        'total_s': round(sum(samples), 4),
+    }
+
+
+# ── Accuracy ──────────────────────────────────────────────────────────────────
+
+def _norm(value: Any) -> str:
+    return ' '.join(str(value or '').lower().split())
+
+
+def _digits(value: Any) -> str:
+    return re.sub(r'\D', '', str(value or ''))
+
+
+def _recall(truth: List[str], found: List[str]) -> float:
+    if not truth:
+        return 1.0
+    found_set = {_norm(f) for f in found}
+    return sum(1 for t in truth if _norm(t) in found_set) / len(truth)
+
+
+def score_cv(truth: Dict[str, Any], parsed: Dict[str, Any]) -> Dict[str, float]:
+    """Field-level scores in [0, 1] for one parsed CV."""
+    scores: Dict[str, float] = {}
+    t_pi, p_pi = truth['personalInfo'], parsed.get('personalInfo') or {}
+    scores['personal.name'] = float(_norm(t_pi['name']) == _norm(p_pi.get('name')))
+    scores['personal.email'] = float(_norm(t_pi['email']) == _norm(p_pi.get('email')))
+    scores['personal.phone'] = float(_digits(t_pi['phone']) == _digits(p_pi.get('phone')))
+    scores['personal.location'] = float(_norm(t_pi['location']) == _norm(p_pi.get('location')))
+    scores['summary'] = float(_norm(truth['summary']) in _norm(parsed.get('summary')))
+
+    t_exp, p_exp = truth['experience'], parsed.get('experience') or []
+    scores['experience.count'] = float(len(t_exp) == len(p_exp))
+    for field in ('role', 'company', 'startDate', 'endDate', 'current'):
+        hits = 0
+        for i, exp in enumerate(t_exp):
+            if i < len(p_exp):
+                hits += _norm(exp[field]) == _norm(p_exp[i].get(field))
+        scores[f'experience.{field}'] = hits / len(t_exp)
+
+    t_edu, p_edu = truth['education'], parsed.get('education') or []
+    scores['education.count'] = float(len(t_edu) == len(p_edu))
+    for field in ('degree', 'institution', 'startDate', 'endDate'):
+        hits = 0
+        for i, edu in enumerate(t_edu):
+            if i < len(p_edu):
+                hits += _norm(edu[field]) == _norm(p_edu[i].get(field))
+        scores[f'education.{field}'] = hits / len(t_edu)
+
+    p_skills = [s.get('name') if isinstance(s, dict) else s for s in parsed.get('skills') or []]
+    scores['skills.recall'] = _recall(truth['skills'], p_skills)
+
+    p_langs = parsed.get('languages') or []
+    scores['languages.recall'] = _recall([l['language'] for l in truth['languages']],
+                                         [l.get('language') for l in p_langs])
+    levels = {_norm(l.get('language')): l.get('proficiency') for l in p_langs}
+    scores['languages.level'] = sum(
+        1 for l in truth['languages'] if levels.get(_norm(l['language'])) == l['proficiency']
+    ) / len(truth['languages'])
+    return scores
+
+
+# ── Runner ────────────────────────────────────────────────────────────────────
+
+def run(corpus_dir: str, rounds: int = 3) -> Dict[str, Any]:
+    with open(os.path.join(corpus_dir, 'ground_truth.json'), encoding='utf-8') as f:
+        corpus = json.load(f)
+
+    timings: Dict[str, List[float]] = defaultdict(list)
+    tiers: Dict[str, int] = defaultdict(int)
+    accuracy: Dict[str, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+
+    for round_no in range(rounds):
+        for entry in corpus['cvs']:
+            truth = entry['truth']
+            for fmt, filename in entry['files'].items():
+                parsed = _run_stages(os.path.join(corpus_dir, filename), timings, fmt, tiers)
+                if round_no == 0:  # accuracy is deterministic — score once
+                    for field, value in score_cv(truth, parsed).items():
+                        accuracy[f"{truth['lang']}.{fmt}"][field].append(value)
+                        accuracy['all'][field].append(value)
+
+    return {
+        'corpus': {'seed': corpus['seed'], 'cvs': len(corpus['cvs']), 'rounds': rounds},
+        'timings': {stage: _summarize(samples) for stage, samples in sorted(timings.items())},
+        'extraction_tiers': dict(sorted(tiers.items())),
+        'accuracy': {
+            group: {field: round(statistics.fmean(values), 4) for field, values in sorted(fields.items())}
+            for group, fields in sorted(accuracy.items())
+        },
+    }
+
+
+def _print_report(results: Dict[str, Any]) -> None:
+    c = results['corpus']
+    print(f"Corpus: {c['cvs']} CVs (seed {c['seed']}), {c['rounds']} round(s)\n")
+    print(f"{'stage':<20}{'n':>6}{'mean ms':>11}{'median ms':>11}{'p95 ms':>10}")
+    for stage, s in results['timings'].items():
+        print(f"{stage:<20}{s['n']:>6}{s['mean_ms']:>11.3f}{s['median_ms']:>11.3f}{s['p95_ms']:>10.3f}")
+
+    print("\nExtraction tiers: " + ', '.join(f"{k}={v}" for k, v in results['extraction_tiers'].items()))
+
+    groups = list(results['accuracy'])
+    fields = list(results['accuracy']['all'])
+    print(f"\n{'field':<22}" + ''.join(f"{g:>9}" for g in groups))
+    for field in fields:
+        print(f"{field:<22}" + ''.join(f"{results['accuracy'][g].get(field, 0):>9.2f}" for g in groups))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark CV parser speed and accuracy")
+    parser.add_argument("--corpus", help="Corpus directory (default: generate a temporary one)")
+    parser.add_argument("--count", type=int, default=20, help="CVs per language when generating")
+    parser.add_argument("--seed", type=int, default=0, help="Seed when generating")
+    parser.add_argument("--rounds", type=int, default=3, help="Timing rounds over the corpus")
+    parser.add_argument("--json", dest="json_out", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="cv_corpus_") as tmp:
+        corpus_dir = args.corpus
+        if not corpus_dir:
+            build_corpus(tmp, args.count, args.seed, LANGUAGES, FORMATS)
+            corpus_dir = tmp
+        results = run(corpus_dir, args.rounds)
+
+    _print_report(results)
+    if args.json_out:
+        with open(args.json_out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results written to {args.json_out}")
@@ -0,0 +1,221 @@
+"""
+Autosave benchmark: full-document PUT against JSON Patch PATCH for CV edits.
+
+Replays the editor's most common autosave — one experience bullet changed —
+against a running API server, once as the editor's whole payload via
+PUT /api/cvs/{id} and once as a single-op JSON Patch with If-Match via
+PATCH /api/cvs/{id}. Reports per mode and CV size:
+  - request body bytes per edit
+  - median / p95 latency and error count
+  - WAL bytes per edit (pg_current_wal_lsn before and after the run), when the
+    server's PostgreSQL is reachable; this is cluster-wide, so run it on an
+    otherwise idle database
+
+Both modes write the same columns (the ORM only updates columns whose value
+changed) and record the same version delta, so the difference is mostly in
+what travels over the wire and what the server parses and diffs.
+
+Usage:
+    uvicorn app.main:app --workers 1 &                         # server under test
+    python -m benchmarks.bench_patch                           # put vs patch, small and large CVs
+    python -m benchmarks.bench_patch --edits 500 --sizes large
+    python -m benchmarks.bench_patch --json patch.json         # keep numbers for diffing between commits
+    python -m benchmarks.bench_patch --baseline patch.json     # print changes against an earlier run
+"""
+
+import argparse
+import json
+import statistics
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import requests
+from sqlalchemy import create_engine, text
+
+from app.config import DATABASE_URL
+from benchmarks.synthetic_cvs import generate_cv
+
+MODES = ('put', 'patch')
+# Synthetic CVs merged into one editor document: small is one CV, large is a long career
+SIZES = {'small': 1, 'large': 6}
+
+
+# ── Setup ─────────────────────────────────────────────────────────────────────
+
+def editor_payload(size: str) -> Dict[str, Any]:
+    """A CV shaped like the editor's autosave payload (buildPayload in CVEditorPage.js)."""
+    cvs = [generate_cv(seed, 'en') for seed in range(SIZES[size])]
+    first = cvs[0]
+    return {
+        'title': f"Bench CV ({size})",
+        'personal_info': {**first['personalInfo'], 'summary': first['summary'], 'linkedin': '', 'website': ''},
+        'experiences': [{
+            'position': e['role'], 'role': e['role'], 'company': e['company'], 'location': e['location'],
+            'startDate': e['startDate'], 'endDate': e['endDate'], 'current': e['current'],
+            'description': '\n'.join(f"• {b}" for b in e['bullets']),
+        } for cv in cvs for e in cv['experience']],
+        'educations': [{**e, 'field': '', 'grade': ''} for cv in cvs for e in cv['education']],
+        'skills': [{'name': s, 'level': ''} for s in first['skills']],
+        'certifications': [],
+        'languages': [{'language': l['language'], 'level': l['level_text']} for l in first['languages']],
+        'projects': [],
+        'interests': [],
+        'custom_sections': [],
+        'theme': {'primaryColor': '#2563eb', 'fontFamily': 'Inter', 'layout': 'modern'},
+    }
+
+
+def seed(base_url: str) -> Dict[str, Any]:
+    """Sign up a fresh user and create one CV per (mode, size)."""
+    email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+    r = requests.post(f"{base_url}/api/auth/signup",
+                      json={'name': 'Bench User', 'email': email, 'password': 'bench-password-1'})
+    r.raise_for_status()
+    headers = {'Authorization': f"Bearer {r.json()['access_token']}"}
+
+    cvs = {}
+    for mode in MODES:
+        for size in SIZES:
+            payload = editor_payload(size)
+            r = requests.post(f"{base_url}/api/cvs", headers=headers, json=payload)
+            r.raise_for_status()
+            cvs[(mode, size)] = {'id': r.json()['id'], 'version': r.json().get('current_version') or 1,
+                                 'payload': payload}
+    return {'headers': headers, 'cvs': cvs}
+
+
+# ── Measurement ───────────────────────────────────────────────────────────────
+
+class WalMeter:
+    """WAL bytes written cluster-wide between start() and stop()."""
+
+    def __init__(self, db_url: str):
+        self._engine = create_engine(db_url, pool_size=1, max_overflow=0)
+        self._start = None
+
+    def _lsn(self) -> str:
+        with self._engine.connect() as conn:
+            return conn.execute(text("SELECT pg_current_wal_lsn()::text")).scalar()
+
+    def start(self) -> None:
+        self._start = self._lsn()
+
+    def stop(self) -> int:
+        with self._engine.connect() as conn:
+            return int(conn.execute(
+                text("SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), CAST(:start AS pg_lsn))"), {'start': self._start}
+            ).scalar())
+
+
+def _edit(session: requests.Session, base_url: str, mode: str, cv: Dict[str, Any], i: int) -> tuple:
+    """Change bullet i of the first experience; returns (status code, request body bytes)."""
+    text_ = f"• Revision {i}: cut nightly batch time by {i % 90 + 10}%"
+    lines = cv['payload']['experiences'][0]['description'].split('\n')
+    lines[0] = text_
+    description = '\n'.join(lines)
+    url = f"{base_url}/api/cvs/{cv['id']}"
+
+    if mode == 'put':
+        cv['payload']['experiences'][0]['description'] = description
+        body = json.dumps(cv['payload']).encode()
+        r = session.put(url, data=body, headers={'Content-Type': 'application/json'})
+    else:
+        ops = [{'op': 'replace', 'path': '/experiences/0/description', 'value': description}]
+        body = json.dumps(ops).encode()
+        r = session.patch(url, data=body, headers={
+            'Content-Type': 'application/json-patch+json', 'If-Match': f'"{cv["version"]}"',
+        })
+    if r.ok:
+        cv['payload']['experiences'][0]['description'] = description
+        cv['version'] = r.json().get('current_version') or cv['version']
+    return r.status_code, len(body)
+
+
+def measure(base_url: str, mode: str, cv: Dict[str, Any], edits: int, headers: Dict[str, str],
+            wal: Optional[WalMeter]) -> Dict[str, Any]:
+    session = requests.Session()
+    session.headers.update(headers)
+    _edit(session, base_url, mode, cv, -1)  # warm-up: connection setup, first-request costs
+
+    latencies: List[float] = []
+    sizes: List[int] = []
+    errors = 0
+    if wal:
+        wal.start()
+    for i in range(edits):
+        start = time.perf_counter()
+        code, size = _edit(session, base_url, mode, cv, i)
+        latencies.append(time.perf_counter() - start)
+        sizes.append(size)
+        errors += code >= 400
+    wal_bytes = wal.stop() if wal else None
+
+    ordered = sorted(latencies)
+    return {
+        'edits': edits,
+        'errors': errors,
+        'request_bytes': round(statistics.mean(sizes)),
+        'median_ms': round(statistics.median(latencies) * 1000, 2),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))] * 1000, 2),
+        'wal_bytes_per_edit': round(wal_bytes / edits) if wal_bytes is not None else None,
+    }
+
+
+def run(base_url: str, sizes: List[str], edits: int = 200, db_url: Optional[str] = DATABASE_URL) -> Dict[str, Any]:
+    ctx = seed(base_url)
+    wal = WalMeter(db_url) if db_url else None
+    results: Dict[str, Dict[str, Any]] = {}
+    for size in sizes:
+        for mode in MODES:
+            case = f"{mode}.{size}"
+            results[case] = measure(base_url, mode, ctx['cvs'][(mode, size)], edits, ctx['headers'], wal)
+            print(f"  {case}: {results[case]['request_bytes']} B/edit, {results[case]['median_ms']} ms")
+    return {
+        'meta': {'url': base_url, 'edits': edits, 'wal_sampled': bool(db_url)},
+        'results': results,
+    }
+
+
+# ── Report ────────────────────────────────────────────────────────────────────
+
+def _delta(new: Optional[float], old: Optional[float]) -> str:
+    if not old or new is None:
+        return ''
+    return f" ({(new - old) / old * 100:+.0f}%)"
+
+
+def _print_report(results: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+    old = (baseline or {}).get('results', {})
+    print(f"\n{'case':<14}{'bytes/edit':>18}{'median ms':>16}{'p95 ms':>10}{'errors':>8}{'WAL B/edit':>18}")
+    for case, r in results['results'].items():
+        b = old.get(case, {})
+        size = f"{r['request_bytes']}{_delta(r['request_bytes'], b.get('request_bytes'))}"
+        median = f"{r['median_ms']:.1f}{_delta(r['median_ms'], b.get('median_ms'))}"
+        wal = '-' if r['wal_bytes_per_edit'] is None else \
+            f"{r['wal_bytes_per_edit']}{_delta(r['wal_bytes_per_edit'], b.get('wal_bytes_per_edit'))}"
+        print(f"{case:<14}{size:>18}{median:>16}{r['p95_ms']:>10.1f}{r['errors']:>8}{wal:>18}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark PUT vs JSON Patch autosaves")
+    parser.add_argument("--url", default="http://localhost:8000", help="Base URL of the running API")
+    parser.add_argument("--sizes", nargs="+", default=list(SIZES), choices=list(SIZES))
+    parser.add_argument("--edits", type=int, default=200, help="Edits per (mode, size)")
+    parser.add_argument("--db-url", default=DATABASE_URL, help="Database to read WAL positions from")
+    parser.add_argument("--no-db", action="store_true", help="Skip WAL measurement")
+    parser.add_argument("--json", dest="json_out", help="Write results as JSON to this path")
+    parser.add_argument("--baseline", help="Earlier --json output to compare against")
+    args = parser.parse_args()
+
+    results = run(args.url, args.sizes, args.edits, None if args.no_db else args.db_url)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    _print_report(results, baseline)
+    if args.json_out:
+        with open(args.json_out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results written to {args.json_out}")
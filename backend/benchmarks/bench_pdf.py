@@ -0,0 +1,238 @@
+"""
+PDF rendering benchmark: generate_cv_pdf across layouts and CV sizes.
+
+Builds synthetic CVs from small to extreme (up to 40 experiences with long
+descriptions, a large raw photo and many custom sections — see SIZES) and
+renders each one with every layout. Reports per (size, layout):
+  - render time (median / p95 over warm rounds)
+  - peak traced memory during one render (tracemalloc — Python allocations
+    only; Pillow's image buffers are not included)
+  - output size and page count
+With several --fonts, every case is also run per font family, so TrueType
+families from the font registry can be compared with the built-in fonts.
+
+Usage:
+    python -m benchmarks.bench_pdf                            # all sizes × layouts, 5 rounds
+    python -m benchmarks.bench_pdf --sizes small extreme --layouts modern
+    python -m benchmarks.bench_pdf --json pdf.json            # keep numbers for diffing between commits
+    python -m benchmarks.bench_pdf --baseline pdf.json        # print changes against an earlier run
+    python -m benchmarks.bench_pdf --fonts Helvetica "Inter, sans-serif" --sizes medium
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+import reportlab
+
+from app.utils.fonts import register_fonts, resolve_font_family
+from app.utils.pdf_generator import PDF_RENDERER_VERSION, generate_cv_pdf
+from benchmarks.synthetic_cvs import (
+    BULLETS, CITIES, COMPANIES, DEGREES, INSTITUTIONS, JOB_TITLES, SKILLS,
+    SPOKEN, SUMMARY_SENTENCES, generate_cv,
+)
+
+LAYOUTS = ('clean', 'modern', 'minimal', 'executive')
+
+# photo_px: edge of the raw (non-derivative) upload, 0 = no photo.
+# text_repeat: how many sentences each bullet / description is stretched to.
+SIZES = {
+    'small':   {'experiences': 2,  'bullets': 3,  'text_repeat': 1, 'custom_sections': 0,  'skills': 8,  'photo_px': 0},
+    'medium':  {'experiences': 6,  'bullets': 4,  'text_repeat': 1, 'custom_sections': 2,  'skills': 15, 'photo_px': 800},
+    'large':   {'experiences': 15, 'bullets': 6,  'text_repeat': 2, 'custom_sections': 6,  'skills': 30, 'photo_px': 2000},
+    'extreme': {'experiences': 40, 'bullets': 10, 'text_repeat': 4, 'custom_sections': 20, 'skills': 60, 'photo_px': 4000},
+}
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# ── CV generation ─────────────────────────────────────────────────────────────
+
+def _make_photo(photo_dir: str, px: int) -> str:
+    """Write a noisy px×px JPEG (compresses like a real photo) and return its URL path."""
+    from PIL import Image
+
+    path = os.path.join(photo_dir, f"photo_{px}.jpg")
+    if not os.path.exists(path):
+        Image.effect_noise((px, px), 48).convert('RGB').save(path, 'JPEG', quality=90)
+    return '/' + os.path.relpath(path, _BACKEND_DIR)
+
+
+def _text(rng: random.Random, pool: List[str], repeat: int) -> str:
+    return ' '.join(rng.choice(pool) for _ in range(repeat))
+
+
+def build_pdf_cv(size: str, lang: str = 'en', seed: int = 0, photo_url: str = '') -> Dict[str, Any]:
+    """cv_data in the shape generate_cv_pdf takes, scaled to SIZES[size]."""
+    spec = SIZES[size]
+    base = generate_cv(seed, lang)
+    rng = random.Random(f"pdf-{size}-{seed}-{lang}")
+    repeat = spec['text_repeat']
+
+    experience = []
+    for i in range(spec['experiences']):
+        end_year = 2025 - i
+        experience.append({
+            'role': rng.choice(JOB_TITLES[lang]),
+            'company': rng.choice(COMPANIES),
+            'location': rng.choice(CITIES[lang]),
+            'startDate': f"{end_year - 1}-{rng.randint(1, 12):02d}",
+            'endDate': '' if i == 0 else f"{end_year}-{rng.randint(1, 12):02d}",
+            'current': i == 0,
+            'description': '\n'.join(f"• {_text(rng, BULLETS[lang], repeat)}" for _ in range(spec['bullets'])),
+        })
+
+    n_small = max(1, spec['experiences'] // 4)
+    education = [{
+        'degree': rng.choice(DEGREES[lang]),
+        'institution': rng.choice(INSTITUTIONS[lang]),
+        'startDate': str(2010 - 3 * i),
+        'endDate': str(2013 - 3 * i),
+        'grade': '1.7',
+    } for i in range(n_small)]
+
+    return {
+        'personalInfo': {
+            **base['personalInfo'],
+            'title': base['personalInfo']['jobTitle'],
+            'linkedin': 'linkedin.com/in/example',
+            'website': 'example.com',
+            'summary': _text(rng, SUMMARY_SENTENCES[lang], 2 * repeat),
+            'photo': photo_url,
+        },
+        'experience': experience,
+        'education': education,
+        'skills': rng.sample(SKILLS * (spec['skills'] // len(SKILLS) + 1), spec['skills']),
+        'certifications': [{'name': f"Certification {i + 1}", 'issuer': rng.choice(COMPANIES), 'issueDate': '2021'}
+                           for i in range(n_small)],
+        'languages': [{'language': name, 'proficiency': level} for name, _, level in SPOKEN[lang]],
+        'projects': [{'name': f"Project {i + 1}", 'link': f"https://example.com/p{i + 1}",
+                      'description': _text(rng, BULLETS[lang], repeat)} for i in range(n_small)],
+        'interests': ['Chess', 'Running', 'Photography'][:n_small + 1],
+        'custom_sections': [{'title': f"Section {i + 1}", 'content': _text(rng, SUMMARY_SENTENCES[lang], 3 * repeat)}
+                            for i in range(spec['custom_sections'])],
+    }
+
+
+# ── Measurement ───────────────────────────────────────────────────────────────
+
+def _pages(pdf: bytes) -> int:
+    return len(re.findall(rb'/Type /Page\b', pdf))
+
+
+def measure(cv: Dict[str, Any], layout: str, rounds: int, font_family: str = 'Helvetica') -> Dict[str, Any]:
+    theme = {'layout': layout, 'primaryColor': '#2563eb', 'fontFamily': font_family}
+    pdf = generate_cv_pdf(cv, title='Benchmark', theme=theme)  # warm-up (imports, template, fonts)
+
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        generate_cv_pdf(cv, title='Benchmark', theme=theme)
+        samples.append(time.perf_counter() - start)
+
+    # Separate run: tracing slows rendering down several times
+    tracemalloc.start()
+    generate_cv_pdf(cv, title='Benchmark', theme=theme)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ordered = sorted(samples)
+    return {
+        'rounds': rounds,
+        'median_ms': round(statistics.median(samples) * 1000, 2),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))] * 1000, 2),
+        'peak_mem_kb': round(peak / 1024, 1),
+        'output_kb': round(len(pdf) / 1024, 1),
+        'pages': _pages(pdf),
+    }
+
+
+def run(sizes: List[str], layouts: List[str], rounds: int = 5, lang: str = 'en',
+        fonts: Optional[List[str]] = None) -> Dict[str, Any]:
+    fonts = fonts or ['Helvetica']
+    start = time.perf_counter()
+    register_fonts()  # one-time cost per process, paid at startup in the app
+    registry_ms = round((time.perf_counter() - start) * 1000, 2)
+    resolved = {f: resolve_font_family(f).regular for f in fonts}
+
+    photo_dir = tempfile.mkdtemp(prefix='bench_pdf_', dir=os.path.join(_BACKEND_DIR, 'cache'))
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        for size in sizes:
+            px = SIZES[size]['photo_px']
+            cv = build_pdf_cv(size, lang, photo_url=_make_photo(photo_dir, px) if px else '')
+            for layout in layouts:
+                for font in fonts:
+                    case = f"{size}.{layout}" if len(fonts) == 1 else f"{size}.{layout}.{resolved[font]}"
+                    results[case] = measure(cv, layout, rounds, font)
+                    print(f"  {case}: {results[case]['median_ms']} ms")
+    finally:
+        shutil.rmtree(photo_dir, ignore_errors=True)
+
+    return {
+        'meta': {
+            'renderer_version': PDF_RENDERER_VERSION,
+            'reportlab': reportlab.Version,
+            'python': platform.python_version(),
+            'rounds': rounds,
+            'lang': lang,
+            'sizes': {s: SIZES[s] for s in sizes},
+            'fonts': resolved,
+            'font_registry_ms': registry_ms,
+        },
+        'results': results,
+    }
+
+
+# ── Report ────────────────────────────────────────────────────────────────────
+
+def _delta(new: float, old: Optional[float]) -> str:
+    if not old:
+        return ''
+    return f" ({(new - old) / old * 100:+.0f}%)"
+
+
+def _print_report(results: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+    old = (baseline or {}).get('results', {})
+    print(f"\nFont registry load: {results['meta'].get('font_registry_ms', 0)} ms (once per process)")
+    print(f"\n{'case':<34}{'median ms':>18}{'p95 ms':>10}{'peak KB':>18}{'output KB':>16}{'pages':>7}")
+    for case, r in results['results'].items():
+        b = old.get(case, {})
+        median = f"{r['median_ms']:.1f}{_delta(r['median_ms'], b.get('median_ms'))}"
+        peak = f"{r['peak_mem_kb']:.0f}{_delta(r['peak_mem_kb'], b.get('peak_mem_kb'))}"
+        out = f"{r['output_kb']:.1f}{_delta(r['output_kb'], b.get('output_kb'))}"
+        print(f"{case:<34}{median:>18}{r['p95_ms']:>10.1f}{peak:>18}{out:>16}{r['pages']:>7}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark PDF rendering across layouts and CV sizes")
+    parser.add_argument("--sizes", nargs="+", default=list(SIZES), choices=list(SIZES))
+    parser.add_argument("--layouts", nargs="+", default=list(LAYOUTS), choices=LAYOUTS)
+    parser.add_argument("--rounds", type=int, default=5, help="Timed renders per case (after one warm-up)")
+    parser.add_argument("--lang", default='en', choices=('en', 'de', 'fr'), help="Language of the synthetic CVs")
+    parser.add_argument("--fonts", nargs="+", default=['Helvetica'], help="Theme fontFamily values (CSS font stacks)")
+    parser.add_argument("--json", dest="json_out", help="Write results as JSON to this path")
+    parser.add_argument("--baseline", help="Earlier --json output to compare against")
+    args = parser.parse_args()
+
+    os.makedirs(os.path.join(_BACKEND_DIR, 'cache'), exist_ok=True)
+    results = run(args.sizes, args.layouts, args.rounds, args.lang, args.fonts)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    _print_report(results, baseline)
+    if args.json_out:
+        with open(args.json_out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results written to {args.json_out}")
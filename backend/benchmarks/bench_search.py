@@ -0,0 +1,251 @@
+"""
+Admin search benchmark: sequential scans against the pg_trgm / skill GIN indexes.
+
+Seeds a PostgreSQL database with a large synthetic population (1M users and
+200k CVs by default, generated server-side with generate_series) and times
+the queries behind GET /api/admin/users?search= and GET /api/admin/cvs/search,
+first with the search indexes dropped, then with them built. Reports per
+(query, phase):
+  - median / p95 latency of the first page (LIMIT 51, newest first)
+  - median latency of the exact match count the user list also runs
+  - the scan the planner chose (EXPLAIN)
+
+The queries are built with the same helpers the routes use (app.utils.search).
+Indexes are dropped during the run, so point it at a scratch database; they
+are recreated afterwards even on failure. Seeded rows use the
+@search-bench.invalid email domain and are reused by later runs; --cleanup
+deletes them.
+
+Usage:
+    python -m benchmarks.bench_search --db-url postgresql://localhost/cv_bench
+    python -m benchmarks.bench_search --db-url ... --users 200000 --cvs 50000 --repeat 10
+    python -m benchmarks.bench_search --db-url ... --json search.json       # keep numbers for diffing
+    python -m benchmarks.bench_search --db-url ... --baseline search.json   # print changes against an earlier run
+    python -m benchmarks.bench_search --db-url ... --cleanup                # delete the seeded rows
+"""
+
+import argparse
+import json
+import statistics
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.engine import Engine
+
+from app.database import Base
+from app.models import CV, User
+from app.utils.search import SEARCH_DDL, SEARCH_INDEXES, cv_skill_filter, cv_skill_names, user_search_filter
+from benchmarks.synthetic_cvs import FIRST_NAMES, LAST_NAMES, SKILLS
+
+DOMAIN = 'search-bench.invalid'
+# Skills only about 1 in 2000 CVs list: the selective case an index is for
+RARE_SKILLS = ['COBOL', 'Fortran', 'Erlang', 'Prolog']
+
+CASES = {
+    'user_email':  ('users', lambda: user_search_filter('4821@')),          # ~1 in 10,000 users
+    'user_name':   ('users', lambda: user_search_filter('schmidt')),        # common surname
+    'skill_all':   ('cvs',   lambda: cv_skill_filter(['python', 'docker'], 'all')),
+    'skill_rare':  ('cvs',   lambda: cv_skill_filter(['cobol', 'erlang'], 'any')),
+}
+PHASES = ('seq', 'gin')
+
+
+# ── Setup ─────────────────────────────────────────────────────────────────────
+
+def ensure_schema(engine: Engine) -> None:
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for statement in SEARCH_DDL:
+            conn.execute(text(statement))
+
+
+def seed(engine: Engine, users: int, cvs: int) -> None:
+    """Top up the benchmark population to users / cvs rows (server-side, one statement each)."""
+    with engine.begin() as conn:
+        conn.execute(text("SET LOCAL statement_timeout = 0"))
+        have = conn.execute(text("SELECT count(*) FROM users WHERE email LIKE :pattern"),
+                            {'pattern': f"%@{DOMAIN}"}).scalar()
+        if have < users:
+            print(f"  seeding {users - have} users...")
+            conn.execute(text("""
+                INSERT INTO users (name, email, hashed_password, is_active, is_superuser, ai_access,
+                                   failed_login_attempts, created_at, updated_at)
+                SELECT (CAST(:first AS text[]))[1 + (g * 7) % cardinality(CAST(:first AS text[]))] || ' ' ||
+                       (CAST(:last AS text[]))[1 + (g * 13) % cardinality(CAST(:last AS text[]))],
+                       'user' || g || '@' || :domain, 'x', TRUE, FALSE, TRUE, 0,
+                       NOW() - g * INTERVAL '1 minute', NOW()
+                FROM generate_series(:start, :stop) AS g
+            """), {'first': FIRST_NAMES, 'last': LAST_NAMES, 'domain': DOMAIN,
+                   'start': have + 1, 'stop': users})
+
+        have_cvs = conn.execute(text(
+            "SELECT count(*) FROM cvs JOIN users ON users.id = cvs.user_id WHERE users.email LIKE :pattern"
+        ), {'pattern': f"%@{DOMAIN}"}).scalar()
+        if have_cvs < cvs:
+            print(f"  seeding {cvs - have_cvs} CVs...")
+            conn.execute(text("""
+                WITH owners AS (SELECT array_agg(id) AS ids FROM users WHERE email LIKE :pattern)
+                INSERT INTO cvs (user_id, title, skills, current_version, is_active, created_at, updated_at)
+                SELECT owners.ids[1 + g % cardinality(owners.ids)], 'Bench CV ' || g,
+                       COALESCE((SELECT jsonb_agg(jsonb_build_object('name', s, 'level', ''))
+                                 FROM unnest(CAST(:skills AS text[])) AS s
+                                 WHERE random() < 0.2 AND g IS NOT NULL), '[]'::jsonb)  -- uses g: drawn per row
+                       || CASE WHEN g % 2000 = 0
+                               THEN jsonb_build_array((CAST(:rare AS text[]))[1 + (g / 2000) % cardinality(CAST(:rare AS text[]))])
+                               ELSE '[]'::jsonb END,
+                       1, TRUE, NOW() - g * INTERVAL '1 minute', NOW() - g * INTERVAL '1 minute'
+                FROM owners, generate_series(:start, :stop) AS g
+            """), {'pattern': f"%@{DOMAIN}", 'skills': SKILLS, 'rare': RARE_SKILLS,
+                   'start': have_cvs + 1, 'stop': cvs})
+
+
+def cleanup(engine: Engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(text("SET LOCAL statement_timeout = 0"))
+        conn.execute(text("DELETE FROM cvs WHERE user_id IN (SELECT id FROM users WHERE email LIKE :pattern)"),
+                     {'pattern': f"%@{DOMAIN}"})
+        deleted = conn.execute(text("DELETE FROM users WHERE email LIKE :pattern"), {'pattern': f"%@{DOMAIN}"})
+    print(f"✅ Deleted {deleted.rowcount} benchmark users and their CVs")
+
+
+def set_indexes(engine: Engine, present: bool) -> None:
+    with engine.begin() as conn:
+        conn.execute(text("SET LOCAL statement_timeout = 0"))
+        for name, create in SEARCH_INDEXES.items():
+            conn.execute(text(create if present else f"DROP INDEX IF EXISTS {name}"))
+        conn.execute(text("ANALYZE users"))
+        conn.execute(text("ANALYZE cvs"))
+
+
+# ── Measurement ───────────────────────────────────────────────────────────────
+
+def _queries(case: str):
+    """(first page, count) statements for a case, shaped like the admin routes."""
+    table, condition = CASES[case]
+    if table == 'users':
+        page = select(User.id, User.name, User.email).where(condition()) \
+            .order_by(User.created_at.desc(), User.id.desc()).limit(51)
+        count = select(func.count()).select_from(User).where(condition())
+    else:
+        page = select(CV.id, CV.title, User.email, cv_skill_names()).join(User, User.id == CV.user_id) \
+            .where(condition()).order_by(CV.updated_at.desc(), CV.id.desc()).limit(51)
+        count = select(func.count()).select_from(CV).where(condition())
+    return page, count
+
+
+def _scan(conn, statement) -> str:
+    """Scan node types the planner picked, e.g. 'Bitmap Index Scan' or 'Seq Scan'."""
+    compiled = statement.compile(dialect=conn.dialect)
+    plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    plan = plan if isinstance(plan, list) else json.loads(plan)
+    scans: List[str] = []
+
+    def walk(node: Dict[str, Any]) -> None:
+        if node['Node Type'].endswith('Scan') and node.get('Relation Name', node.get('Index Name')) \
+                and node['Node Type'] not in scans:
+            scans.append(node['Node Type'])
+        for child in node.get('Plans', []):
+            walk(child)
+
+    walk(plan[0]['Plan'])
+    return ', '.join(scans)
+
+
+def _timed(conn, statement, repeat: int) -> List[float]:
+    conn.execute(statement).all()  # warm-up: plan, cache the pages
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(statement).all()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def measure(engine: Engine, case: str, repeat: int) -> Dict[str, Any]:
+    page, count = _queries(case)
+    with engine.connect() as conn:
+        conn.execute(text("SET statement_timeout = 0"))
+        page_times = sorted(_timed(conn, page, repeat))
+        count_times = _timed(conn, count, max(1, repeat // 4))
+        matches = conn.execute(count).scalar()
+        scan = _scan(conn, page)
+    return {
+        'matches': matches,
+        'median_ms': round(statistics.median(page_times) * 1000, 2),
+        'p95_ms': round(page_times[min(len(page_times) - 1, int(round(0.95 * (len(page_times) - 1))))] * 1000, 2),
+        'count_ms': round(statistics.median(count_times) * 1000, 2),
+        'scan': scan,
+    }
+
+
+def run(db_url: str, users: int = 1_000_000, cvs: int = 200_000, repeat: int = 20,
+        cases: Optional[List[str]] = None) -> Dict[str, Any]:
+    engine = create_engine(db_url)
+    ensure_schema(engine)
+    seed(engine, users, cvs)
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        for phase in PHASES:
+            print(f"  {'dropping' if phase == 'seq' else 'building'} search indexes...")
+            set_indexes(engine, present=phase == 'gin')
+            for case in cases or list(CASES):
+                key = f"{case}.{phase}"
+                results[key] = measure(engine, case, repeat)
+                print(f"  {key}: {results[key]['median_ms']} ms ({results[key]['scan']})")
+    finally:
+        set_indexes(engine, present=True)
+    return {
+        'meta': {'users': users, 'cvs': cvs, 'repeat': repeat},
+        'results': results,
+    }
+
+
+# ── Report ────────────────────────────────────────────────────────────────────
+
+def _delta(new: Optional[float], old: Optional[float]) -> str:
+    if not old or new is None:
+        return ''
+    return f" ({(new - old) / old * 100:+.0f}%)"
+
+
+def _print_report(results: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+    old = (baseline or {}).get('results', {})
+    res = results['results']
+    print(f"\n{'case':<18}{'matches':>10}{'median ms':>18}{'p95 ms':>10}{'count ms':>18}{'speedup':>9}  scan")
+    for case, r in res.items():
+        b = old.get(case, {})
+        median = f"{r['median_ms']:.1f}{_delta(r['median_ms'], b.get('median_ms'))}"
+        count = f"{r['count_ms']:.1f}{_delta(r['count_ms'], b.get('count_ms'))}"
+        seq = res.get(case.rsplit('.', 1)[0] + '.seq')
+        speedup = f"{seq['median_ms'] / r['median_ms']:.1f}x" if seq and case.endswith('.gin') and r['median_ms'] else ''
+        print(f"{case:<18}{r['matches']:>10}{median:>18}{r['p95_ms']:>10.1f}{count:>18}{speedup:>9}  {r['scan']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark admin user / CV skill search with and without GIN indexes")
+    parser.add_argument("--db-url", required=True, help="Scratch PostgreSQL database (indexes are dropped during the run)")
+    parser.add_argument("--users", type=int, default=1_000_000, help="Users to seed")
+    parser.add_argument("--cvs", type=int, default=200_000, help="CVs to seed")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per query")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES))
+    parser.add_argument("--cleanup", action="store_true", help="Delete the seeded rows and exit")
+    parser.add_argument("--json", dest="json_out", help="Write results as JSON to this path")
+    parser.add_argument("--baseline", help="Earlier --json output to compare against")
+    args = parser.parse_args()
+
+    if args.cleanup:
+        cleanup(create_engine(args.db_url))
+        raise SystemExit(0)
+
+    results = run(args.db_url, args.users, args.cvs, args.repeat, args.cases)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    _print_report(results, baseline)
+    if args.json_out:
+        with open(args.json_out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results written to {args.json_out}")
@@ -0,0 +1,270 @@
+"""
+Deterministic synthetic CV generator.
+Builds English, German and French CVs together with their ground-truth
+structured data and writes them as plain text, DOCX (python-docx) and PDF
+(reportlab). The same seed always produces the same corpus, so parser
+timings and accuracy can be compared between commits.
+
+Usage:
+    python -m benchmarks.synthetic_cvs --out /tmp/cv_corpus --count 60
+    python -m benchmarks.synthetic_cvs --out /tmp/cv_corpus --langs de fr --formats pdf
+"""
+
+import argparse
+import json
+import os
+import random
+from typing import Any, Dict, List
+
+LANGUAGES = ('en', 'de', 'fr')
+FORMATS = ('txt', 'docx', 'pdf')
+
+FIRST_NAMES = ['Anna', 'Lukas', 'Marie', 'Jonas', 'Sophie', 'Elias', 'Camille', 'Louis',
+               'Emma', 'Noah', 'Clara', 'Felix', 'Julia', 'Paul', 'Léa', 'Hugo']
+LAST_NAMES = ['Müller', 'Schmidt', 'Fischer', 'Weber', 'Martin', 'Bernard', 'Dubois',
+              'Smith', 'Johnson', 'Brown', 'Wagner', 'Becker', 'Moreau', 'Laurent']
+CITIES = {
+    'en': ['London, United Kingdom', 'Manchester, United Kingdom', 'Dublin, Ireland', 'Boston, Massachusetts'],
+    'de': ['Berlin, Deutschland', 'Hamburg, Deutschland', 'Wien, Österreich', 'Zürich, Schweiz'],
+    'fr': ['Paris, France', 'Lyon, France', 'Bordeaux, France', 'Genève, Suisse'],
+}
+JOB_TITLES = {
+    'en': ['Software Engineer', 'Data Analyst', 'Project Manager', 'Database Administrator', 'DevOps Engineer'],
+    'de': ['Softwareentwickler', 'Datenanalyst', 'Projektleiter', 'Datenbankadministrator', 'Systemingenieur'],
+    'fr': ['Ingénieur Logiciel', 'Analyste de Données', 'Chef de Projet', 'Administrateur de Bases', 'Ingénieur DevOps'],
+}
+COMPANIES = ['Acme Systems GmbH', 'Northwind Ltd', 'Globex AG', 'Initech SARL', 'Umbrella Data',
+             'Blue Harbor Tech', 'Contoso Solutions', 'Lumen Analytics', 'Helix Software']
+DEGREES = {
+    'en': ['Bachelor of Science', 'Master of Science', 'MBA', 'Bachelor of Arts'],
+    'de': ['Bachelor Informatik', 'Master Wirtschaftsinformatik', 'Diplom Ingenieur', 'Master Data Science'],
+    'fr': ['Licence Informatique', 'Master Informatique', 'Diplôme Ingénieur', 'Master Data Science'],
+}
+INSTITUTIONS = {
+    'en': ['University of Manchester', 'Trinity College Dublin', 'Boston University', 'Imperial College London'],
+    'de': ['Technische Universität München', 'Universität Hamburg', 'Hochschule Darmstadt', 'Universität Wien'],
+    'fr': ['Université Paris-Saclay', 'École Polytechnique', 'Université de Lyon', 'INSA Lyon'],
+}
+SKILLS = ['Python', 'SQL', 'PostgreSQL', 'Docker', 'Kubernetes', 'Java', 'TypeScript', 'React',
+          'AWS', 'Terraform', 'Git', 'Linux', 'Pandas', 'Power BI', 'Scrum', 'FastAPI', 'Redis']
+SKILL_LABELS = {'en': 'Technologies', 'de': 'Technologien', 'fr': 'Outils'}
+SPOKEN = {
+    'en': [('English', 'Native', 'Native'), ('German', 'Fluent', 'Fluent'), ('Spanish', 'Basic', 'Basic')],
+    'de': [('Deutsch', 'Muttersprache', 'Native'), ('Englisch', 'Verhandlungssicher', 'Fluent'),
+           ('Spanisch', 'Grundkenntnisse', 'Basic')],
+    'fr': [('Francais', 'Native', 'Native'), ('Anglais', 'C1', 'Fluent'), ('Allemand', 'B2', 'Advanced')],
+}
+HEADERS = {
+    'en': {'summary': 'Profile', 'experience': 'Professional Experience', 'education': 'Education',
+           'skills': 'Skills', 'languages': 'Languages'},
+    'de': {'summary': 'Profil', 'experience': 'Berufserfahrung', 'education': 'Ausbildung',
+           'skills': 'Kenntnisse', 'languages': 'Sprachkenntnisse'},
+    'fr': {'summary': 'Profil professionnel', 'experience': 'Expérience professionnelle',
+           'education': 'Formation', 'skills': 'Compétences', 'languages': 'Langues'},
+}
+PRESENT = {'en': 'Present', 'de': 'heute', 'fr': 'présent'}
+SUMMARY_SENTENCES = {
+    'en': ['Experienced engineer with a focus on reliable data platforms.',
+           'Comfortable leading small teams and mentoring juniors.',
+           'Strong background in cloud infrastructure and automation.'],
+    'de': ['Erfahrener Entwickler mit Schwerpunkt auf zuverlässigen Datenplattformen.',
+           'Verantwortlich für die Planung und Umsetzung von Projekten.',
+           'Langjährige Erfahrung in der Entwicklung von Cloud-Anwendungen.'],
+    'fr': ['Ingénieur expérimenté spécialisé dans les plateformes de données.',
+           'Habitué à piloter des équipes et à accompagner les juniors.',
+           'Solide expérience des infrastructures cloud et de l\'automatisation.'],
+}
+BULLETS = {
+    'en': ['Designed and maintained ETL pipelines for reporting', 'Reduced query latency by tuning indexes',
+           'Migrated services to containers on Kubernetes', 'Introduced automated testing in CI',
+           'Coordinated releases with product and QA teams'],
+    'de': ['Entwicklung und Wartung von ETL-Prozessen', 'Optimierung von Datenbankabfragen und Indizes',
+           'Migration von Diensten auf Kubernetes', 'Einführung automatisierter Tests in der CI',
+           'Abstimmung von Releases mit Fachbereichen'],
+    'fr': ['Conception et maintenance de pipelines ETL', 'Optimisation des requêtes et des index',
+           'Migration des services vers Kubernetes', 'Mise en place de tests automatisés',
+           'Coordination des livraisons avec les équipes produit'],
+}
+
+
+# ── Ground truth ──────────────────────────────────────────────────────────────
+
+def _iso(year_month, with_month: bool = True) -> str:
+    """(2022, 6) → '2022-06' (or '2022' when the CV only states the year)."""
+    year, month = year_month
+    return f"{year}-{month:02d}" if with_month else str(year)
+
+
+def generate_cv(seed: int, lang: str) -> Dict[str, Any]:
+    """Return the ground-truth structured data for one synthetic CV."""
+    rng = random.Random(f"{seed}-{lang}")
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    name = f"{first} {last}"
+    email_user = f"{first}.{last}".lower().encode('ascii', 'ignore').decode()
+    phone_cc = {'en': '+44', 'de': '+49', 'fr': '+33'}[lang]
+    phone = f"{phone_cc} {rng.randint(100, 999)} {rng.randint(1000000, 9999999)}"
+
+    # Experiences, newest first, non-overlapping
+    experiences = []
+    year, month = 2025, rng.randint(1, 12)
+    for i in range(rng.randint(2, 4)):
+        end = None if i == 0 and rng.random() < 0.5 else (year, month)
+        length = rng.randint(12, 40)
+        total = year * 12 + (month - 1) - length
+        start = (total // 12, total % 12 + 1)
+        # Most CVs give month and year, some only the year
+        with_month = rng.random() < 0.7
+        experiences.append({
+            'role': rng.choice(JOB_TITLES[lang]),
+            'company': rng.choice(COMPANIES),
+            'location': rng.choice(CITIES[lang]),
+            'startDate': _iso(start, with_month),
+            'endDate': _iso(end, with_month) if end else '',
+            'current': end is None,
+            'bullets': rng.sample(BULLETS[lang], rng.randint(2, 4)),
+        })
+        total -= rng.randint(1, 6)
+        year, month = total // 12, total % 12 + 1
+
+    education = []
+    edu_end = year
+    for _ in range(rng.randint(1, 2)):
+        start_year = edu_end - rng.randint(2, 4)
+        education.append({
+            'degree': rng.choice(DEGREES[lang]),
+            'institution': rng.choice(INSTITUTIONS[lang]),
+            'startDate': _iso((start_year, 10)),
+            'endDate': _iso((edu_end, 9)),
+        })
+        edu_end = start_year
+
+    spoken = rng.sample(SPOKEN[lang], rng.randint(2, 3))
+    return {
+        'id': f"{lang}_{seed:04d}",
+        'lang': lang,
+        'personalInfo': {
+            'name': name,
+            'jobTitle': experiences[0]['role'],
+            'email': f"{email_user}@example.com",
+            'phone': phone,
+            'location': rng.choice(CITIES[lang]),
+        },
+        'summary': ' '.join(rng.sample(SUMMARY_SENTENCES[lang], 2)),
+        'experience': experiences,
+        'education': education,
+        'skills': rng.sample(SKILLS, rng.randint(5, 10)),
+        'languages': [{'language': n, 'level_text': t, 'proficiency': p} for n, t, p in spoken],
+    }
+
+
+# ── Rendering ─────────────────────────────────────────────────────────────────
+
+def _fmt_date(iso: str) -> str:
+    """'2022-06' → '06/2022', '2022' → '2022' — the formats the parser recognises."""
+    if len(iso) == 7:
+        return f"{iso[5:]}/{iso[:4]}"
+    return iso
+
+
+def render_lines(cv: Dict[str, Any]) -> List[str]:
+    """Lay out a ground-truth CV as text lines in the shape real CVs usually have."""
+    lang = cv['lang']
+    pi = cv['personalInfo']
+    h = HEADERS[lang]
+    lines = [
+        pi['name'],
+        pi['jobTitle'],
+        f"{pi['email']} | {pi['phone']} | {pi['location']}",
+        '',
+        h['summary'].upper(),
+        cv['summary'],
+        '',
+        h['experience'].upper(),
+    ]
+    for exp in cv['experience']:
+        end = PRESENT[lang] if exp['current'] else _fmt_date(exp['endDate'])
+        lines.append(f"{exp['role']}, {exp['company']} {_fmt_date(exp['startDate'])} – {end}")
+        lines.append(exp['location'])
+        lines.extend(f"• {b}" for b in exp['bullets'])
+        lines.append('')
+    lines.append(h['education'].upper())
+    for edu in cv['education']:
+        lines.append(f"{edu['degree']}, {edu['institution']} "
+                     f"{_fmt_date(edu['startDate'])} – {_fmt_date(edu['endDate'])}")
+    lines += ['', h['skills'].upper(), f"{SKILL_LABELS[lang]}: {', '.join(cv['skills'])}", '',
+              h['languages'].upper()]
+    lines.extend(f"{l['language']} – {l['level_text']}" for l in cv['languages'])
+    return lines
+
+
+def write_txt(cv: Dict[str, Any], path: str) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(render_lines(cv)) + '\n')
+
+
+def write_docx(cv: Dict[str, Any], path: str) -> None:
+    from docx import Document
+
+    doc = Document()
+    for line in render_lines(cv):
+        if line:
+            doc.add_paragraph(line)
+    doc.save(path)
+
+
+def write_pdf(cv: Dict[str, Any], path: str) -> None:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import cm
+    from reportlab.pdfgen import canvas
+
+    c = canvas.Canvas(path, pagesize=A4, invariant=1)
+    width, height = A4
+    y = height - 2 * cm
+    for line in render_lines(cv):
+        if y < 2 * cm:
+            c.showPage()
+            y = height - 2 * cm
+        if line:
+            c.setFont('Helvetica', 10)
+            c.drawString(2 * cm, y, line)
+        y -= 14
+    c.save()
+
+
+WRITERS = {'txt': write_txt, 'docx': write_docx, 'pdf': write_pdf}
+
+
+def build_corpus(out_dir: str, count: int = 30, seed: int = 0, langs=LANGUAGES, formats=FORMATS) -> str:
+    """
+    Write count CVs per language in every format plus ground_truth.json.
+    Returns the path of the ground-truth file.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    entries = []
+    for lang in langs:
+        for i in range(count):
+            cv = generate_cv(seed + i, lang)
+            files = {}
+            for fmt in formats:
+                filename = f"{cv['id']}.{fmt}"
+                WRITERS[fmt](cv, os.path.join(out_dir, filename))
+                files[fmt] = filename
+            entries.append({'truth': cv, 'files': files})
+
+    truth_path = os.path.join(out_dir, 'ground_truth.json')
+    with open(truth_path, 'w', encoding='utf-8') as f:
+        json.dump({'seed': seed, 'count': count, 'cvs': entries}, f, ensure_ascii=False, indent=1)
+    return truth_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic multilingual CV corpus")
+    parser.add_argument("--out", required=True, help="Output directory")
+    parser.add_argument("--count", type=int, default=30, help="CVs per language")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed")
+    parser.add_argument("--langs", nargs="+", default=list(LANGUAGES), choices=LANGUAGES)
+    parser.add_argument("--formats", nargs="+", default=list(FORMATS), choices=FORMATS)
+    args = parser.parse_args()
+
+    path = build_corpus(args.out, args.count, args.seed, args.langs, args.formats)
+    print(f"✅ Wrote {args.count * len(args.langs)} CVs × {len(args.formats)} formats — ground truth: {path}")
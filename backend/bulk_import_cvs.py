@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Bulk-import CV files (PDF/DOCX/TXT) from a ZIP archive or a directory.
+Files are parsed in parallel and one CV row is created per file.
+
+Usage:
+    python bulk_import_cvs.py cvs.zip --user-id 3
+    python bulk_import_cvs.py ./onboarding/acme --user-id 3 --workers 8
+    python bulk_import_cvs.py cvs.zip --user-id 3 --batch-size 100
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+from app.database import SessionLocal
+from app.models import User
+from app.utils.bulk_import import BulkImportError, collect_files, extract_zip, run_bulk_import
+
+
+def bulk_import(source: str, user_id: int, workers: int = None, batch_size: int = None) -> int:
+    """Import all CV files under source for user_id. Returns the number of failed files."""
+    db = SessionLocal()
+    try:
+        if not db.query(User).filter(User.id == user_id).first():
+            print(f"❌ User {user_id} does not exist")
+            return 1
+    finally:
+        db.close()
+
+    work_dir = None
+    try:
+        if os.path.isdir(source):
+            file_paths = collect_files(source)
+        else:
+            work_dir = tempfile.mkdtemp(prefix="bulk_import_")
+            file_paths = extract_zip(source, work_dir)
+
+        failed = 0
+        for event in run_bulk_import(file_paths, user_id, workers=workers, batch_size=batch_size):
+            if event['event'] == 'start':
+                print(f"📂 Found {event['total']} file(s)")
+            elif event['event'] == 'file':
+                progress = f"[{event['processed']}/{len(file_paths)}]"
+                if event['status'] == 'ok':
+                    print(f"{progress} ✅ {event['file']} → CV {event['cv_id']}")
+                else:
+                    print(f"{progress} ❌ {event['file']}: {event['error']}")
+            elif event['event'] == 'done':
+                failed = event['failed']
+                print(f"\n✅ Imported {event['imported']} CV(s), {failed} failed in {event['elapsed_seconds']}s")
+        return failed
+    except BulkImportError as e:
+        print(f"❌ {e}")
+        return 1
+    finally:
+        if work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-import CV files for a user")
+    parser.add_argument("source", help="ZIP archive or directory containing CV files")
+    parser.add_argument("--user-id", type=int, required=True, help="Owner of the imported CVs")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=None, help="CV rows committed per batch")
+
+    args = parser.parse_args()
+
+    print("🚀 Starting bulk CV import...")
+    print("-" * 50)
+    failures = bulk_import(args.source, args.user_id, workers=args.workers, batch_size=args.batch_size)
+    print("-" * 50)
+    print("✨ Done!")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Compact the version history of every CV (or some): merge bursts of old
+autosaves, cap the number of versions per CV and re-encode the rest as
+keyframes + deltas. The API already compacts a CV in the background whenever
+it writes a keyframe; run this from cron to sweep CVs that went quiet.
+Safe to run multiple times.
+
+Usage:
+    python compact_cv_versions.py
+    python compact_cv_versions.py --cv-id 12 --cv-id 40
+"""
+
+import argparse
+
+from sqlalchemy import distinct
+
+from app.database import SessionLocal
+from app.models import CVVersion
+from app.utils.cv_versions import VersionChainError, compact_versions
+
+
+def compact(cv_ids=None) -> None:
+    db = SessionLocal()
+    try:
+        if not cv_ids:
+            cv_ids = [row[0] for row in db.query(distinct(CVVersion.cv_id)).order_by(CVVersion.cv_id).all()]
+        total_removed = failed = 0
+        for cv_id in cv_ids:
+            try:
+                kept, removed = compact_versions(db, cv_id)
+            except (VersionChainError, ValueError) as e:
+                db.rollback()
+                print(f"❌ CV {cv_id}: {e}")
+                failed += 1
+                continue
+            total_removed += removed
+            if removed:
+                print(f"✅ CV {cv_id}: kept {kept}, removed {removed}")
+        print(f"\n✅ {len(cv_ids)} CV(s) checked, {total_removed} version(s) removed, {failed} failed")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compact CV version history")
+    parser.add_argument("--cv-id", type=int, action="append", help="Only this CV (repeatable)")
+    args = parser.parse_args()
+
+    print("🚀 Compacting CV version history...")
+    print("-" * 50)
+    compact(args.cv_id)
+    print("-" * 50)
+    print("✨ Done!")
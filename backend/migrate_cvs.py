@@ -1,44 +1,50 @@
 #!/usr/bin/env python3
 """
-Migration script to add new columns to the CVs table.
-This adds the basic info columns and other new fields.
+Apply pending database migrations (app/db_migrate.py) and show the ledger.
+The API does the same on startup; run this to migrate ahead of a deploy or
+to see what is applied. Its former CV column additions are now migration
+0002_cvs_basic_info_columns. Safe to run multiple times and alongside
+running servers (an advisory lock lets one process migrate at a time).
+
+Usage:
+    python migrate_cvs.py
+    python migrate_cvs.py --status
 """
 
-from sqlalchemy import text
-from app.database import engine
-
-def migrate_cvs_table():
-    """Add new columns to the CVs table."""
-    
-    with engine.begin() as connection:
-        # List of columns to add with their definitions
-        columns_to_add = [
-            ("full_name", "VARCHAR(150)"),
-            ("email", "VARCHAR(150)"),
-            ("phone", "VARCHAR(50)"),
-            ("location", "VARCHAR(150)"),
-            ("linkedin_url", "TEXT"),
-            ("profile_summary", "TEXT"),
-            ("current_version", "INTEGER DEFAULT 1"),
-        ]
-        
-        for col_name, col_type in columns_to_add:
-            try:
-                print(f"Adding column: {col_name}...", end=" ")
-                query = f"ALTER TABLE cvs ADD COLUMN {col_name} {col_type};"
-                connection.execute(text(query))
-                print("✅")
-            except Exception as e:
-                if "already exists" in str(e):
-                    print("⚠️  (already exists)")
-                else:
-                    print(f"❌ {str(e)}")
-        
-        print("\n✅ Migration completed successfully!")
+import argparse
+
+from app.db_migrate import MIGRATIONS, pending_migrations, run_migrations
+
+
+def show_status() -> None:
+    pending = {m.id for m in pending_migrations()}
+    for m in MIGRATIONS:
+        mark = "⏳" if m.id in pending else "✅"
+        optional = "" if m.required else " (optional)"
+        print(f"{mark} {m.id}{optional}: {m.description}")
+    print(f"\n{len(MIGRATIONS) - len(pending)} applied, {len(pending)} pending")
+
+
+def migrate() -> None:
+    applied = run_migrations()
+    for migration_id in applied:
+        print(f"✅ {migration_id}")
+    still_pending = pending_migrations()
+    for m in still_pending:
+        print(f"❌ {m.id} not applied (see the log above)")
+    print(f"\n✅ {len(applied)} migration(s) applied, {len(still_pending)} pending")
+
 
 if __name__ == "__main__":
-    print("🚀 Starting CVs table migration...")
+    parser = argparse.ArgumentParser(description="Apply pending database migrations")
+    parser.add_argument("--status", action="store_true", help="Only list applied and pending migrations")
+    args = parser.parse_args()
+
+    print("🚀 Database migrations...")
     print("-" * 50)
-    migrate_cvs_table()
+    if args.status:
+        show_status()
+    else:
+        migrate()
     print("-" * 50)
     print("✨ Done!")
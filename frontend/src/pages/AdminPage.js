@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { adminAPI } from '../services/api';
 import { useAuthStore } from '../store/authStore';
@@ -155,6 +155,8 @@ const UsersTab = ({ currentUser, show }) => {
     const [total, setTotal] = useState(0);
     const [pages, setPages] = useState(1);
     const [page, setPage] = useState(1);
+    const [hasNext, setHasNext] = useState(false);
+    const cursors = useRef([null]); // cursors.current[p - 1] opens page p
     const [search, setSearch] = useState('');
     const [statusFilter, setStatusFilter] = useState('');
     const [loading, setLoading] = useState(true);
@@ -167,10 +169,12 @@ const UsersTab = ({ currentUser, show }) => {
     const load = useCallback(async () => {
         setLoading(true);
         try {
-            const res = await adminAPI.getUsers({ page, limit: 50, search: search || undefined, status: statusFilter || undefined });
+            const res = await adminAPI.getUsers({ cursor: cursors.current[page - 1] || undefined, limit: 50, search: search || undefined, status: statusFilter || undefined });
             setUsers(res.data.users);
-            setTotal(res.data.total);
+            setTotal(res.data.total_estimated ? `~${res.data.total}` : res.data.total);
             setPages(res.data.pages);
+            cursors.current[page] = res.data.next_cursor;
+            setHasNext(Boolean(res.data.next_cursor));
         } catch {
             show('Failed to load users', 'error');
         } finally {
@@ -183,7 +187,7 @@ const UsersTab = ({ currentUser, show }) => {
     // Debounced search
     const [searchInput, setSearchInput] = useState('');
     useEffect(() => {
-        const t = setTimeout(() => { setSearch(searchInput); setPage(1); }, 400);
+        const t = setTimeout(() => { setSearch(searchInput); cursors.current = [null]; setPage(1); }, 400);
         return () => clearTimeout(t);
     }, [searchInput]);
 
@@ -244,7 +248,7 @@ const UsersTab = ({ currentUser, show }) => {
                     />
                     <select
                         value={statusFilter}
-                        onChange={e => { setStatusFilter(e.target.value); setPage(1); }}
+                        onChange={e => { setStatusFilter(e.target.value); cursors.current = [null]; setPage(1); }}
                         style={{ padding: '9px 14px', background: '#1e2035', border: '1px solid rgba(255,255,255,0.12)', borderRadius: 10, color: '#d1d5db', fontSize: 13, outline: 'none' }}
                     >
                         <option value="">All statuses</option>
@@ -332,12 +336,12 @@ const UsersTab = ({ currentUser, show }) => {
                     )}
 
                     {/* Pagination */}
-                    {pages > 1 && (
+                    {(page > 1 || hasNext) && (
                         <div style={{ padding: '12px 20px', borderTop: '1px solid rgba(255,255,255,0.06)', display: 'flex', justifyContent: 'space-between', alignItems: 'center' }}>
-                            <span style={{ color: '#6b7280', fontSize: 12 }}>Page {page} of {pages}</span>
+                            <span style={{ color: '#6b7280', fontSize: 12 }}>Page {page} of {Math.max(pages || 1, page)}</span>
                             <div style={{ display: 'flex', gap: 8 }}>
                                 <button disabled={page <= 1} onClick={() => setPage(p => p - 1)} style={{ padding: '5px 14px', background: 'rgba(255,255,255,0.07)', border: '1px solid rgba(255,255,255,0.1)', borderRadius: 8, color: 'white', cursor: page <= 1 ? 'not-allowed' : 'pointer', opacity: page <= 1 ? 0.4 : 1 }}>←</button>
-                                <button disabled={page >= pages} onClick={() => setPage(p => p + 1)} style={{ padding: '5px 14px', background: 'rgba(255,255,255,0.07)', border: '1px solid rgba(255,255,255,0.1)', borderRadius: 8, color: 'white', cursor: page >= pages ? 'not-allowed' : 'pointer', opacity: page >= pages ? 0.4 : 1 }}>→</button>
+                                <button disabled={!hasNext} onClick={() => setPage(p => p + 1)} style={{ padding: '5px 14px', background: 'rgba(255,255,255,0.07)', border: '1px solid rgba(255,255,255,0.1)', borderRadius: 8, color: 'white', cursor: !hasNext ? 'not-allowed' : 'pointer', opacity: !hasNext ? 0.4 : 1 }}>→</button>
                             </div>
                         </div>
                     )}
@@ -517,6 +521,8 @@ const AuditLogsTab = ({ show }) => {
     const [logs, setLogs] = useState([]);
     const [total, setTotal] = useState(0);
     const [page, setPage] = useState(1);
+    const [hasNext, setHasNext] = useState(false);
+    const cursors = useRef([null]);
     const [loading, setLoading] = useState(true);
     const [actionFilter, setActionFilter] = useState('');
     const [expanded, setExpanded] = useState({});
@@ -524,9 +530,11 @@ const AuditLogsTab = ({ show }) => {
     const load = useCallback(async () => {
         setLoading(true);
         try {
-            const res = await adminAPI.getAuditLogs({ page, limit: 50, action: actionFilter || undefined });
+            const res = await adminAPI.getAuditLogs({ cursor: cursors.current[page - 1] || undefined, limit: 50, action: actionFilter || undefined });
             setLogs(res.data.logs);
-            setTotal(res.data.total);
+            setTotal(res.data.total_estimated ? `~${res.data.total}` : res.data.total);
+            cursors.current[page] = res.data.next_cursor;
+            setHasNext(Boolean(res.data.next_cursor));
         } catch { show('Failed to load audit logs', 'error'); }
         finally { setLoading(false); }
     }, [page, actionFilter, show]);
@@ -540,7 +548,7 @@ const AuditLogsTab = ({ show }) => {
             <div style={{ display: 'flex', gap: 10, marginBottom: 16 }}>
                 <select
                     value={actionFilter}
-                    onChange={e => { setActionFilter(e.target.value); setPage(1); }}
+                    onChange={e => { setActionFilter(e.target.value); cursors.current = [null]; setPage(1); }}
                     style={{ padding: '9px 14px', background: '#1e2035', border: '1px solid rgba(255,255,255,0.12)', borderRadius: 10, color: '#d1d5db', fontSize: 13, outline: 'none' }}
                 >
                     <option value="">All actions</option>
@@ -617,7 +625,7 @@ const AuditLogsTab = ({ show }) => {
                     <span style={{ color: '#6b7280', fontSize: 12 }}>Page {page}</span>
                     <div style={{ display: 'flex', gap: 8 }}>
                         <button disabled={page <= 1} onClick={() => setPage(p => p - 1)} style={{ padding: '5px 14px', background: 'rgba(255,255,255,0.07)', border: '1px solid rgba(255,255,255,0.1)', borderRadius: 8, color: 'white', cursor: page <= 1 ? 'not-allowed' : 'pointer', opacity: page <= 1 ? 0.4 : 1 }}>←</button>
-                        <button onClick={() => setPage(p => p + 1)} style={{ padding: '5px 14px', background: 'rgba(255,255,255,0.07)', border: '1px solid rgba(255,255,255,0.1)', borderRadius: 8, color: 'white', cursor: 'pointer' }}>→</button>
+                        <button disabled={!hasNext} onClick={() => setPage(p => p + 1)} style={{ padding: '5px 14px', background: 'rgba(255,255,255,0.07)', border: '1px solid rgba(255,255,255,0.1)', borderRadius: 8, color: 'white', cursor: !hasNext ? 'not-allowed' : 'pointer', opacity: !hasNext ? 0.4 : 1 }}>→</button>
                     </div>
                 </div>
             </div>
@@ -3,6 +3,7 @@ import { useParams, useNavigate } from 'react-router-dom';
 import CVPreview from '../components/CVPreview';
 import ThemePanel from '../components/ThemePanel';
 import { cvAPI } from '../services/api';
+import { makePatch } from '../services/jsonPatch';
 
 const DEFAULT_CV = {
   personal_info: { name: '', title: '', email: '', phone: '', location: '', linkedin: '', website: '', summary: '' },
@@ -76,13 +77,18 @@ const CVEditorPage = () => {
   const [open, setOpen] = useState({ personal: true, summary: false, experience: false, education: false, skills: false, certs: false, languages: false, projects: false, interests: false, custom: false });
   const [photoUploading, setPhotoUploading] = useState(false);
   const photoRef = useRef();
+  // Last payload the server confirmed and the CV version it produced: saves send a JSON Patch against it
+  const savedRef = useRef(null);
+  const versionRef = useRef(null);
 
   /* Load CV */
-  useEffect(() => {
-    if (!id) return;
+  const loadCV = useCallback(() => {
     setIsInitialLoad(true);
-    cvAPI.getOne(id).then(res => {
+    savedRef.current = null;
+    versionRef.current = null;
+    return cvAPI.getOne(id).then(res => {
       const d = res.data;
+      versionRef.current = d.current_version || 1;
       setTitle(d.title || 'My CV');
 
       // Normalize experiences: ensure position field exists (editor uses position, preview uses role)
@@ -167,6 +173,10 @@ const CVEditorPage = () => {
     });
   }, [id]);
 
+  useEffect(() => {
+    if (id) loadCV();
+  }, [id, loadCV]);
+
   const [autoSaveState, setAutoSaveState] = useState('idle'); // idle | saving | saved
 
   /* Theme — derived from cvData so it persists to DB via auto-save */
@@ -187,14 +197,42 @@ const CVEditorPage = () => {
     theme: data.theme || DEFAULT_CV.theme,
   }), [title]);
 
+  /* Save: PATCH only what changed since the last save; PUT the whole CV the first time or if the patch is rejected.
+     412 means the CV was saved elsewhere (another tab): reload it rather than overwrite that save. */
+  const saveCV = useCallback(async (payload) => {
+    const snapshot = JSON.parse(JSON.stringify(payload));
+    let res = null;
+    if (savedRef.current && versionRef.current) {
+      const ops = makePatch(savedRef.current, snapshot);
+      if (!ops.length) return;
+      try {
+        res = await cvAPI.patch(id, ops, versionRef.current);
+      } catch (err) {
+        if (err.response?.status === 412) {
+          await loadCV();
+          const conflict = new Error('This CV was changed in another window, so the latest version was loaded. Please redo your last edits.');
+          conflict.conflict = true;
+          throw conflict;
+        }
+        if (![422, 428].includes(err.response?.status)) throw err;
+      }
+    }
+    if (!res) res = await cvAPI.update(id, payload);
+    savedRef.current = snapshot;
+    versionRef.current = res.data.current_version || versionRef.current;
+  }, [id, loadCV]);
+
   const debouncedData = useDebounce(cvData, 1400);
   const debouncedTitle = useDebounce(title, 1400);
   useEffect(() => {
     if (!id || isInitialLoad) return;
     setAutoSaveState('saving');
-    cvAPI.update(id, buildPayload(debouncedData, debouncedTitle))
+    saveCV(buildPayload(debouncedData, debouncedTitle))
       .then(() => { setAutoSaveState('saved'); setTimeout(() => setAutoSaveState('idle'), 2500); })
-      .catch(() => setAutoSaveState('idle'));
+      .catch(err => {
+        setAutoSaveState('idle');
+        if (err.conflict) alert(err.message);
+      });
   }, [debouncedData, debouncedTitle, id, isInitialLoad]); // eslint-disable-line
 
   /* Manual save */
@@ -202,7 +240,7 @@ const CVEditorPage = () => {
     if (!id || saving) return;
     setSaving(true);
     try {
-      await cvAPI.update(id, buildPayload(cvData, title));
+      await saveCV(buildPayload(cvData, title));
       setSaved(true);
       setTimeout(() => setSaved(false), 2500);
     } catch (err) {
@@ -332,8 +370,10 @@ const CVEditorPage = () => {
           <button
             onClick={async () => {
               try {
-                await cvAPI.update(id, buildPayload(cvData, title));
-              } catch (_) { }
+                await saveCV(buildPayload(cvData, title));
+              } catch (err) {
+                if (err.conflict) { alert(err.message); return; }
+              }
               await cvAPI.exportPDF(id, title);
             }}
             className="px-3 py-1.5 bg-primary text-white text-xs font-semibold rounded-lg hover:bg-primary-700 transition"
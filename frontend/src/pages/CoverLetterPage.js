@@ -15,7 +15,7 @@ const CoverLetterPage = () => {
     useEffect(() => {
         Promise.all([
             coverLetterAPI.getAll().then(r => setLetters(r.data)),
-            cvAPI.getAll().then(r => setCVs(r.data)),
+            cvAPI.getAllSummaries().then(setCVs),
         ]).finally(() => setLoading(false));
     }, []);
 
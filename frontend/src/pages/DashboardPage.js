@@ -3,7 +3,6 @@ import { useNavigate } from 'react-router-dom';
 import { useCVStore } from '../store/cvStore';
 import { cvAPI } from '../services/api';
 import CVUploadModal from '../components/CVUploadModal';
-import CVPreview from '../components/CVPreview';
 
 /* ── tiny helper ── */
 const timeAgo = (dateStr) => {
@@ -34,6 +33,39 @@ const DeleteConfirm = ({ title, onConfirm, onCancel }) => (
   </div>
 );
 
+/* ── Card thumbnail: the server-rendered first page, or the title initial while it renders ── */
+const CVThumbnail = ({ cv }) => {
+  const [src, setSrc] = useState(null);
+
+  useEffect(() => {
+    let url = null;
+    let cancelled = false;
+    setSrc(null);
+    cvAPI.getThumbnail(cv.id)
+      .then(r => {
+        if (cancelled) return;
+        url = URL.createObjectURL(r.data);
+        setSrc(url);
+      })
+      .catch(() => {});
+    return () => {
+      cancelled = true;
+      if (url) URL.revokeObjectURL(url);
+    };
+  }, [cv.id, cv.current_version]);
+
+  if (src) {
+    return <img src={src} alt={cv.title} className="w-full object-cover object-top select-none pointer-events-none" draggable={false} />;
+  }
+  return (
+    <div className="absolute inset-0 flex items-center justify-center">
+      <span className="text-5xl font-bold opacity-30" style={{ color: cv.theme?.primaryColor || '#6b7280' }}>
+        {(cv.title || '?').charAt(0).toUpperCase()}
+      </span>
+    </div>
+  );
+};
+
 const DashboardPage = () => {
   const { cvs, setCVs, loading, setLoading, error, setError } = useCVStore();
   const [showUploadModal, setShowUploadModal] = useState(false);
@@ -42,6 +74,8 @@ const DashboardPage = () => {
   const [creating, setCreating] = useState(false);
   const [toast, setToast] = useState(null);
   const [confirmDelete, setConfirmDelete] = useState(null); // { id, title }
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const navigate = useNavigate();
 
   useEffect(() => { fetchCVs(); }, []);
@@ -53,11 +87,19 @@ const DashboardPage = () => {
 
   const fetchCVs = async () => {
     setLoading(true);
-    try { const r = await cvAPI.getAll(); setCVs(r.data); }
+    try { const r = await cvAPI.getSummary(); setCVs(r.data.items); setNextCursor(r.data.next_cursor); }
     catch (err) { setError(err.response?.data?.detail || 'Failed to fetch CVs'); }
     finally { setLoading(false); }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try { const r = await cvAPI.getSummary(nextCursor); setCVs([...cvs, ...r.data.items]); setNextCursor(r.data.next_cursor); }
+    catch (err) { showToast(err.response?.data?.detail || 'Failed to load more CVs', 'error'); }
+    finally { setLoadingMore(false); }
+  };
+
   const handleCreate = async (e) => {
     e.preventDefault();
     if (!newTitle.trim()) return;
@@ -103,7 +145,7 @@ const DashboardPage = () => {
     if (!confirmDelete) return;
     const { id } = confirmDelete;
     setConfirmDelete(null);
-    try { await cvAPI.delete(id); await fetchCVs(); showToast('CV deleted'); }
+    try { await cvAPI.delete(id); setCVs(cvs.filter(c => c.id !== id)); showToast('CV deleted'); }
     catch { showToast('Delete failed', 'error'); }
   };
 
@@ -177,26 +219,9 @@ const DashboardPage = () => {
                 onClick={() => navigate(`/cv-editor/${cv.id}`)}
                 className="bg-white rounded-xl border border-gray-200 overflow-hidden cursor-pointer hover:shadow-lg hover:border-primary-200 transition-all duration-200 group"
               >
-                {/* Full CV preview thumbnail — correctly scaled */}
+                {/* First-page thumbnail rendered by the server */}
                 <div className="relative bg-gray-50 overflow-hidden" style={{ height: 200 }}>
-                  {/* 
-                    CVPreview renders at exactly 794px wide.
-                    We want it to fill a card that is ~100% of available width.
-                    We use a fixed inner width and CSS scale so the preview fills the card.
-                    transformOrigin top-left, then set the outer wrapper height to (794 * scale)-equivalent.
-                  */}
-                  <div style={{
-                    position: 'absolute',
-                    top: 0, left: 0,
-                    width: 794,
-                    transform: 'scale(var(--cv-scale, 0.24))',
-                    transformOrigin: 'top left',
-                    pointerEvents: 'none',
-                    userSelect: 'none',
-                    '--cv-scale': '0.24',
-                  }}>
-                    <CVPreview data={cv} theme={cv.theme} />
-                  </div>
+                  <CVThumbnail cv={cv} />
                   {/* Overlay gradient at bottom for fade effect */}
                   <div style={{ position: 'absolute', bottom: 0, left: 0, right: 0, height: 56, background: 'linear-gradient(to bottom, transparent, rgba(249,250,251,0.95))' }} />
                   {/* Hover overlay with action buttons */}
@@ -236,6 +261,16 @@ const DashboardPage = () => {
             ))}
           </div>
         )}
+
+        {!loading && nextCursor && (
+          <div className="flex justify-center mt-6">
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="px-4 py-2 text-sm font-medium text-gray-700 bg-white border border-gray-300 rounded-lg hover:bg-gray-50 disabled:opacity-60 transition"
+            >{loadingMore ? 'Loading…' : 'Load more'}</button>
+          </div>
+        )}
       </div>
 
       {/* Create Modal */}
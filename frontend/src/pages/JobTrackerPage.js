@@ -34,12 +34,12 @@ const JobTrackerPage = () => {
         try {
             const [appsRes, cvsRes, clRes, statsRes] = await Promise.all([
                 jobApplicationAPI.getAll(),
-                cvAPI.getAll(),
+                cvAPI.getAllSummaries(),
                 coverLetterAPI.getAll(),
                 jobApplicationAPI.getStats(),
             ]);
             setApps(appsRes.data);
-            setCvs(cvsRes.data);
+            setCvs(cvsRes);
             setCoverLetters(clRes.data);
             setStats(statsRes.data);
         } finally { setLoading(false); }
@@ -36,10 +36,31 @@ export const authAPI = {
 
 // ── CV ────────────────────────────────────────────────────────────────────────
 export const cvAPI = {
+  // Full CVs (every section); lists should use getSummary
   getAll: () => apiClient.get('/cvs'),
+  // List rows only (id, title, updated_at, current_version, theme, photo_thumbnail), newest first;
+  // pass the previous page's next_cursor for the next page
+  getSummary: (cursor, limit = 24) => apiClient.get('/cvs/summary', { params: cursor ? { cursor, limit } : { limit } }),
+  // Every list row, page by page (for CV pickers)
+  getAllSummaries: async () => {
+    const items = [];
+    let cursor = null;
+    do {
+      const r = await cvAPI.getSummary(cursor, 100);
+      items.push(...r.data.items);
+      cursor = r.data.next_cursor;
+    } while (cursor);
+    return items;
+  },
+  // First-page PNG (rendered with the PDF and cached under its ETag)
+  getThumbnail: (id) => apiClient.get(`/cvs/${id}/thumbnail`, { responseType: 'blob' }),
   getOne: (id) => apiClient.get(`/cvs/${id}`),
   create: (data) => apiClient.post('/cvs', data),
   update: (id, data) => apiClient.put(`/cvs/${id}`, data),
+  // JSON Patch against the CV as it was at `version` (412 if it has changed since)
+  patch: (id, ops, version) => apiClient.patch(`/cvs/${id}`, ops, {
+    headers: { 'Content-Type': 'application/json-patch+json', 'If-Match': `"${version}"` },
+  }),
   delete: (id) => apiClient.delete(`/cvs/${id}`),
 
   uploadFile: (cvId, file) => {
@@ -0,0 +1,58 @@
+/**
+ * Minimal JSON Patch (RFC 6902) diff, mirroring backend app/utils/json_patch.py:
+ * makePatch(a, b) returns the operations turning a into b. Lists are diffed
+ * around their common prefix / suffix, so editing one bullet is one "replace".
+ */
+
+const escapeToken = (key) => String(key).replace(/~/g, '~0').replace(/\//g, '~1');
+
+const isObject = (v) => v !== null && typeof v === 'object' && !Array.isArray(v);
+
+export const jsonEqual = (a, b) => {
+  if (Array.isArray(a) && Array.isArray(b)) {
+    return a.length === b.length && a.every((x, i) => jsonEqual(x, b[i]));
+  }
+  if (isObject(a) && isObject(b)) {
+    const keys = Object.keys(a);
+    return keys.length === Object.keys(b).length
+      && keys.every(k => Object.prototype.hasOwnProperty.call(b, k) && jsonEqual(a[k], b[k]));
+  }
+  return a === b;
+};
+
+const diff = (a, b, path, ops) => {
+  if (jsonEqual(a, b)) return;
+  if (isObject(a) && isObject(b)) {
+    Object.keys(a).forEach(key => {
+      if (!Object.prototype.hasOwnProperty.call(b, key)) ops.push({ op: 'remove', path: `${path}/${escapeToken(key)}` });
+    });
+    Object.keys(b).forEach(key => {
+      const child = `${path}/${escapeToken(key)}`;
+      if (Object.prototype.hasOwnProperty.call(a, key)) diff(a[key], b[key], child, ops);
+      else ops.push({ op: 'add', path: child, value: b[key] });
+    });
+  } else if (Array.isArray(a) && Array.isArray(b)) {
+    diffList(a, b, path, ops);
+  } else {
+    ops.push({ op: 'replace', path, value: b });
+  }
+};
+
+const diffList = (a, b, path, ops) => {
+  const n = a.length, m = b.length;
+  let start = 0;
+  while (start < Math.min(n, m) && jsonEqual(a[start], b[start])) start += 1;
+  let end = 0;
+  while (end < Math.min(n, m) - start && jsonEqual(a[n - 1 - end], b[m - 1 - end])) end += 1;
+  const oldItems = a.slice(start, n - end), newItems = b.slice(start, m - end);
+  const common = Math.min(oldItems.length, newItems.length);
+  for (let i = 0; i < common; i += 1) diff(oldItems[i], newItems[i], `${path}/${start + i}`, ops);
+  for (let i = common; i < oldItems.length; i += 1) ops.push({ op: 'remove', path: `${path}/${start + common}` });
+  for (let i = common; i < newItems.length; i += 1) ops.push({ op: 'add', path: `${path}/${start + i}`, value: newItems[i] });
+};
+
+export const makePatch = (a, b) => {
+  const ops = [];
+  diff(a, b, '', ops);
+  return ops;
+};